@@ -3,7 +3,6 @@ from flask import Flask, jsonify, render_template_string
 import json
 import requests
 import yfinance as yf
-import time
 from datetime import datetime
 
 app = Flask(__name__)
@@ -23,38 +22,25 @@ def get_real_market_data():
             'CADCHF=X': 'CADCHF'
         }
         
-        print("Fetching REAL forex data from yfinance...")
-        for symbol, name in forex_symbols.items():
-            try:
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period='1d')
-                if len(data) > 0:
-                    price = data['Close'].iloc[-1]
-                    market_data[name] = price
-                    print(f"{name}: {price:.4f}")
-                else:
-                    print(f"{name}: No data")
-                time.sleep(0.5)  # Small delay to avoid rate limits
-            except Exception as e:
-                print(f"{name}: {e}")
-        
         # Direct index symbols from yfinance (REAL INDEX VALUES!)
         index_symbols = {
             '^DJI': 'US30'        # Dow Jones Industrial - ACTUAL INDEX
         }
         
-        print("Fetching REAL index values directly from yfinance...")
-        for symbol, name in index_symbols.items():
+        # One request for every pair - yfinance returns them side by side as (ticker, field) columns
+        symbols = {**forex_symbols, **index_symbols}
+        print("Fetching REAL forex and index data from yfinance...")
+        batch = yf.download(" ".join(symbols), period='1d', group_by='ticker', progress=False, threads=True)
+        
+        for symbol, name in symbols.items():
             try:
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period='1d')
-                if len(data) > 0:
-                    price = data['Close'].iloc[-1]
+                closes = batch[symbol]['Close'].dropna().to_numpy()
+                if len(closes) > 0:
+                    price = closes[-1]
                     market_data[name] = price
-                    print(f"{name}: {price:.2f}")
+                    print(f"{name}: {price:.4f}" if symbol in forex_symbols else f"{name}: {price:.2f}")
                 else:
                     print(f"{name}: No data")
-                time.sleep(0.5)  # Small delay
             except Exception as e:
                 print(f"{name}: {e}")
         
@@ -90,7 +90,7 @@ class RealTimeDayTradingSystem:
                     
                     if signals:
                         # Get current live price
-                        current_price = data['Close'].iloc[-1]
+                        current_price = data['Close'].to_numpy()[-1]
                         
                         # Filter signals by session preference
                         session_filtered = self.filter_signals_by_session(signals, session)
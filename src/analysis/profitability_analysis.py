@@ -7,10 +7,12 @@ Historical backtesting with REAL market data to measure actual performance
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategies'))
 
 from day_trading_optimizer import DayTradingPatternDetector, DayTradingRiskManager, get_intraday_data
 from session_optimizer import TradingSessionOptimizer
-from trading_system import DayTradingSmartMoney
+from trading_system import DayTradingSmartMoney, Trade
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -24,7 +26,7 @@ class DayTradingProfitabilityAnalyzer:
         self.initial_capital = initial_capital
         self.detector = DayTradingPatternDetector()
         self.risk_manager = DayTradingRiskManager()
-        self.session_optimizer = TradingSessionOptimizer()
+        self.session_optimizer = TradingSessionOptimizer.get()
         
     def backtest_day_trading_strategy(self, symbol, pair_name, days=30):
         """Backtest day trading strategy on real historical data"""
@@ -86,7 +88,7 @@ class DayTradingProfitabilityAnalyzer:
                         
                         if best_signal['confidence'] >= 70:  # Minimum threshold
                             # Simulate trade execution
-                            entry_price = current_data['Close'].iloc[-1]
+                            entry_price = current_data['Close'].to_numpy()[-1]
                             
                             # Calculate position sizing with day trading risk
                             trade_setup = self.risk_manager.calculate_day_trading_position_size(
@@ -107,19 +109,19 @@ class DayTradingProfitabilityAnalyzer:
                                     )
                                     
                                     # Record trade
-                                    trade_record = {
-                                        'date': date,
-                                        'pair': pair_name,
-                                        'direction': best_signal['direction'],
-                                        'entry_price': entry_price,
-                                        'stop_loss': trade_setup['stop_loss'],
-                                        'take_profit': trade_setup['take_profit'],
-                                        'position_size': trade_setup['position_size'],
-                                        'pnl': trade_pnl,
-                                        'pattern': best_signal['pattern'],
-                                        'confidence': best_signal['confidence'],
-                                        'risk_amount': trade_setup['risk_amount']
-                                    }
+                                    trade_record = Trade(
+                                        date=date,
+                                        pair=pair_name,
+                                        direction=best_signal['direction'],
+                                        entry_price=entry_price,
+                                        stop_loss=trade_setup['stop_loss'],
+                                        take_profit=trade_setup['take_profit'],
+                                        position_size=trade_setup['position_size'],
+                                        pnl=trade_pnl,
+                                        pattern=best_signal['pattern'],
+                                        confidence=best_signal['confidence'],
+                                        risk_amount=trade_setup['risk_amount']
+                                    )
                                     
                                     trades.append(trade_record)
                                     daily_pnl += trade_pnl
@@ -181,7 +183,7 @@ class DayTradingProfitabilityAnalyzer:
                     return pnl - commission
         
         # If neither hit, close at end of day (realistic for day trading)
-        exit_price = future_data['Close'].iloc[-1]
+        exit_price = future_data['Close'].to_numpy()[-1]
         if signal['direction'] == 'BUY':
             pnl = (exit_price - entry_price) * position_size
         else:
@@ -195,17 +197,17 @@ class DayTradingProfitabilityAnalyzer:
         
         # Basic metrics
         total_trades = len(trades)
-        winning_trades = len([t for t in trades if t['pnl'] > 0])
+        winning_trades = len([t for t in trades if t.pnl > 0])
         losing_trades = total_trades - winning_trades
         
-        total_pnl = sum(t['pnl'] for t in trades)
+        total_pnl = sum(t.pnl for t in trades)
         total_return_pct = (total_pnl / self.initial_capital) * 100
         
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
         # PnL analysis
-        winning_pnls = [t['pnl'] for t in trades if t['pnl'] > 0]
-        losing_pnls = [t['pnl'] for t in trades if t['pnl'] < 0]
+        winning_pnls = [t.pnl for t in trades if t.pnl > 0]
+        losing_pnls = [t.pnl for t in trades if t.pnl < 0]
         
         avg_win = np.mean(winning_pnls) if winning_pnls else 0
         avg_loss = np.mean(losing_pnls) if losing_pnls else 0
@@ -241,8 +243,8 @@ class DayTradingProfitabilityAnalyzer:
         print(f"   Average Win: ${avg_win:.2f}")
         print(f"   Average Loss: ${avg_loss:.2f}")
         print(f"   Profit Factor: {profit_factor:.2f}")
-        print(f"   Best Trade: ${max(t['pnl'] for t in trades):.2f}")
-        print(f"   Worst Trade: ${min(t['pnl'] for t in trades):.2f}")
+        print(f"   Best Trade: ${max(t.pnl for t in trades):.2f}")
+        print(f"   Worst Trade: ${min(t.pnl for t in trades):.2f}")
         
         print(f"\n📊 RISK METRICS:")
         print(f"   Max Drawdown: {max_drawdown:.2f}%")
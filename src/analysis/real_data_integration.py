@@ -5,10 +5,23 @@ Uses Alpha Vantage and other free APIs for actual market data
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import json
 from datetime import datetime, timedelta
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Forex pairs split into (base, quote) currencies
+_PAIR_SPLIT = {
+    'EURUSD': ('EUR', 'USD'),
+    'GBPJPY': ('GBP', 'JPY'),
+    'USDJPY': ('USD', 'JPY'),
+    'USDCAD': ('USD', 'CAD'),
+    'EURCAD': ('EUR', 'CAD'),
+    'CADCHF': ('CAD', 'CHF')
+}
 
 class RealDataProvider:
     """Provides real market data from multiple sources"""
@@ -19,41 +32,65 @@ class RealDataProvider:
         self.crypto_api = "https://api.coinbase.com/v2/exchange-rates"
         self.stocks_api = "https://query1.finance.yahoo.com/v8/finance/chart/"
         
-    def get_forex_data(self, pair):
-        """Get real-time forex data"""
+        # Shared session keeps the HTTPS connection alive between calls,
+        # retrying the transient gateway errors free APIs often return
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        ))
+        
+    def get_forex_rates(self, base):
+        """Get all exchange rates for one base currency in a single request"""
         try:
-            # Convert pair format (EURUSD -> EUR to USD)
-            if pair == "EURUSD":
-                base, quote = "EUR", "USD"
-            elif pair == "GBPJPY":
-                base, quote = "GBP", "JPY"
-            elif pair == "USDJPY":
-                base, quote = "USD", "JPY"
-            elif pair == "USDCAD":
-                base, quote = "USD", "CAD"
-            elif pair == "EURCAD":
-                base, quote = "EUR", "CAD"
-            elif pair == "CADCHF":
-                base, quote = "CAD", "CHF"
-            else:
-                return None
-                
             url = f"{self.forex_api}{base}"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                if quote in data['rates']:
-                    rate = data['rates'][quote]
-                    return {
+                return response.json()['rates']
+        except Exception as e:
+            print(f"Error fetching {base} rates: {e}")
+        return None
+        
+    def get_forex_data(self, pair):
+        """Get real-time forex data"""
+        if pair not in _PAIR_SPLIT:
+            return None
+        return self.get_forex_data_batch([pair]).get(pair)
+        
+    def get_forex_data_batch(self, pairs):
+        """Get real-time forex data for several pairs, one request per base currency"""
+        by_base = {}
+        for pair in pairs:
+            base, quote = _PAIR_SPLIT.get(pair, (None, None))
+            if base:
+                by_base.setdefault(base, []).append((pair, quote))
+        
+        if not by_base:
+            return {}
+        
+        # Base currencies are independent, fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(4, len(by_base))) as executor:
+            rates_by_base = dict(zip(by_base, executor.map(self.get_forex_rates, by_base)))
+        
+        timestamp = datetime.now()
+        forex_data = {}
+        
+        for base, base_pairs in by_base.items():
+            rates = rates_by_base[base]
+            if not rates:
+                continue
+            for pair, quote in base_pairs:
+                if quote in rates:
+                    forex_data[pair] = {
                         'pair': pair,
-                        'price': rate,
-                        'timestamp': datetime.now(),
+                        'price': rates[quote],
+                        'timestamp': timestamp,
                         'source': 'ExchangeRate-API'
                     }
-        except Exception as e:
-            print(f"Error fetching {pair}: {e}")
-            return None
+        
+        return forex_data
     
     def get_index_data(self, symbol):
         """Get real index data (simplified approach)"""
@@ -78,7 +115,7 @@ class RealDataProvider:
 
     def get_all_pairs_live_data(self):
         """Get live data for all 7 trading pairs"""
-        pairs = ['EURUSD', 'GBPJPY', 'USDJPY', 'USDCAD', 'EURCAD', 'CADCHF']
+        pairs = list(_PAIR_SPLIT)
         indices = ['NAS100', 'US30']
         
         live_data = {}
@@ -86,8 +123,9 @@ class RealDataProvider:
         print("🔄 Fetching real market data...")
         
         # Get forex data
+        forex_data = self.get_forex_data_batch(pairs)
         for pair in pairs:
-            data = self.get_forex_data(pair)
+            data = forex_data.get(pair)
             if data:
                 live_data[pair] = data
                 print(f"✅ {pair}: {data['price']:.4f}")
@@ -103,6 +141,20 @@ class RealDataProvider:
         
         return live_data
 
+def render_live_data_summary(live_data):
+    """Build the live data summary table as a single string"""
+    
+    lines = [f"\n📊 LIVE DATA SUMMARY:", "-" * 30]
+    
+    for symbol, data in live_data.items():
+        timestamp = data['timestamp'].strftime('%H:%M:%S')
+        lines.append(f"{symbol:<8} {data['price']:>10.4f} @ {timestamp}")
+    
+    lines.append(f"\n✅ Successfully retrieved {len(live_data)}/7 pairs")
+    lines.append(f"📅 Data timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    return "\n".join(lines)
+
 def test_real_data_integration():
     """Test the real data integration"""
     print("🚀 TESTING REAL MARKET DATA INTEGRATION")
@@ -111,15 +163,7 @@ def test_real_data_integration():
     provider = RealDataProvider()
     live_data = provider.get_all_pairs_live_data()
     
-    print(f"\n📊 LIVE DATA SUMMARY:")
-    print("-" * 30)
-    
-    for symbol, data in live_data.items():
-        timestamp = data['timestamp'].strftime('%H:%M:%S')
-        print(f"{symbol:<8} {data['price']:>10.4f} @ {timestamp}")
-    
-    print(f"\n✅ Successfully retrieved {len(live_data)}/7 pairs")
-    print(f"📅 Data timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(render_live_data_summary(live_data))
     
     return live_data
 
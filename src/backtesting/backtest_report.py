@@ -4,92 +4,103 @@ Smart Money Trading System - Backtesting Results Summary
 Generated: December 2024
 """
 
-def generate_backtest_report():
-    """Generate a comprehensive backtest report"""
-    
-    print("🚀 SMART MONEY TRADING SYSTEM - FINAL REPORT")
-    print("=" * 60)
-    print("📅 Backtesting Period: 6 months (June - December 2024)")
-    print("💰 Initial Capital: $10,000 per pair")
-    print("⚙️ Strategy: Institutional Pattern Detection + Day Trading")
-    print("📊 Risk Management: 2% per trade, 1:2 Risk/Reward")
-    print("=" * 60)
+import numpy as np
+
+REPORT_DTYPE = np.dtype([
+    ('pair', 'U8'),
+    ('trades', 'i4'),
+    ('win_rate', 'f8'),
+    ('return_pct', 'f8'),
+    ('max_dd', 'f8')
+])
+
+# Corrected realistic results (fixing the compounding bug)
+BACKTEST_RESULTS = np.array([
+    ('NAS100', 887, 64.5, 45.2, 11.4),
+    ('CADCHF', 823, 65.2, 38.7, 14.8),
+    ('EURCAD', 844, 62.6, 35.1, 11.4),
+    ('USDJPY', 808, 63.5, 32.8, 14.9),
+    ('GBPJPY', 814, 63.0, 29.4, 13.3),
+    ('USDCAD', 829, 62.6, 26.7, 14.9),
+    ('US30', 883, 60.6, 22.1, 12.2)
+], dtype=REPORT_DTYPE)
+
+def render_report(results):
+    """Build the backtest report as a single string"""
     
-    # Corrected realistic results (fixing the compounding bug)
-    results = {
-        'NAS100': {'trades': 887, 'win_rate': 64.5, 'return_pct': 45.2, 'drawdown': 11.4},
-        'CADCHF': {'trades': 823, 'win_rate': 65.2, 'return_pct': 38.7, 'drawdown': 14.8},
-        'EURCAD': {'trades': 844, 'win_rate': 62.6, 'return_pct': 35.1, 'drawdown': 11.4},
-        'USDJPY': {'trades': 808, 'win_rate': 63.5, 'return_pct': 32.8, 'drawdown': 14.9},
-        'GBPJPY': {'trades': 814, 'win_rate': 63.0, 'return_pct': 29.4, 'drawdown': 13.3},
-        'USDCAD': {'trades': 829, 'win_rate': 62.6, 'return_pct': 26.7, 'drawdown': 14.9},
-        'US30': {'trades': 883, 'win_rate': 60.6, 'return_pct': 22.1, 'drawdown': 12.2}
-    }
+    lines = []
     
-    print("\n🏆 INDIVIDUAL PAIR PERFORMANCE:")
-    print("-" * 60)
-    print(f"{'Pair':<8} {'Trades':<8} {'Win Rate':<10} {'Return %':<10} {'Max DD %':<8}")
-    print("-" * 60)
+    lines.append("🚀 SMART MONEY TRADING SYSTEM - FINAL REPORT")
+    lines.append("=" * 60)
+    lines.append("📅 Backtesting Period: 6 months (June - December 2024)")
+    lines.append("💰 Initial Capital: $10,000 per pair")
+    lines.append("⚙️ Strategy: Institutional Pattern Detection + Day Trading")
+    lines.append("📊 Risk Management: 2% per trade, 1:2 Risk/Reward")
+    lines.append("=" * 60)
     
-    total_return = 0
-    total_trades = 0
-    total_win_rate = 0
+    lines.append("\n🏆 INDIVIDUAL PAIR PERFORMANCE:")
+    lines.append("-" * 60)
+    lines.append(f"{'Pair':<8} {'Trades':<8} {'Win Rate':<10} {'Return %':<10} {'Max DD %':<8}")
+    lines.append("-" * 60)
     
-    for pair, data in results.items():
-        print(f"{pair:<8} {data['trades']:<8} {data['win_rate']:.1f}%{'':<6} {data['return_pct']:.1f}%{'':<6} {data['drawdown']:.1f}%")
-        total_return += data['return_pct']
-        total_trades += data['trades']
-        total_win_rate += data['win_rate']
+    for row in results:
+        lines.append(f"{row['pair']:<8} {row['trades']:<8} {row['win_rate']:.1f}%{'':<6} {row['return_pct']:.1f}%{'':<6} {row['max_dd']:.1f}%")
     
-    avg_return = total_return / len(results)
-    avg_win_rate = total_win_rate / len(results)
+    total_trades = int(results['trades'].sum())
+    total_return = results['return_pct'].sum()
+    avg_win_rate = results['win_rate'].mean()
+    avg_return = results['return_pct'].mean()
+    avg_drawdown = results['max_dd'].mean()
+    max_single_dd = results['max_dd'].max()
     
-    print("\n🌟 OVERALL PERFORMANCE SUMMARY:")
-    print("-" * 40)
-    print(f"📈 Total Trades: {total_trades:,}")
-    print(f"🎯 Average Win Rate: {avg_win_rate:.1f}%")
-    print(f"💰 Average Return per Pair: {avg_return:.1f}%")
-    print(f"📊 Total Portfolio Return: {total_return:.1f}%")
-    print(f"💎 Portfolio Value: ${70000 + (total_return/100 * 70000):,.0f}")
+    lines.append("\n🌟 OVERALL PERFORMANCE SUMMARY:")
+    lines.append("-" * 40)
+    lines.append(f"📈 Total Trades: {total_trades:,}")
+    lines.append(f"🎯 Average Win Rate: {avg_win_rate:.1f}%")
+    lines.append(f"💰 Average Return per Pair: {avg_return:.1f}%")
+    lines.append(f"📊 Total Portfolio Return: {total_return:.1f}%")
+    lines.append(f"💎 Portfolio Value: ${70000 + (total_return/100 * 70000):,.0f}")
     
-    print("\n🔥 KEY INSIGHTS:")
-    print("-" * 40)
-    print("✅ All 7 pairs showed profitability")
-    print("✅ Consistent 60%+ win rates across all pairs")
-    print("✅ Strong risk management with controlled drawdowns")
-    print("✅ NAS100 and CADCHF showed highest returns")
-    print("✅ Average 32.3% return per pair over 6 months")
+    lines.append("\n🔥 KEY INSIGHTS:")
+    lines.append("-" * 40)
+    lines.append("✅ All 7 pairs showed profitability")
+    lines.append("✅ Consistent 60%+ win rates across all pairs")
+    lines.append("✅ Strong risk management with controlled drawdowns")
+    lines.append("✅ NAS100 and CADCHF showed highest returns")
+    lines.append("✅ Average 32.3% return per pair over 6 months")
     
-    print("\n⚠️ RISK ANALYSIS:")
-    print("-" * 40)
-    max_drawdowns = [data['drawdown'] for data in results.values()]
-    avg_drawdown = sum(max_drawdowns) / len(max_drawdowns)
-    max_single_dd = max(max_drawdowns)
+    lines.append("\n⚠️ RISK ANALYSIS:")
+    lines.append("-" * 40)
+    lines.append(f"📉 Average Maximum Drawdown: {avg_drawdown:.1f}%")
+    lines.append(f"🔴 Highest Single Drawdown: {max_single_dd:.1f}%")
+    lines.append(f"⚡ Drawdown within acceptable risk parameters")
     
-    print(f"📉 Average Maximum Drawdown: {avg_drawdown:.1f}%")
-    print(f"🔴 Highest Single Drawdown: {max_single_dd:.1f}%")
-    print(f"⚡ Drawdown within acceptable risk parameters")
+    lines.append("\n🚀 DEPLOYMENT RECOMMENDATIONS:")
+    lines.append("-" * 40)
+    lines.append("1. 💰 Start with $1,000-$5,000 per pair for live trading")
+    lines.append("2. 📊 Monitor NAS100 and CADCHF closely (top performers)")
+    lines.append("3. ⏰ Focus on London/NY session overlaps (8-17 UTC)")
+    lines.append("4. 📱 Use mobile alerts for real-time signal notifications")
+    lines.append("5. 🎯 Maintain 2% risk per trade discipline")
+    lines.append("6. 📈 Scale position sizes as account grows")
+    lines.append("7. 🔄 Review and adjust weekly based on market conditions")
     
-    print("\n🚀 DEPLOYMENT RECOMMENDATIONS:")
-    print("-" * 40)
-    print("1. 💰 Start with $1,000-$5,000 per pair for live trading")
-    print("2. 📊 Monitor NAS100 and CADCHF closely (top performers)")
-    print("3. ⏰ Focus on London/NY session overlaps (8-17 UTC)")
-    print("4. 📱 Use mobile alerts for real-time signal notifications")
-    print("5. 🎯 Maintain 2% risk per trade discipline")
-    print("6. 📈 Scale position sizes as account grows")
-    print("7. 🔄 Review and adjust weekly based on market conditions")
+    lines.append("\n📱 LIVE SYSTEM STATUS:")
+    lines.append("-" * 40)
+    lines.append("✅ Web application deployed to Vercel")
+    lines.append("✅ Mobile notifications configured via Pushover")
+    lines.append("✅ All 7 pairs active and monitored")
+    lines.append("✅ Real-time pattern detection running 24/7")
+    lines.append("✅ Risk management rules implemented")
     
-    print("\n📱 LIVE SYSTEM STATUS:")
-    print("-" * 40)
-    print("✅ Web application deployed to Vercel")
-    print("✅ Mobile notifications configured via Pushover")
-    print("✅ All 7 pairs active and monitored")
-    print("✅ Real-time pattern detection running 24/7")
-    print("✅ Risk management rules implemented")
+    lines.append("\n🎉 SYSTEM READY FOR LIVE TRADING!")
+    lines.append("=" * 60)
     
-    print("\n🎉 SYSTEM READY FOR LIVE TRADING!")
-    print("=" * 60)
+    return "\n".join(lines)
+
+def generate_backtest_report():
+    """Generate a comprehensive backtest report"""
+    print(render_report(BACKTEST_RESULTS))
 
 if __name__ == "__main__":
     generate_backtest_report()
\ No newline at end of file
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-Time Build for the Backtest Kernel
+Run once to produce the backtest_kernel extension used by comprehensive_backtest
+"""
+
+import os
+from numba.pycc import CC
+
+from comprehensive_backtest import _run_backtest_njit
+
+cc = CC('backtest_kernel')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# highs, lows, closes, directions, confidences, day_ids, initial_capital,
+# min_confidence, rr_ratio, max_trades_per_day -> capital, bars, dirs, pnls
+cc.export(
+    'run_backtest',
+    'Tuple((f8, i8[:], i1[:], f8[:]))(f4[:], f4[:], f4[:], i1[:], f8[:], i8[:], f8, f8, f8, i8)'
+)(_run_backtest_njit.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built backtest_kernel in {cc.output_dir}")
@@ -4,187 +4,231 @@ Smart Money Trading System - Full Performance Analysis
 """
 
 import sys
-sys.path.append('web_app')
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
 
-from trading_system import DayTradingSmartMoney, InstitutionalPatternDetector
+from trading_system import DayTradingSmartMoney
+from _njit import njit, types, array_1d, NUMBA_AVAILABLE
+from indicators import F4_1D, F8_1D
+from data_cache import cached_download
+from buffered_output import buffered_output
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import yfinance as yf
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
-def comprehensive_backtest():
-    """Run backtesting on all 7 pairs"""
-    
-    # All 7 trading pairs with their Yahoo Finance symbols
-    all_pairs = {
-        'NAS100': 'NDX',       # NASDAQ 100 Index
-        'US30': 'DJI',         # Dow Jones Index
-        'GBPJPY': 'GBPJPY=X',  # GBP/JPY
-        'CADCHF': 'CADCHF=X',  # CAD/CHF
-        'USDJPY': 'USDJPY=X',  # USD/JPY
-        'EURCAD': 'EURCAD=X',  # EUR/CAD
-        'USDCAD': 'USDCAD=X'   # USD/CAD
-    }
+# Worker processes start fresh instead of forking - a fork is only safe while no numba kernel
+# runs with parallel=True (see scan_liquidity_sweeps in pattern_kernels)
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+# Confidence % per point of signal strength: the grid's 70% is calculate_confidence's
+# MEDIUM threshold (strength 7), 100% its HIGH threshold (strength 10)
+CONFIDENCE_PER_STRENGTH = 10
+
+# 6 months of historical data
+BACKTEST_START = datetime(2024, 6, 1)  # June 2024
+BACKTEST_END = datetime(2024, 12, 1)   # December 2024
+
+# All 7 trading pairs with their Yahoo Finance symbols
+ALL_PAIRS = {
+    'NAS100': 'NDX',       # NASDAQ 100 Index
+    'US30': 'DJI',         # Dow Jones Index
+    'GBPJPY': 'GBPJPY=X',  # GBP/JPY
+    'CADCHF': 'CADCHF=X',  # CAD/CHF
+    'USDJPY': 'USDJPY=X',  # USD/JPY
+    'EURCAD': 'EURCAD=X',  # EUR/CAD
+    'USDCAD': 'USDCAD=X'   # USD/CAD
+}
+
+# One row per backtested pair
+RESULT_DTYPE = np.dtype([
+    ('pair', 'U8'),
+    ('symbol', 'U10'),
+    ('trades', 'i4'),
+    ('wins', 'i4'),
+    ('losses', 'i4'),
+    ('win_rate', 'f8'),
+    ('return_pct', 'f8'),
+    ('final_capital', 'f8'),
+    ('max_dd', 'f8'),
+    ('profit_loss', 'f8')
+])
+
+def detect_signals(data, trader):
+    """Score every bar of a yfinance price frame with the day-trading batch detector"""
     
-    print("🚀 COMPREHENSIVE SMART MONEY BACKTESTING")
-    print("=" * 60)
-    print(f"📊 Testing {len(all_pairs)} pairs with institutional patterns")
-    print(f"📅 Period: 6 months of data")
-    print(f"⚙️ Strategy: Smart Money + Day Trading")
-    print("=" * 60)
+    # Detector input: lowercase OHLCV, with the live system's range-based volume proxy when the
+    # symbol reports none (forex)
+    bars = pd.DataFrame({col.lower(): data[col] for col in ('Open', 'High', 'Low', 'Close')})
+    volume = data['Volume'] if 'Volume' in data.columns else None
+    if volume is None or volume.sum() == 0:
+        volume = (bars['high'] - bars['low']) * 1000000
+    bars['volume'] = volume
     
-    results = {}
+    return trader.detect_day_trading_signals_batch(bars)
+
+def extract_price_arrays(data, trader):
+    """Pre-detect signals and pull the kernel inputs out of a price frame"""
     
-    for pair_name, symbol in all_pairs.items():
-        print(f"\n🔍 BACKTESTING: {pair_name} ({symbol})")
-        print("-" * 40)
-        
+    # yf.download may label columns (field, ticker) even for one symbol
+    if data.columns.nlevels > 1:
+        data = data.copy(deep=False)
+        data.columns = data.columns.get_level_values(0)
+    
+    # float32 is ample for price ticks and halves the memory the kernel scans
+    highs = data['High'].to_numpy(dtype=np.float32)
+    lows = data['Low'].to_numpy(dtype=np.float32)
+    closes = data['Close'].to_numpy(dtype=np.float32)
+    
+    # Every bar scored in one pass (1 = BUY, -1 = SELL, 0 = no signal)
+    signals = detect_signals(data, trader)
+    directions = signals['sign'].to_numpy(dtype=np.int8)
+    confidences = np.nan_to_num(signals['strength'].to_numpy(dtype=np.float64)) * CONFIDENCE_PER_STRENGTH
+    
+    # Calendar day of each bar, used to cap trades per day
+    day_ids = np.asarray(data.index.year * 1000 + data.index.dayofyear, dtype=np.int64)
+    
+    return highs, lows, closes, directions, confidences, day_ids
+
+def load_price_arrays(pairs=ALL_PAIRS):
+    """Download the backtest window for each pair and pre-detect signals once"""
+    
+    trader = DayTradingSmartMoney(initial_capital=10000)
+    price_arrays = {}
+    
+    for pair_name, symbol in pairs.items():
         try:
-            # Download 6 months of historical data  
-            end_date = datetime(2024, 12, 1)  # December 2024
-            start_date = datetime(2024, 6, 1)  # June 2024 (6 months historical)
-            
-            print(f"📥 Downloading data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-            data = yf.download(symbol, start=start_date, end=end_date, interval='1h')
+            data = cached_download(symbol, BACKTEST_START, BACKTEST_END, '1h')
             
             if data.empty:
                 print(f"❌ No data available for {pair_name}")
                 continue
-                
-            print(f"✅ Downloaded {len(data)} hours of data")
-            
-            # Initialize trading system
-            trader = DayTradingSmartMoney(initial_capital=10000)
-            detector = InstitutionalPatternDetector()
-            
-            # Run backtesting
-            total_trades = 0
-            winning_trades = 0
-            losing_trades = 0
-            total_profit = 0
-            max_drawdown = 0
-            peak_capital = 10000
-            
-            for i in range(50, len(data)):  # Start after enough data for indicators
-                current_data = data.iloc[:i+1]
-                
-                # Detect smart money patterns
-                signal = detector.detect_smart_money_entry(current_data)
-                
-                if signal:
-                    current_price = data.iloc[i]['Close']
-                    
-                    # Calculate position size (2% risk)
-                    risk_amount = trader.capital * 0.02
-                    
-                    if signal['direction'] == 'BUY':
-                        stop_loss = current_price * 0.99  # 1% stop loss
-                        take_profit = current_price * 1.02  # 2% take profit
-                    else:
-                        stop_loss = current_price * 1.01  # 1% stop loss
-                        take_profit = current_price * 0.98  # 2% take profit
-                    
-                    # Simulate trade outcome (simplified)
-                    # Look ahead 24 hours to see if TP or SL hit
-                    future_end = min(i + 24, len(data) - 1)
-                    future_data = data.iloc[i+1:future_end+1]
-                    
-                    trade_outcome = simulate_trade_outcome(
-                        current_price, signal['direction'], 
-                        stop_loss, take_profit, future_data
-                    )
-                    
-                    total_trades += 1
-                    
-                    if trade_outcome > 0:
-                        winning_trades += 1
-                        total_profit += trade_outcome
-                    else:
-                        losing_trades += 1
-                        total_profit += trade_outcome
-                    
-                    # Update capital
-                    trader.capital += trade_outcome
-                    
-                    # Track drawdown
-                    if trader.capital > peak_capital:
-                        peak_capital = trader.capital
-                    
-                    current_drawdown = (peak_capital - trader.capital) / peak_capital * 100
-                    max_drawdown = max(max_drawdown, current_drawdown)
             
-            # Calculate metrics
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            total_return = (trader.capital - 10000) / 10000 * 100
-            
-            results[pair_name] = {
-                'symbol': symbol,
-                'total_trades': total_trades,
-                'winning_trades': winning_trades,
-                'losing_trades': losing_trades,
-                'win_rate': win_rate,
-                'total_return': total_return,
-                'final_capital': trader.capital,
-                'max_drawdown': max_drawdown,
-                'profit_loss': total_profit
-            }
-            
-            print(f"📈 RESULTS for {pair_name}:")
-            print(f"   💰 Total Return: {total_return:.2f}%")
-            print(f"   🎯 Win Rate: {win_rate:.1f}%")
-            print(f"   📊 Total Trades: {total_trades}")
-            print(f"   💵 Final Capital: ${trader.capital:.2f}")
-            print(f"   📉 Max Drawdown: {max_drawdown:.2f}%")
+            price_arrays[pair_name] = extract_price_arrays(data, trader)
             
         except Exception as e:
-            print(f"❌ Error backtesting {pair_name}: {e}")
-            continue
+            print(f"❌ Error loading {pair_name}: {e}")
+    
+    return price_arrays
+
+@buffered_output
+def backtest_pair(pair_item):
+    """Backtest a single (pair_name, symbol) item - runs in its own worker process
+    
+    Returns a RESULT_DTYPE row tuple, or None when the pair could not be tested.
+    """
+    pair_name, symbol = pair_item
+    
+    print(f"\n🔍 BACKTESTING: {pair_name} ({symbol})")
+    print("-" * 40)
+    
+    try:
+        # Download 6 months of historical data  
+        print(f"📥 Downloading data from {BACKTEST_START.strftime('%Y-%m-%d')} to {BACKTEST_END.strftime('%Y-%m-%d')}")
+        data = cached_download(symbol, BACKTEST_START, BACKTEST_END, '1h')
+        
+        if data.empty:
+            print(f"❌ No data available for {pair_name}")
+            return None
+            
+        print(f"✅ Downloaded {len(data)} hours of data")
+        
+        # Initialize trading system
+        trader = DayTradingSmartMoney(initial_capital=10000)
+        
+        # Pre-extract price columns and signals once for the compiled kernel
+        price_arrays = extract_price_arrays(data, trader)
+        
+        # Run backtesting
+        final_capital, _, _, trade_pnls = run_backtest(*price_arrays, 10000.0)
+        _, max_drawdown = equity_drawdown(trade_pnls, 10000.0)
+        total_trades = len(trade_pnls)
+        winning_trades = int(np.count_nonzero(trade_pnls > 0))
+        losing_trades = total_trades - winning_trades
+        trader.capital = final_capital
+        total_profit = final_capital - 10000
+        
+        # Calculate metrics
+        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        total_return = (trader.capital - 10000) / 10000 * 100
+        
+        # Row layout follows RESULT_DTYPE
+        result = (pair_name, symbol, total_trades, winning_trades, losing_trades,
+                  win_rate, total_return, trader.capital, max_drawdown, total_profit)
+        
+        print(f"📈 RESULTS for {pair_name}:")
+        print(f"   💰 Total Return: {total_return:.2f}%")
+        print(f"   🎯 Win Rate: {win_rate:.1f}%")
+        print(f"   📊 Total Trades: {total_trades}")
+        print(f"   💵 Final Capital: ${trader.capital:.2f}")
+        print(f"   📉 Max Drawdown: {max_drawdown:.2f}%")
+        
+        return result
+        
+    except Exception as e:
+        print(f"❌ Error backtesting {pair_name}: {e}")
+        return None
+
+def comprehensive_backtest():
+    """Run backtesting on all 7 pairs, returning a RESULT_DTYPE record array"""
+    
+    print("🚀 COMPREHENSIVE SMART MONEY BACKTESTING")
+    print("=" * 60)
+    print(f"📊 Testing {len(ALL_PAIRS)} pairs with institutional patterns")
+    print(f"📅 Period: 6 months of data")
+    print(f"⚙️ Strategy: Smart Money + Day Trading")
+    print("=" * 60)
+    
+    # Each pair is an independent download + backtest, so run them side by side
+    with ProcessPoolExecutor(max_workers=len(ALL_PAIRS), mp_context=POOL_CONTEXT) as executor:
+        rows = [row for row in executor.map(backtest_pair, ALL_PAIRS.items()) if row]
+    
+    results = np.array(rows, dtype=RESULT_DTYPE)
     
     # Print comprehensive summary
     print("\n" + "=" * 60)
     print("📊 COMPREHENSIVE RESULTS SUMMARY")
     print("=" * 60)
     
-    if results:
-        # Sort by total return
-        sorted_results = sorted(results.items(), key=lambda x: x[1]['total_return'], reverse=True)
+    if len(results):
+        # Sort by total return (stable, so ties keep pair order)
+        sorted_results = results[np.argsort(-results['return_pct'], kind='stable')]
         
         print(f"{'Pair':<8} {'Return%':<8} {'WinRate%':<9} {'Trades':<7} {'Risk':<6}")
         print("-" * 50)
         
-        total_return_all = 0
-        total_trades_all = 0
+        low_risk = med_risk = high_risk = 0
         
-        for pair_name, metrics in sorted_results:
-            return_pct = metrics['total_return']
-            win_rate = metrics['win_rate']
-            trades = metrics['total_trades']
+        for row in sorted_results:
+            pair_name = row['pair']
+            return_pct = row['return_pct']
+            win_rate = row['win_rate']
+            trades = row['trades']
             
             # Risk assessment
             if win_rate >= 60 and return_pct >= 0:
                 risk = "🟢 LOW"
+                low_risk += 1
             elif win_rate >= 50 or return_pct >= 0:
                 risk = "🟡 MED"
+                med_risk += 1
             else:
                 risk = "🔴 HIGH"
+                high_risk += 1
             
             print(f"{pair_name:<8} {return_pct:>6.1f}% {win_rate:>7.1f}% {trades:>6} {risk}")
-            
-            total_return_all += return_pct
-            total_trades_all += trades
         
-        avg_return = total_return_all / len(results)
+        avg_return = results['return_pct'].mean()
+        total_trades_all = results['trades'].sum()
         
         print("-" * 50)
         print(f"{'AVERAGE':<8} {avg_return:>6.1f}% {'':>7} {total_trades_all:>6}")
         
-        print(f"\n🏆 BEST PERFORMER: {sorted_results[0][0]} ({sorted_results[0][1]['total_return']:.1f}%)")
-        print(f"🎯 HIGHEST WIN RATE: {max(results.items(), key=lambda x: x[1]['win_rate'])[0]} ({max(results.items(), key=lambda x: x[1]['win_rate'])[1]['win_rate']:.1f}%)")
-        
-        # Risk distribution
-        low_risk = sum(1 for _, m in results.items() if m['win_rate'] >= 60 and m['total_return'] >= 0)
-        med_risk = sum(1 for _, m in results.items() if (m['win_rate'] >= 50 or m['total_return'] >= 0) and not (m['win_rate'] >= 60 and m['total_return'] >= 0))
-        high_risk = len(results) - low_risk - med_risk
+        best = sorted_results[0]
+        best_wr = results[np.argmax(results['win_rate'])]
+        print(f"\n🏆 BEST PERFORMER: {best['pair']} ({best['return_pct']:.1f}%)")
+        print(f"🎯 HIGHEST WIN RATE: {best_wr['pair']} ({best_wr['win_rate']:.1f}%)")
         
         print(f"\n📊 RISK DISTRIBUTION:")
         print(f"   🟢 Low Risk: {low_risk} pairs")
@@ -196,38 +240,139 @@ def comprehensive_backtest():
     
     return results
 
-def simulate_trade_outcome(entry_price, direction, stop_loss, take_profit, future_data):
+def equity_drawdown(trade_pnls, initial_capital):
+    """Equity curve after each trade and the max drawdown % along it"""
+    
+    equity = initial_capital + np.cumsum(trade_pnls)
+    peak = np.maximum.accumulate(np.concatenate(([initial_capital], equity)))[1:]
+    drawdown = (peak - equity) / peak * 100
+    max_drawdown = drawdown.max() if len(drawdown) > 0 else 0.0
+    return equity, float(max_drawdown)
+
+@njit(cache=True)
+def simulate_trade_outcome(entry_price, direction, stop_loss, take_profit, future_highs, future_lows, future_closes,
+                           win_amount=400.0):
     """Simulate trade outcome based on future price action"""
     
-    if future_data.empty:
-        return -100  # Small loss if no data
+    if len(future_closes) == 0:
+        return -100.0  # Small loss if no data
     
-    for _, candle in future_data.iterrows():
-        high = candle['High']
-        low = candle['Low']
+    for j in range(len(future_closes)):
+        high = future_highs[j]
+        low = future_lows[j]
         
-        if direction == 'BUY':
+        if direction == 1:  # BUY
             # Check if stop loss hit
             if low <= stop_loss:
-                return -200  # Stop loss hit
+                return -200.0  # Stop loss hit
             # Check if take profit hit  
             elif high >= take_profit:
-                return 400  # Take profit hit
+                return win_amount  # Take profit hit
         else:  # SELL
             # Check if stop loss hit
             if high >= stop_loss:
-                return -200  # Stop loss hit
+                return -200.0  # Stop loss hit
             # Check if take profit hit
             elif low <= take_profit:
-                return 400  # Take profit hit
+                return win_amount  # Take profit hit
     
     # If neither TP nor SL hit, simulate market close (small profit/loss)
-    close_price = future_data.iloc[-1]['Close']
+    close_price = future_closes[-1]
     
-    if direction == 'BUY':
-        return (close_price - entry_price) / entry_price * 2000 if close_price > entry_price else -100
+    if direction == 1:
+        return (close_price - entry_price) / entry_price * 2000 if close_price > entry_price else -100.0
     else:
-        return (entry_price - close_price) / entry_price * 2000 if close_price < entry_price else -100
+        return (entry_price - close_price) / entry_price * 2000 if close_price < entry_price else -100.0
+
+# highs, lows, closes, directions, confidences, day_ids, initial_capital, min_confidence,
+# rr_ratio, max_trades_per_day -> capital, bars, dirs, pnls (same layout as compile_kernel.py)
+BACKTEST_SIGNATURE = (
+    types.Tuple((types.float64, types.int64[:], types.int8[:], types.float64[:]))(
+        F4_1D, F4_1D, F4_1D, array_1d('int8'), F8_1D, array_1d('int64'),
+        types.float64, types.float64, types.float64, types.int64)
+    if NUMBA_AVAILABLE else None
+)
+
+# Explicit signature: compiled (or loaded from cache) at import, not on the first backtest
+@njit(BACKTEST_SIGNATURE, cache=True)
+def _run_backtest_njit(highs, lows, closes, directions, confidences, day_ids, initial_capital,
+                       min_confidence=0.0, rr_ratio=2.0, max_trades_per_day=1000000):
+    """Compiled per-bar backtest loop over pre-detected signal directions
+    
+    Returns final capital and the trade log as parallel arrays
+    (signal bar, direction, P&L).
+    """
+    
+    n = len(closes)
+    capital = initial_capital
+    current_day = -1
+    trades_today = 0
+    
+    # Each signal bar opens at most one trade, so this bounds the trade log
+    max_trades = np.count_nonzero(directions)
+    trade_bars = np.empty(max_trades, np.int64)
+    trade_dirs = np.empty(max_trades, np.int8)
+    trade_pnls = np.empty(max_trades, np.float64)
+    k = 0
+    
+    # 1% risk per trade, reward scales with the R:R ratio ($200 risked per trade)
+    reward_pct = 0.01 * rr_ratio
+    win_amount = 200.0 * rr_ratio
+    
+    for i in range(n):
+        direction = directions[i]
+        if direction == 0 or confidences[i] < min_confidence:
+            continue
+        
+        if day_ids[i] != current_day:
+            current_day = day_ids[i]
+            trades_today = 0
+        if trades_today >= max_trades_per_day:
+            continue
+        trades_today += 1
+        
+        current_price = closes[i]
+        
+        if direction == 1:
+            stop_loss = current_price * 0.99  # 1% stop loss
+            take_profit = current_price * (1 + reward_pct)
+        else:
+            stop_loss = current_price * 1.01  # 1% stop loss
+            take_profit = current_price * (1 - reward_pct)
+        
+        # Simulate trade outcome (simplified)
+        # Look ahead 24 hours to see if TP or SL hit
+        future_end = min(i + 24, n - 1)
+        
+        trade_outcome = simulate_trade_outcome(
+            current_price, direction, stop_loss, take_profit,
+            highs[i+1:future_end+1], lows[i+1:future_end+1], closes[i+1:future_end+1],
+            win_amount
+        )
+        
+        trade_bars[k] = i
+        trade_dirs[k] = direction
+        trade_pnls[k] = trade_outcome
+        k += 1
+        
+        # Update capital
+        capital += trade_outcome
+    
+    return capital, trade_bars[:k], trade_dirs[:k], trade_pnls[:k]
+
+# Prefer the ahead-of-time build from compile_kernel.py (no JIT warm-up)
+try:
+    from backtest_kernel import run_backtest as _run_backtest_aot
+except ImportError:
+    _run_backtest_aot = None
+
+def run_backtest(highs, lows, closes, directions, confidences, day_ids, initial_capital,
+                 min_confidence=0.0, rr_ratio=2.0, max_trades_per_day=1000000):
+    """Run the backtest kernel, using the AOT-compiled build when available"""
+    
+    kernel = _run_backtest_aot or _run_backtest_njit
+    return kernel(highs, lows, closes, directions, confidences, day_ids, float(initial_capital),
+                  float(min_confidence), float(rr_ratio), int(max_trades_per_day))
 
 if __name__ == "__main__":
     results = comprehensive_backtest()
\ No newline at end of file
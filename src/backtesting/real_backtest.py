@@ -7,25 +7,35 @@ Comprehensive backtesting using actual historical market data from yfinance
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategies'))
 
 from index import get_real_market_data
-from trading_system import InstitutionalPatternDetector, DayTradingSmartMoney
-import yfinance as yf
+from trading_system import DayTradingSmartMoney
+from day_trading_optimizer import DayTradingRiskManager
+from comprehensive_backtest import detect_signals, CONFIDENCE_PER_STRENGTH
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from data_cache import cached_history, prefetch_histories
+from buffered_output import buffered_output
 
-def backtest_real_data(symbol, pair_name, days=30, initial_capital=10000):
-    """Backtest trading system on real historical data"""
+# Spawned, not forked, workers - a fork after numba has started a threading layer never exits
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+def backtest_real_data(symbol, pair_name, days=30, initial_capital=10000, data=None):
+    """Backtest trading system on real historical data (pass data to skip the download)"""
     
     print(f"\n🔥 BACKTESTING {pair_name} WITH REAL DATA")
     print("=" * 50)
     
     try:
         # Get real historical data from yfinance
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period=f"{days}d", interval="1h")
+        if data is None:
+            data = cached_history(symbol, f"{days}d", "1h")
         
         if len(data) < 50:
             print(f"❌ Insufficient data for {pair_name}")
@@ -36,83 +46,107 @@ def backtest_real_data(symbol, pair_name, days=30, initial_capital=10000):
         print(f"💰 Price Range: {data['Low'].min():.4f} - {data['High'].max():.4f}")
         
         # Initialize trading systems
-        pattern_detector = InstitutionalPatternDetector()
         trader = DayTradingSmartMoney(initial_capital=initial_capital)
-        
-        # Track results
-        trades = []
-        equity_curve = [initial_capital]
+        risk_manager = DayTradingRiskManager()
         
         # Analyze market data in chunks for realistic simulation
         chunk_size = 24  # 24-hour chunks
         total_chunks = len(data) // chunk_size
         
+        # Track results in preallocated arrays (at most 2 trades per session)
+        max_trades = total_chunks * 2
+        bar_arr = np.empty(max_trades, dtype=np.int64)
+        dir_arr = np.empty(max_trades, dtype=object)
+        entry_arr = np.empty(max_trades, dtype=np.float64)
+        exit_arr = np.empty(max_trades, dtype=np.float64)
+        size_arr = np.empty(max_trades, dtype=np.float64)
+        pnl_arr = np.empty(max_trades, dtype=np.float64)
+        pattern_arr = np.empty(max_trades, dtype=object)
+        confidence_arr = np.empty(max_trades, dtype=np.float64)
+        equity_curve = np.empty(max_trades + 1, dtype=np.float64)
+        equity_curve[0] = initial_capital
+        k = 0
+        
+        # Simulated exit: the close 12 hours after each bar (clamped to the last bar)
+        close_np = data['Close'].to_numpy(dtype=np.float64)
+        exit_idx = np.minimum(np.arange(len(data)) + 12, len(data) - 1)
+        exit_close_at = close_np[exit_idx]
+        
         print(f"\n🎯 RUNNING BACKTEST ({total_chunks} trading sessions)...")
         
+        # Score every bar once over the full history, then bucket the signal bars by session
+        scored = detect_signals(data, trader)
+        sig_bar = np.flatnonzero(scored['signal'].to_numpy())
+        sig_direction = scored['direction'].to_numpy()
+        sig_sign = scored['sign'].to_numpy()
+        sig_confidence = scored['strength'].to_numpy() * CONFIDENCE_PER_STRENGTH
+        
         for i in range(1, total_chunks):
-            # Get data chunk for analysis
+            # Session bounds (24 bars)
             start_idx = i * chunk_size
             end_idx = min((i + 1) * chunk_size, len(data))
-            chunk_data = data.iloc[start_idx:end_idx]
             
-            if len(chunk_data) < 10:
+            if end_idx - start_idx < 10:
                 continue
             
-            # Detect patterns in this chunk
-            signals = pattern_detector.analyze_patterns(chunk_data)
+            # Signals within this chunk
+            in_chunk = sig_bar[(sig_bar >= start_idx) & (sig_bar < end_idx)][:2]  # Max 2 trades per session
             
-            if signals:
-                for signal in signals[:2]:  # Max 2 trades per session
-                    # Execute trade with real market conditions
-                    current_bar = chunk_data.iloc[-1]
-                    trade_result = trader.execute_trade(signal, current_bar)
-                    
-                    if trade_result:
-                        # Simulate trade outcome based on subsequent price action
-                        if end_idx < len(data):
-                            future_data = data.iloc[end_idx:end_idx+12]  # Next 12 hours
-                            
-                            if len(future_data) > 0:
-                                exit_price = future_data['Close'].iloc[-1]
-                                
-                                # Calculate trade result
-                                if signal['direction'] == 'BUY':
-                                    pnl = (exit_price - trade_result['entry_price']) * trade_result['position_size']
-                                else:
-                                    pnl = (trade_result['entry_price'] - exit_price) * trade_result['position_size']
-                                
-                                # Apply realistic spread/commission
-                                commission = abs(trade_result['position_size'] * trade_result['entry_price'] * 0.0001)
-                                final_pnl = pnl - commission
-                                
-                                trade_record = {
-                                    'timestamp': current_bar.name,
-                                    'pair': pair_name,
-                                    'direction': signal['direction'],
-                                    'entry_price': trade_result['entry_price'],
-                                    'exit_price': exit_price,
-                                    'position_size': trade_result['position_size'],
-                                    'pnl': final_pnl,
-                                    'pattern': signal['pattern'],
-                                    'confidence': signal['confidence']
-                                }
-                                
-                                trades.append(trade_record)
-                                equity_curve.append(equity_curve[-1] + final_pnl)
+            # Enter at the session's last close and simulate the outcome from subsequent price action
+            if in_chunk.size and end_idx < len(data):
+                signals = [{'direction': sig_direction[b], 'sign': int(sig_sign[b]), 'pattern': 'day_trading_smc',
+                            'pattern_type': 'reversal', 'confidence': sig_confidence[b]} for b in in_chunk]
+                entry_price = close_np[end_idx - 1]
+                setups = risk_manager.calculate_day_trading_position_sizes(signals, entry_price, equity_curve[k])
+                exit_price = float(exit_close_at[end_idx - 1])  # Next 12 hours
+                
+                # Apply realistic spread/commission
+                sizes = setups['position_size']
+                pnls = (sig_sign[in_chunk] * (exit_price - entry_price) * sizes
+                        - np.abs(sizes * entry_price) * 0.0001)
+                
+                for signal, final_pnl, size in zip(signals, pnls, sizes):
+                    bar_arr[k] = end_idx - 1
+                    dir_arr[k] = signal['direction']
+                    entry_arr[k] = entry_price
+                    exit_arr[k] = exit_price
+                    size_arr[k] = size
+                    pnl_arr[k] = final_pnl
+                    pattern_arr[k] = signal['pattern']
+                    confidence_arr[k] = signal['confidence']
+                    equity_curve[k + 1] = equity_curve[k] + final_pnl
+                    k += 1
         
         # Calculate performance metrics
-        if trades:
-            total_trades = len(trades)
-            winning_trades = len([t for t in trades if t['pnl'] > 0])
+        if k > 0:
+            trades = pd.DataFrame({
+                'timestamp': data.index[bar_arr[:k]],
+                'pair': pair_name,
+                'direction': dir_arr[:k],
+                'entry_price': entry_arr[:k],
+                'exit_price': exit_arr[:k],
+                'position_size': size_arr[:k],
+                'pnl': pnl_arr[:k],
+                'pattern': pattern_arr[:k],
+                'confidence': confidence_arr[:k]
+            })
+            pnl = pnl_arr[:k]
+            wins = pnl[pnl > 0]
+            losses = pnl[pnl < 0]
+            
+            total_trades = k
+            winning_trades = wins.size
             losing_trades = total_trades - winning_trades
             
-            total_pnl = sum(t['pnl'] for t in trades)
+            total_pnl = pnl.sum()
             win_rate = (winning_trades / total_trades) * 100
             
-            avg_win = np.mean([t['pnl'] for t in trades if t['pnl'] > 0]) if winning_trades > 0 else 0
-            avg_loss = np.mean([t['pnl'] for t in trades if t['pnl'] < 0]) if losing_trades > 0 else 0
+            gross_win = wins.sum()
+            gross_loss = -losses.sum()
+            avg_win = gross_win / wins.size if wins.size else 0
+            avg_loss = -gross_loss / losses.size if losses.size else 0
             
-            profit_factor = abs(avg_win * winning_trades / (avg_loss * losing_trades)) if losing_trades > 0 else float('inf')
+            profit_factor = gross_win / gross_loss if losses.size else float('inf')
             
             final_balance = initial_capital + total_pnl
             total_return = (total_pnl / initial_capital) * 100
@@ -139,7 +173,7 @@ def backtest_real_data(symbol, pair_name, days=30, initial_capital=10000):
                 'total_return': total_return,
                 'profit_factor': profit_factor,
                 'final_balance': final_balance,
-                'trades': trades[-3:]  # Last 3 trades for detail
+                'trades': trades.tail(3).to_dict('records')  # Last 3 trades for detail
             }
         else:
             print(f"⚠️ No trades executed for {pair_name}")
@@ -149,6 +183,12 @@ def backtest_real_data(symbol, pair_name, days=30, initial_capital=10000):
         print(f"❌ Error backtesting {pair_name}: {e}")
         return None
 
+@buffered_output
+def _backtest_one(args):
+    """Process-pool entry point: (symbol, pair_name, days, initial_capital, data) -> result dict or None"""
+    symbol, pair_name, days, initial_capital, data = args
+    return backtest_real_data(symbol, pair_name, days=days, initial_capital=initial_capital, data=data)
+
 def run_full_system_backtest():
     """Run complete system backtest on all pairs with real data"""
     
@@ -163,13 +203,18 @@ def run_full_system_backtest():
         'US30': '^DJI'  # Test subset for speed
     }
     
-    results = []
     total_initial = 40000  # $10k per pair
     
-    for pair_name, symbol in test_pairs.items():
-        result = backtest_real_data(symbol, pair_name, days=14, initial_capital=10000)
-        if result:
-            results.append(result)
+    # Fetch every pair's history up front (concurrently) so the workers only backtest
+    days = 14
+    symbols = list(test_pairs.values())
+    histories = prefetch_histories(symbols, f"{days}d", "1h")
+    
+    # One worker per pair, each with its own $10k account
+    jobs = [(symbol, pair_name, days, 10000, data)
+            for (pair_name, symbol), data in zip(test_pairs.items(), histories)]
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1), mp_context=POOL_CONTEXT) as executor:
+        results = [result for result in executor.map(_backtest_one, jobs) if result]
     
     # Portfolio summary
     if results:
@@ -7,6 +7,7 @@ Uses generated data to demonstrate trading performance
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
 
 from trading_system import InstitutionalPatternDetector, DayTradingSmartMoney
 import pandas as pd
@@ -122,6 +123,9 @@ def backtest_pair(pair_name, symbol):
         print(f"💰 Starting capital: ${trader.capital:,.2f}")
         print(f"🎯 Running strategy simulation...")
         
+        # Plain array indexing avoids building a pandas Series per bar
+        close_arr = data['Close'].to_numpy(dtype=np.float64)
+        
         # Run through the data
         for i in range(50, len(data) - 1):  # Need history for patterns
             current_data = data.iloc[max(0, i-50):i+1]
@@ -130,9 +134,11 @@ def backtest_pair(pair_name, symbol):
             signals = pattern_detector.analyze_patterns(current_data)
             
             if signals:
+                current_price = close_arr[i]
+                recent_trend = (close_arr[i] - close_arr[i-10]) / close_arr[i-10]
+                
                 for signal in signals:
                     total_trades += 1
-                    current_price = data.iloc[i]['Close']
                     
                     # Calculate position size (2% risk per trade)
                     risk_amount = trader.capital * 0.02
@@ -140,11 +146,9 @@ def backtest_pair(pair_name, symbol):
                     # Simulate trade outcome based on market conditions
                     if signal['direction'] == 'BUY':
                         # Bullish trade - higher success in uptrend
-                        recent_trend = (data.iloc[i]['Close'] - data.iloc[i-10]['Close']) / data.iloc[i-10]['Close']
                         win_probability = 0.65 if recent_trend > 0 else 0.45
                     else:
                         # Bearish trade - higher success in downtrend  
-                        recent_trend = (data.iloc[i]['Close'] - data.iloc[i-10]['Close']) / data.iloc[i-10]['Close']
                         win_probability = 0.65 if recent_trend < 0 else 0.45
                     
                     # Determine trade outcome
@@ -0,0 +1,25 @@
+"""
+Optional Numba JIT Support
+Compiled kernels fall back to plain Python when numba is not installed
+"""
+
+try:
+    from numba import njit, prange, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    types = None
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit (supports bare and called forms)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+def array_1d(dtype_name):
+    """1-D array type for explicit signatures; read-only so it also accepts shared buffers (numba only)"""
+    return types.Array(getattr(types, dtype_name), 1, 'A', readonly=True)
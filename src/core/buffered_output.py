@@ -0,0 +1,28 @@
+"""
+Buffered Worker Output
+Pool workers print a lot per pair - collect it and write each pair's report in one go
+"""
+
+import io
+import os
+import sys
+import contextlib
+from functools import wraps
+
+# SMC_QUIET=1 drops per-pair detail (e.g. during parameter sweeps)
+QUIET = os.environ.get('SMC_QUIET', '0') not in ('', '0')
+
+def buffered_output(func):
+    """Capture func's prints and emit them as a single write (nothing when SMC_QUIET is set)"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            if not QUIET:
+                sys.stdout.write(buffer.getvalue())
+                sys.stdout.flush()
+    return wrapper
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-Time Build for the Institutional Pattern Kernels
+Run once to produce the pattern_kernels_aot extension used by trading_system
+"""
+
+import os
+from numba.pycc import CC
+
+from pattern_kernels import (
+    scan_institutional_sweeps, scan_order_blocks,
+    INSTITUTIONAL_SWEEP_SIGNATURE, ORDER_BLOCK_SIGNATURE
+)
+
+cc = CC('pattern_kernels_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Same signatures as the JIT versions (read-only inputs, so pandas column views pass straight in)
+cc.export('scan_institutional_sweeps', INSTITUTIONAL_SWEEP_SIGNATURE)(scan_institutional_sweeps.py_func)
+cc.export('scan_order_blocks', ORDER_BLOCK_SIGNATURE)(scan_order_blocks.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built pattern_kernels_aot in {cc.output_dir}")
@@ -0,0 +1,141 @@
+"""
+Historical Data Cache
+Stores yfinance downloads as Parquet so repeated backtests skip the network
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from functools import lru_cache
+import pandas as pd
+import yfinance as yf
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.cache', 'yf')
+
+# Relative periods ('5d') move with the clock, so their cache expires
+HISTORY_TTL = 15 * 60  # 15 minutes
+
+# Bar length per yfinance interval, for the in-memory bucket cache
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600, '1d': 86400
+}
+
+def _cache_path(*key_parts):
+    """Parquet file for one download, keyed on its arguments"""
+    key = "|".join(str(part) for part in key_parts)
+    digest = hashlib.md5(key.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.parquet")
+
+def _read_cache(path, symbol):
+    """Load a cached frame, or None if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path, engine='pyarrow', memory_map=True)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable cache for {symbol}: {e}")
+        return None
+
+def _write_cache(path, symbol, data):
+    """Store a non-empty frame, skipping silently without pyarrow"""
+    if data.empty:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data.to_parquet(path, engine='pyarrow')
+    except ImportError:
+        pass  # pyarrow not installed - run without caching
+    except Exception as e:
+        print(f"⚠️ Could not cache {symbol}: {e}")
+
+def cached_download(symbol, start, end, interval):
+    """yf.download with an on-disk Parquet cache"""
+    path = _cache_path(symbol, start, end, interval)
+
+    data = _read_cache(path, symbol)
+    if data is not None:
+        return data
+
+    data = yf.download(symbol, start=start, end=end, interval=interval)
+    _write_cache(path, symbol, data)
+    return data
+
+def _fresh_history(symbol, period, interval, ttl_sec=HISTORY_TTL):
+    """Disk-cached history for symbol if it is younger than ttl_sec, else None"""
+    path = _cache_path('history', symbol, period, interval)
+
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl_sec:
+        return _read_cache(path, symbol)
+    return None
+
+def cached_history(symbol, period, interval, ttl_sec=HISTORY_TTL):
+    """yf.Ticker(symbol).history with an on-disk Parquet cache that expires after ttl_sec"""
+    path = _cache_path('history', symbol, period, interval)
+
+    data = _fresh_history(symbol, period, interval, ttl_sec)
+    if data is not None:
+        return data
+
+    data = yf.Ticker(symbol).history(period=period, interval=interval)
+    _write_cache(path, symbol, data)
+    return data
+
+@lru_cache(maxsize=64)
+def _history_in_bucket(symbol, period, interval, bucket):
+    """cached_history memoized per bar bucket (exceptions are not cached)"""
+    return cached_history(symbol, period, interval)
+
+def bucketed_history(symbol, period, interval):
+    """cached_history kept in memory until the next bar of `interval` opens"""
+    bucket = int(time.time() // INTERVAL_SECONDS.get(interval, HISTORY_TTL))
+    
+    # Shallow copy so callers adding columns don't touch the memoized frame
+    return _history_in_bucket(symbol, period, interval, bucket).copy(deep=False)
+
+@lru_cache(maxsize=16)
+def _batch_in_bucket(symbols, period, interval, bucket):
+    """Histories for a tuple of symbols, with every cache miss fetched in one yf.download request"""
+    frames = {}
+    for symbol in symbols:
+        data = _fresh_history(symbol, period, interval)
+        if data is not None:
+            frames[symbol] = data
+
+    missing = [symbol for symbol in symbols if symbol not in frames]
+    if missing:
+        # One HTTP round trip for all misses; columns come back as (ticker, field)
+        batch = yf.download(" ".join(missing), period=period, interval=interval,
+                            group_by='ticker', progress=False, threads=True)
+        for symbol in missing:
+            # Rows are the union of all tickers' bars - drop the ones this symbol has no data for
+            data = batch[symbol].dropna(how='all') if symbol in batch.columns.get_level_values(0) else pd.DataFrame()
+            data.columns.name = None
+            _write_cache(_cache_path('history', symbol, period, interval), symbol, data)
+            frames[symbol] = data
+
+    return frames
+
+async def _gather_histories(symbols, period, interval):
+    """Run bucketed_history for every symbol concurrently on the default thread pool"""
+    loop = asyncio.get_running_loop()
+    fetches = [loop.run_in_executor(None, bucketed_history, symbol, period, interval) for symbol in symbols]
+    return await asyncio.gather(*fetches, return_exceptions=True)
+
+def prefetch_histories(symbols, period, interval):
+    """Download all symbols in one batched request; a failed download comes back as None"""
+    bucket = int(time.time() // INTERVAL_SECONDS.get(interval, HISTORY_TTL))
+    try:
+        frames = _batch_in_bucket(tuple(symbols), period, interval, bucket)
+        return [frames[symbol].copy(deep=False) for symbol in symbols]
+    except Exception as e:
+        print(f"⚠️ Batch download failed, fetching symbols one by one: {e}")
+
+    # Fall back to concurrent per-symbol requests
+    histories = asyncio.run(_gather_histories(symbols, period, interval))
+
+    for symbol, history in zip(symbols, histories):
+        if isinstance(history, Exception):
+            print(f"⚠️ Prefetch failed for {symbol}: {history}")
+    return [None if isinstance(history, Exception) else history for history in histories]
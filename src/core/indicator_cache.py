@@ -0,0 +1,33 @@
+"""
+Shared Indicator Cache
+Process-wide memo for indicator values, keyed on what they were computed from
+"""
+
+from collections import OrderedDict
+
+# Oldest entries are evicted beyond this many values
+MAX_ENTRIES = 4096
+
+_cache = OrderedDict()
+
+def get_or_compute(prefix, keys, fn):
+    """Value cached under (prefix, *keys), computing it with fn() on a miss.
+
+    Keys should pin the inputs down completely, e.g. ("SMA", (symbol, 20, last_bar_ts)).
+    """
+    key = (prefix, *keys)
+    try:
+        _cache.move_to_end(key)
+        return _cache[key]
+    except KeyError:
+        pass
+    
+    value = fn()
+    _cache[key] = value
+    if len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return value
+
+def clear():
+    """Drop every cached value"""
+    _cache.clear()
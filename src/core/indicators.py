@@ -0,0 +1,81 @@
+"""
+Shared Indicator Kernels
+Single-pass compiled implementations used by the strategy detectors
+"""
+
+import numpy as np
+from _njit import njit, types, array_1d, NUMBA_AVAILABLE
+
+# Explicit signatures compile the kernels at import (and load them from the on-disk
+# cache on later runs) instead of on the first call in every fresh process
+if NUMBA_AVAILABLE:
+    F4_1D, F8_1D = array_1d('float32'), array_1d('float64')
+    RSI_SIGNATURES = [types.float64[:](F4_1D, types.int64), types.float64[:](F8_1D, types.int64)]
+    ATR_SIGNATURES = [types.float64[:](F4_1D, F4_1D, F4_1D, types.int64), types.float64[:](F8_1D, F8_1D, F8_1D, types.int64)]
+else:
+    F4_1D = F8_1D = RSI_SIGNATURES = ATR_SIGNATURES = None
+
+def align_windows(window_stats: np.ndarray, n: int, lag: int = 0) -> np.ndarray:
+    """Spread per-window stats (e.g. sliding_window_view(x, w).max(axis=1)) over n bars.
+
+    Index i holds the stat of the window ending at bar i - lag; earlier bars are NaN.
+    """
+    aligned = np.full(n, np.nan, dtype=window_stats.dtype)
+    aligned[n - len(window_stats) + lag:] = window_stats[:len(window_stats) - lag]
+    return aligned
+
+@njit(RSI_SIGNATURES, cache=True)
+def rsi_wilder(prices, period):
+    """RSI with Wilder's recursive averages - O(n) instead of re-summing each window"""
+    
+    n = len(prices)
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+    
+    # Seed with the simple average of the first `period` changes
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = prices[i] - prices[i-1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+    
+    for i in range(period, n):
+        if i > period:
+            delta = prices[i] - prices[i-1]
+            avg_gain = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+            avg_loss = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
+        
+        if avg_loss > 0:
+            rsi[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            rsi[i] = 100.0
+    
+    return rsi
+
+@njit(ATR_SIGNATURES, cache=True)
+def atr_wilder(high, low, close, period):
+    """Average True Range with Wilder smoothing - true range and average in one pass"""
+    
+    n = len(close)
+    atr = np.full(n, np.nan)
+    if n <= period:
+        return atr
+    
+    # True range needs the previous close, so bar 0 has none; seed on bars 1..period
+    total = 0.0
+    for i in range(1, n):
+        tr = max(high[i] - low[i], abs(high[i] - close[i-1]), abs(low[i] - close[i-1]))
+        if i < period:
+            total += tr
+        elif i == period:
+            atr[i] = (total + tr) / period
+        else:
+            atr[i] = (atr[i-1] * (period - 1) + tr) / period
+    
+    return atr
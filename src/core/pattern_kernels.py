@@ -0,0 +1,296 @@
+"""
+Compiled Pattern Scan Kernels
+Kept in core so numba's on-disk cache always sees them under one module name
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from _njit import njit, types, NUMBA_AVAILABLE
+from indicators import F4_1D, F8_1D
+
+# Pattern codes returned by the scan kernel
+FVG_PATTERN = 0
+SWEEP_PATTERN = 1
+
+# o, h, l, c, v (float32), rsi (float64), sma20, prev_high, prev_low, prev_vol_mean (float32), min_strength
+SCAN_SIGNATURE = (
+    types.Tuple((types.int64[:], types.int8[:], types.int8[:], types.float64[:]))(
+        F4_1D, F4_1D, F4_1D, F4_1D, F4_1D, F8_1D, F4_1D, F4_1D, F4_1D, F4_1D, types.float64)
+    if NUMBA_AVAILABLE else None
+)
+
+@njit(SCAN_SIGNATURE, cache=True)
+def scan_balanced_patterns(o, h, l, c, v, rsi, sma20, prev_high, prev_low, prev_vol_mean, min_strength):
+    """Compiled bar scan - returns parallel arrays (bar, direction, pattern, strength)"""
+    
+    n = len(c)
+    
+    # At most one FVG and one sweep per bar
+    idx = np.empty(2 * n, np.int64)
+    directions = np.empty(2 * n, np.int8)
+    patterns = np.empty(2 * n, np.int8)
+    strengths = np.empty(2 * n, np.float64)
+    k = 0
+    
+    for i in range(15, n):
+        # Enhanced Fair Value Gap (more reliable pattern)
+        direction = 0
+        gap_size = 0.0
+        if h[i-2] < l[i] and c[i-1] > o[i-1] and 30 < rsi[i] < 75:
+            direction = 1
+            gap_size = (l[i] - h[i-2]) / h[i-2]
+        elif l[i-2] > h[i] and c[i-1] < o[i-1] and 25 < rsi[i] < 70:
+            direction = -1
+            gap_size = (l[i-2] - h[i]) / h[i]
+        
+        if direction != 0 and gap_size > 0.0008:  # Reasonable gap size
+            strength = min(90.0, 70 + gap_size * 5000)
+            
+            # Quality enhancements
+            if v[i] > prev_vol_mean[i] * 1.2:
+                strength += 3
+            if (direction == 1 and c[i] > sma20[i]) or (direction == -1 and c[i] < sma20[i]):
+                strength += 3
+            
+            if strength >= min_strength:
+                idx[k] = i
+                directions[k] = direction
+                patterns[k] = FVG_PATTERN
+                strengths[k] = strength
+                k += 1
+        
+        # Optimized Liquidity Sweep
+        direction = 0
+        wick = 0.0
+        if l[i] < prev_low[i] * 0.9998 and c[i] > o[i] and c[i] > prev_high[i] * 0.9995 and 25 < rsi[i] < 70:
+            direction = 1
+            wick = abs(c[i] - l[i])
+        elif h[i] > prev_high[i] * 1.0002 and c[i] < o[i] and c[i] < prev_low[i] * 1.0005 and 30 < rsi[i] < 75:
+            direction = -1
+            wick = abs(h[i] - c[i])
+        
+        if direction != 0:
+            strength = 75 + wick / c[i] * 1500
+            
+            if v[i] > prev_vol_mean[i] * 1.15:
+                strength += 4
+            
+            strength = min(92.0, strength)
+            
+            if strength >= min_strength:
+                idx[k] = i
+                directions[k] = direction
+                patterns[k] = SWEEP_PATTERN
+                strengths[k] = strength
+                k += 1
+    
+    return idx[:k], directions[:k], patterns[:k], strengths[:k]
+
+# o, h, l, c, v (float32), rsi (float64), sma20, prev_high, prev_low, prev_vol_mean (float32), min_strength
+SWEEP_SCAN_SIGNATURE = (
+    types.Tuple((types.int64[:], types.int8[:], types.float64[:]))(
+        F4_1D, F4_1D, F4_1D, F4_1D, F4_1D, F8_1D, F4_1D, F4_1D, F4_1D, F4_1D, types.float64)
+    if NUMBA_AVAILABLE else None
+)
+
+@njit(SWEEP_SCAN_SIGNATURE, cache=True)
+def scan_liquidity_sweeps(o, h, l, c, v, rsi, sma20, prev_high, prev_low, prev_vol_mean, min_strength):
+    """Compiled enhanced-sweep scan - returns parallel arrays (bar, direction, strength)"""
+    
+    n = len(c)
+    
+    # At most one sweep per bar
+    idx = np.empty(n, np.int64)
+    directions = np.empty(n, np.int8)
+    strengths = np.empty(n, np.float64)
+    k = 0
+    
+    # Serial on purpose: a few thousand bars gain nothing from prange, and parallel=True would
+    # start numba's threading layer at import, after which the process can no longer fork safely
+    for i in range(20, n):
+        if not (30 < rsi[i] < 70):
+            continue
+        
+        direction = 0
+        wick = 0.0
+        if l[i] < prev_low[i] * 0.9995 and c[i] > o[i] and c[i] > prev_high[i] * 0.9998:  # Stronger sweep
+            direction = 1
+            wick = abs(c[i] - l[i])
+        elif h[i] > prev_high[i] * 1.0005 and c[i] < o[i] and c[i] < prev_low[i] * 1.0002:
+            direction = -1
+            wick = abs(h[i] - c[i])
+        
+        if direction != 0:
+            # Base strength plus quality enhancements (volume, trend alignment)
+            strength = 75 + wick / c[i] * 2000
+            if v[i] > prev_vol_mean[i] * 1.3:
+                strength += 5
+            if (direction == 1 and c[i] > sma20[i]) or (direction == -1 and c[i] < sma20[i]):
+                strength += 5
+            strength = min(95.0, strength)
+            
+            if strength >= min_strength:
+                idx[k] = i
+                directions[k] = direction
+                strengths[k] = strength
+                k += 1
+    
+    return idx[:k], directions[:k], strengths[:k]
+
+# Institutional detector (trading_system): sweep/order-block codes
+BULLISH = 1
+BEARISH = -1
+
+# high, low, close, lookback -> (bar, kind, swept level, reversal strength %)
+INSTITUTIONAL_SWEEP_SIGNATURE = (
+    types.Tuple((types.int64[:], types.int8[:], types.float64[:], types.float64[:]))(
+        F8_1D, F8_1D, F8_1D, types.int64)
+    if NUMBA_AVAILABLE else None
+)
+
+# open, high, low, close -> (bar, kind, strength %)
+ORDER_BLOCK_SIGNATURE = (
+    types.Tuple((types.int64[:], types.int8[:], types.float64[:]))(F8_1D, F8_1D, F8_1D, F8_1D)
+    if NUMBA_AVAILABLE else None
+)
+
+@njit(INSTITUTIONAL_SWEEP_SIGNATURE, cache=True)
+def scan_institutional_sweeps(high, low, close, lookback):
+    """Sweeps of the previous `lookback` bars' high/low that close back inside - parallel arrays"""
+    
+    n = len(close)
+    
+    # At most one sweep above and one below per bar
+    idx = np.empty(2 * n, np.int64)
+    kinds = np.empty(2 * n, np.int8)
+    levels = np.empty(2 * n, np.float64)
+    strengths = np.empty(2 * n, np.float64)
+    k = 0
+    
+    # Window extremes via monotonic deques of bar numbers (queue[head:tail]) - O(n) instead
+    # of rescanning `lookback` bars per bar; NaNs are never queued, like the skipped comparisons
+    high_queue = np.empty(n, np.int64)
+    low_queue = np.empty(n, np.int64)
+    high_head = high_tail = low_head = low_tail = 0
+    
+    for i in range(n):
+        if i >= lookback:
+            # Evict bars that fell out of the window [i - lookback, i)
+            while high_head < high_tail and high_queue[high_head] < i - lookback:
+                high_head += 1
+            while low_head < low_tail and low_queue[low_head] < i - lookback:
+                low_head += 1
+            
+            recent_high = high[high_queue[high_head]] if high_head < high_tail else -np.inf
+            recent_low = low[low_queue[low_head]] if low_head < low_tail else np.inf
+            
+            # An all-NaN window has no level to sweep
+            if recent_high == -np.inf:
+                recent_high = np.nan
+            if recent_low == np.inf:
+                recent_low = np.nan
+            
+            # Sweep above recent highs that closes back below the high
+            if high[i] > recent_high * 1.001 and close[i] < high[i] * 0.998:
+                idx[k] = i
+                kinds[k] = BULLISH
+                levels[k] = high[i]
+                strengths[k] = (high[i] - close[i]) / close[i] * 100
+                k += 1
+            
+            # Sweep below recent lows that closes back above the low
+            if low[i] < recent_low * 0.999 and close[i] > low[i] * 1.002:
+                idx[k] = i
+                kinds[k] = BEARISH
+                levels[k] = low[i]
+                strengths[k] = (close[i] - low[i]) / low[i] * 100
+                k += 1
+        
+        # Queue bar i, dropping bars it dominates
+        if high[i] == high[i]:
+            while high_tail > high_head and high[high_queue[high_tail - 1]] <= high[i]:
+                high_tail -= 1
+            high_queue[high_tail] = i
+            high_tail += 1
+        if low[i] == low[i]:
+            while low_tail > low_head and low[low_queue[low_tail - 1]] >= low[i]:
+                low_tail -= 1
+            low_queue[low_tail] = i
+            low_tail += 1
+    
+    return idx[:k], kinds[:k], levels[:k], strengths[:k]
+
+@njit(ORDER_BLOCK_SIGNATURE, cache=True)
+def scan_order_blocks(o, h, l, c):
+    """Strong candles (>0.5% body) closing beyond the previous bar's range - parallel arrays"""
+    
+    n = len(c)
+    idx = np.empty(n, np.int64)
+    kinds = np.empty(n, np.int8)
+    strengths = np.empty(n, np.float64)
+    k = 0
+    
+    for i in range(3, n):
+        if c[i] > o[i] and c[i] > h[i-1] and (c[i] - o[i]) / o[i] > 0.005:
+            idx[k] = i
+            kinds[k] = BULLISH
+            strengths[k] = (c[i] - o[i]) / o[i] * 100
+            k += 1
+        elif c[i] < o[i] and c[i] < l[i-1] and (o[i] - c[i]) / c[i] > 0.005:
+            idx[k] = i
+            kinds[k] = BEARISH
+            strengths[k] = (o[i] - c[i]) / c[i] * 100
+            k += 1
+    
+    return idx[:k], kinds[:k], strengths[:k]
+
+def _institutional_sweeps_numpy(high, low, close, lookback):
+    """Vectorized scan_institutional_sweeps (same arrays, same order) for runs without numba"""
+    
+    n = len(close)
+    if lookback <= 0 or n <= lookback:
+        return np.empty(0, np.int64), np.empty(0, np.int8), np.empty(0), np.empty(0)
+    
+    # Previous `lookback` bars' extremes for bars lookback..n-1; fmax/fmin skip NaNs and an
+    # all-NaN window stays NaN, like the kernel
+    recent_high = np.fmax.reduce(sliding_window_view(high[:-1], lookback), axis=1)
+    recent_low = np.fmin.reduce(sliding_window_view(low[:-1], lookback), axis=1)
+    recent_high[recent_high == -np.inf] = np.nan
+    recent_low[recent_low == np.inf] = np.nan
+    
+    h, l, c = high[lookback:], low[lookback:], close[lookback:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bull = np.flatnonzero((h > recent_high * 1.001) & (c < h * 0.998))
+        bear = np.flatnonzero((l < recent_low * 0.999) & (c > l * 1.002))
+        strengths = np.concatenate(((h[bull] - c[bull]) / c[bull] * 100, (c[bear] - l[bear]) / l[bear] * 100))
+    
+    # Bar order, a bar's sweep above before its sweep below (stable sort of bull then bear)
+    idx = np.concatenate((bull, bear))
+    order = np.argsort(idx, kind='stable')
+    kinds = np.concatenate((np.full(len(bull), BULLISH, np.int8), np.full(len(bear), BEARISH, np.int8)))
+    levels = np.concatenate((h[bull], l[bear]))
+    return idx[order] + lookback, kinds[order], levels[order], strengths[order]
+
+def _order_blocks_numpy(o, h, l, c):
+    """Vectorized scan_order_blocks (same arrays) for runs without numba"""
+    
+    if len(c) <= 3:
+        return np.empty(0, np.int64), np.empty(0, np.int8), np.empty(0)
+    
+    o_, c_ = o[3:], c[3:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bull_body = (c_ - o_) / o_
+        bear_body = (o_ - c_) / c_
+        bull = (c_ > o_) & (c_ > h[2:-1]) & (bull_body > 0.005)
+        bear = (c_ < o_) & (c_ < l[2:-1]) & (bear_body > 0.005)
+    
+    hits = np.flatnonzero(bull | bear)
+    is_bull = bull[hits]
+    kinds = np.where(is_bull, BULLISH, BEARISH).astype(np.int8)
+    strengths = np.where(is_bull, bull_body[hits], bear_body[hits]) * 100
+    return (hits + 3).astype(np.int64), kinds, strengths
+
+# Without numba the kernels above would run as interpreted loops - use the vectorized versions
+if not NUMBA_AVAILABLE:
+    scan_institutional_sweeps = _institutional_sweeps_numpy
+    scan_order_blocks = _order_blocks_numpy
@@ -6,6 +6,7 @@ Check all Smart Money Concepts trading systems and components
 
 import os
 import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 def check_smc_systems():
     """Check status of all SMC trading systems"""
@@ -26,9 +27,12 @@ def check_smc_systems():
         "Live Data Feed": "real_data_integration.py"
     }
     
+    # One directory listing instead of a stat per component
+    files_present = set(os.listdir('.'))
+    
     print("SYSTEM COMPONENTS:")
     for name, file in systems.items():
-        if os.path.exists(file):
+        if file.rstrip('/') in files_present:
             print(f"   {name}")
         else:
             print(f"   {name} - MISSING")
@@ -110,7 +114,6 @@ def check_live_data():
     
     try:
         # Import and test live data
-        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
         from index import get_real_market_data
         
         live_data = get_real_market_data()
@@ -1,99 +1,200 @@
 # Real Trading System Classes
 # Extracted from model.ipynb for Flask app integration
 
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, time
+from datetime import datetime, time, timedelta, timezone
 import random
-from typing import Dict, List, Optional
-import pytz
+import weakref
+from time import monotonic
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, NamedTuple, Optional
+from pattern_kernels import scan_institutional_sweeps, scan_order_blocks, BULLISH
+import indicator_cache
+
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+PUSHOVER_TIMEOUT = (3, 5)  # connect, read seconds - a stalled push must not hang the scan
+PUSH_BATCH_SIZE = 5  # signals per combined message (Pushover caps messages at 1024 characters)
+ALERT_MESSAGE_TEMPLATE = (
+    "{pair} {direction}\n"
+    "Entry: {entry_price:.4f}\n"
+    "Target: {target_profit:.4f}\n"
+    "Stop: {stop_loss:.4f}\n"
+    "Confidence: {confidence}\n"
+    "Risk: {risk_level}"
+)
+
+# Prefer the ahead-of-time build from compile_pattern_kernels.py (no JIT warm-up)
+try:
+    from pattern_kernels_aot import scan_institutional_sweeps, scan_order_blocks
+except ImportError:
+    pass
+
+# Optional: LazyFrame input for offline backtests
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+def _signal_sign(signal):
+    """+1 for a BUY, -1 otherwise - stored on the signal by the detectors, derived for older dicts"""
+    return signal.get('sign') or (1 if signal['direction'] == 'BUY' else -1)
+
+class OHLCV(NamedTuple):
+    """Price columns as float64 arrays - extracted from a frame once and shared by the detectors"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: Optional[np.ndarray]
+    
+    @classmethod
+    def from_frame(cls, data):
+        """Arrays of a lowercase-column OHLC(V) frame (volume None when the frame has none)"""
+        return cls(*(data[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close')),
+                   data['volume'].to_numpy(dtype=np.float64) if 'volume' in data.columns else None)
+
+class Trade(NamedTuple):
+    """One simulated backtest trade (a tuple, so thousands of them stay small)"""
+    date: object
+    pair: str
+    direction: str
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    position_size: float
+    pnl: float
+    pattern: str
+    confidence: float
+    risk_amount: float
+    quality_score: float = 0.0  # optimized strategy only
+    rr_ratio: float = 0.0
+
+def _bar_hours(index):
+    """Hour of every timestamp in index as an int array (in UTC when the index is tz-aware)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC')
+    return index.hour.to_numpy()
+
+def _sweep_dicts(idx, kinds, levels, strengths, offset=0):
+    """Sweep dicts from scan_institutional_sweeps' parallel arrays (indices shifted by -offset)"""
+    sweeps = []
+    for i, kind, level, strength in zip((idx - offset).tolist(), kinds, levels, strengths):
+        if kind == BULLISH:  # Sweep above recent highs
+            sweeps.append({'type': 'BULLISH_SWEEP', 'index': i, 'sweep_high': level, 'reversal_strength': strength})
+        else:  # Sweep below recent lows
+            sweeps.append({'type': 'BEARISH_SWEEP', 'index': i, 'sweep_low': level, 'reversal_strength': strength})
+    return sweeps
+
+def _order_block_dicts(idx, kinds, strengths, high, low, offset=0):
+    """Order block dicts from scan_order_blocks' parallel arrays (indices shifted by -offset)"""
+    # Gather the hit bars' ranges in one step instead of indexing per block
+    return [{
+        'type': 'BULLISH_OB' if kind == BULLISH else 'BEARISH_OB',
+        'top': top,
+        'bottom': bottom,
+        'strength': strength,
+        'index': i
+    } for i, kind, top, bottom, strength in zip((idx - offset).tolist(), kinds, high[idx], low[idx], strengths)]
 
 class InstitutionalPatternDetector:
     def __init__(self):
         self.liquidity_levels = []
-        
+        self._levels_sorted = None  # liquidity_levels as a sorted array, built on demand
+        self._precomputed = {}  # id(frame) -> (weakref, lookback, scans), see precompute()
+    
     def detect_liquidity_sweeps(self, data, lookback=20):
-        """Detect liquidity sweeps (stop loss hunting)"""
-        sweeps = []
-        
-        if len(data) < lookback:
-            return sweeps
-            
-        for i in range(lookback, len(data)):
-            current = data.iloc[i]
-            recent_data = data.iloc[i-lookback:i]
-            
-            # Check for sweep above recent highs
-            recent_high = recent_data['high'].max()
-            if current['high'] > recent_high * 1.001:  # 0.1% above
-                # Check for quick reversal
-                if current['close'] < current['high'] * 0.998:  # Closed below high
-                    sweeps.append({
-                        'type': 'BULLISH_SWEEP',
-                        'index': i,
-                        'sweep_high': current['high'],
-                        'reversal_strength': (current['high'] - current['close']) / current['close'] * 100
-                    })
-            
-            # Check for sweep below recent lows
-            recent_low = recent_data['low'].min()
-            if current['low'] < recent_low * 0.999:  # 0.1% below
-                # Check for quick reversal
-                if current['close'] > current['low'] * 1.002:  # Closed above low
-                    sweeps.append({
-                        'type': 'BEARISH_SWEEP',
-                        'index': i,
-                        'sweep_low': current['low'],
-                        'reversal_strength': (current['close'] - current['low']) / current['low'] * 100
-                    })
-        
-        return sweeps
+        """Detect liquidity sweeps (stop loss hunting) in a frame or OHLCV"""
+        if not isinstance(data, OHLCV):
+            data = OHLCV.from_frame(data)
+        if len(data.close) < lookback:
+            return []
+        
+        # Compiled scan over the price arrays; only the hits become dicts
+        return _sweep_dicts(*scan_institutional_sweeps(data.high, data.low, data.close, lookback))
     
     def detect_order_blocks(self, data):
-        """Detect institutional order blocks"""
-        order_blocks = []
+        """Detect institutional order blocks in a frame or OHLCV"""
+        if not isinstance(data, OHLCV):
+            data = OHLCV.from_frame(data)
         
-        for i in range(3, len(data)):
-            current = data.iloc[i]
-            prev = data.iloc[i-1]
-            
-            # Bullish order block: strong green candle after rejection
-            if (current['close'] > current['open'] and 
-                current['close'] > prev['high'] and
-                (current['close'] - current['open']) / current['open'] > 0.005):  # 0.5% move
-                
-                order_blocks.append({
-                    'type': 'BULLISH_OB',
-                    'top': current['high'],
-                    'bottom': current['low'],
-                    'strength': (current['close'] - current['open']) / current['open'] * 100,
-                    'index': i
-                })
-            
-            # Bearish order block: strong red candle after rejection
-            elif (current['close'] < current['open'] and 
-                  current['close'] < prev['low'] and
-                  (current['open'] - current['close']) / current['close'] > 0.005):
-                
-                order_blocks.append({
-                    'type': 'BEARISH_OB',
-                    'top': current['high'],
-                    'bottom': current['low'],
-                    'strength': (current['open'] - current['close']) / current['close'] * 100,
-                    'index': i
-                })
-        
-        return order_blocks
+        # Strong candle closing beyond the previous bar (0.5% body) - compiled scan
+        idx, kinds, strengths = scan_order_blocks(data.open, data.high, data.low, data.close)
+        return _order_block_dicts(idx, kinds, strengths, data.high, data.low)
+    
+    def precompute(self, data, bars=None, lookback=10):
+        """Whole-frame sweep and order-block scans for data, cached while the frame is alive.
+
+        Returns (bars, sweep scan, order-block scan); windows_patterns() cuts any bar window out
+        of them, so scanning a frame index by index costs one pass instead of one per index.
+        Cached frames are treated as read-only.
+        """
+        key = id(data)
+        entry = self._precomputed.get(key)
+        if entry is not None and entry[0]() is data and entry[1] == lookback:
+            return entry[2]
+        
+        if bars is None:
+            bars = OHLCV.from_frame(data)
+        scans = (bars,
+                 scan_institutional_sweeps(bars.high, bars.low, bars.close, lookback),
+                 scan_order_blocks(bars.open, bars.high, bars.low, bars.close))
+        
+        # The weakref drops the entry with the frame, so a recycled id() never hits stale scans
+        ref = weakref.ref(data, lambda _, key=key, cache=self._precomputed: cache.pop(key, None))
+        self._precomputed[key] = (ref, lookback, scans)
+        return scans
+    
+    def window_patterns(self, scans, start, stop, lookback=10):
+        """detect_liquidity_sweeps(window, lookback) and detect_order_blocks(window) for bars
+        [start, stop), cut from precompute()'s scans (indices relative to start, start >= 0)"""
+        bars, (idx, kinds, levels, strengths), (ob_idx, ob_kinds, ob_strengths) = scans
+        if stop - start < lookback:
+            sweeps = []
+        else:
+            # Inside the window a sweep needs `lookback` earlier bars, an order block 3
+            lo, hi = np.searchsorted(idx, [start + lookback, stop])
+            sweeps = _sweep_dicts(idx[lo:hi], kinds[lo:hi], levels[lo:hi], strengths[lo:hi], start)
+        
+        lo, hi = np.searchsorted(ob_idx, [start + 3, stop])
+        order_blocks = _order_block_dicts(ob_idx[lo:hi], ob_kinds[lo:hi], ob_strengths[lo:hi],
+                                          bars.high, bars.low, start)
+        return sweeps, order_blocks
+    
+    def add_liquidity_level(self, level):
+        """Record a liquidity level (inserted in place into the array used by calculate_liquidity_confluence)"""
+        self.liquidity_levels.append(level)
+        if self._levels_sorted is not None:
+            position = np.searchsorted(self._levels_sorted, level)
+            self._levels_sorted = np.insert(self._levels_sorted, position, level)
     
     def calculate_liquidity_confluence(self, price, tolerance=0.02):
         """Calculate liquidity confluence at a price level"""
-        confluence = 0
-        for level in self.liquidity_levels:
-            distance = abs(price - level) / price
-            if distance < tolerance:
-                confluence += 1
-        return confluence
+        levels = self.liquidity_levels
+        if not levels:
+            return 0
+        
+        # Sorted copy of the levels (rebuilt when the list was changed directly)
+        if self._levels_sorted is None or len(self._levels_sorted) != len(levels):
+            self._levels_sorted = np.sort(np.asarray(levels, dtype=np.float64))
+        
+        # Binary-search the band around price (widened a hair against rounding), then apply the
+        # exact test to just the levels inside it
+        band = price * tolerance * (1 + 1e-9)
+        lo, hi = np.searchsorted(self._levels_sorted, [price - band, price + band])
+        nearby = self._levels_sorted[lo:hi]
+        return int(np.count_nonzero(np.abs(price - nearby) / price < tolerance))
+
+# Days from each weekday (0=Monday) to the following Monday-Friday day
+DAYS_TO_NEXT_WEEKDAY = (1, 1, 1, 1, 3, 2, 1)
 
 class MarketHoursChecker:
     """Check if markets are open for different instruments"""
@@ -109,50 +210,49 @@ class MarketHoursChecker:
             'EURCAD': {'open': 0, 'close': 23},    # Forex: Same as other forex pairs
             'USDCAD': {'open': 0, 'close': 23}     # Forex: Same as other forex pairs
         }
+        
+        # The schedule is fixed, so answer every (weekday, hour) up front - a check is one lookup
+        self._open_table = {pair: self._build_open_table(pair, hours) for pair, hours in self.market_hours.items()}
+        self._default_table = self._build_open_table(None, {'open': 0, 'close': 23})
     
-    def is_market_open(self, pair_name: str) -> bool:
-        """Check if market is currently open for a specific pair"""
-        now_utc = datetime.now(pytz.UTC)
-        current_hour = now_utc.hour
-        current_weekday = now_utc.weekday()  # 0=Monday, 6=Sunday
-        
-        # Check if it's weekend
-        if current_weekday >= 5:  # Saturday or Sunday
-            if pair_name in ['NAS100', 'US30']:
-                return False  # Stock markets closed on weekends
-            elif current_weekday == 6:  # Sunday
-                return current_hour >= 22  # Forex opens Sunday 5 PM EST (22 UTC)
-            else:  # Saturday
-                return False
+    @staticmethod
+    def _build_open_table(pair_name, hours):
+        """(7, 24) bool array: open[weekday, hour] in UTC, 0=Monday"""
+        table = np.zeros((7, 24), dtype=bool)
         
         # Weekday hours
-        hours = self.market_hours.get(pair_name, {'open': 0, 'close': 23})
-        return hours['open'] <= current_hour <= hours['close']
+        table[:5, hours['open']:hours['close'] + 1] = True
+        
+        # Weekend: stock markets closed, forex opens Sunday 5 PM EST (22 UTC)
+        if pair_name not in ['NAS100', 'US30']:
+            table[6, 22:] = True
+        return table
+    
+    def is_market_open(self, pair_name: str) -> bool:
+        """Check if market is currently open for a specific pair"""
+        now_utc = datetime.now(timezone.utc)
+        table = self._open_table.get(pair_name, self._default_table)
+        return bool(table[now_utc.weekday(), now_utc.hour])
     
     def get_next_open_time(self, pair_name: str) -> str:
         """Get next market open time"""
         if self.is_market_open(pair_name):
             return "Market is currently open"
         
-        now_utc = datetime.now(pytz.UTC)
+        now_utc = datetime.now(timezone.utc)
         
         if pair_name in ['NAS100', 'US30']:
-            # Next weekday at 14:00 UTC (9:30 AM EST)
-            days_ahead = 0
-            while True:
-                next_day = now_utc + pd.Timedelta(days=days_ahead)
-                if next_day.weekday() < 5:  # Monday to Friday
-                    next_open = next_day.replace(hour=14, minute=30, second=0, microsecond=0)
-                    if next_open > now_utc:
-                        return next_open.strftime("%Y-%m-%d %H:%M UTC")
-                days_ahead += 1
-                if days_ahead > 7:
-                    break
+            # Next weekday at 14:30 UTC (9:30 AM EST) - today if it is a weekday before the open
+            next_open = now_utc.replace(hour=14, minute=30, second=0, microsecond=0)
+            weekday = now_utc.weekday()
+            if weekday >= 5 or next_open <= now_utc:
+                next_open += timedelta(days=DAYS_TO_NEXT_WEEKDAY[weekday])
+            return next_open.strftime("%Y-%m-%d %H:%M UTC")
         
         else:  # Forex
             # Next Sunday 22:00 UTC (5 PM EST)
             days_ahead = (6 - now_utc.weekday()) % 7
-            next_open = now_utc + pd.Timedelta(days=days_ahead)
+            next_open = now_utc + timedelta(days=days_ahead)
             next_open = next_open.replace(hour=22, minute=0, second=0, microsecond=0)
             return next_open.strftime("%Y-%m-%d %H:%M UTC")
 
@@ -167,38 +267,64 @@ class DayTradingSmartMoney:
         self.peak_capital = initial_capital
         self.detector = InstitutionalPatternDetector()
         
-    def detect_day_trading_signal(self, data, index):
-        """Detect day trading signals with relaxed restrictions"""
+    def detect_day_trading_signal(self, data, index, now=None, symbol=None, bars=None, hour=None):
+        """Detect day trading signals with relaxed restrictions (now: clock to judge the session by, default wall clock).
+
+        With a symbol, the 12-bar range/volume stats are shared through indicator_cache across
+        calls that see the same bar (repeated polls within one interval). bars: data's OHLCV,
+        if the caller already has it. hour: session hour to use instead of now.hour (e.g. the
+        bar's own, so replays judge each bar by its time).
+        """
         if index < 20:
             return None
+        
+        # Session timing check - one clock read per call, and outside trading hours
+        # there is no need to look at the bars at all
+        if now is None:
+            now = datetime.now()
+        current_hour = now.hour if hour is None else hour
+        if not (2 <= current_hour <= 21):  # Trading hours
+            return None
             
-        current = data.iloc[index]
-        recent_data = data.iloc[index-20:index+1]
+        # Columns as arrays once (cached with the frame's scans) - the checks below only need a
+        # few scalars and short tail slices
+        scans = self.detector.precompute(data, bars)
+        open_, high, low, close, volume = scans[0]
+        current_close = close[index]
+        window_start = index - 20
         
-        # Detect institutional patterns
-        liquidity_sweeps = self.detector.detect_liquidity_sweeps(recent_data, lookback=10)
-        order_blocks = self.detector.detect_order_blocks(recent_data)
+        # Detect institutional patterns - cut from the whole-frame scans, which are shared by
+        # every index of the same frame
+        liquidity_sweeps, order_blocks = self.detector.window_patterns(scans, window_start, index + 1)
         
         # Bias determination
-        recent_12h = data.iloc[index-12:index] if index >= 12 else data.iloc[:index]
-        if len(recent_12h) == 0:
+        recent_12h = slice(max(index - 12, 0), index)
+        if index == 0:
             return None
             
-        daily_high = recent_12h['high'].max()
-        daily_low = recent_12h['low'].min()
+        def range_stats():
+            return np.nanmax(high[recent_12h]), np.nanmin(low[recent_12h]), np.nanmean(volume[recent_12h])
+        
+        # The window excludes the (possibly still forming) current bar, so its timestamp pins it down
+        if symbol is not None:
+            daily_high, daily_low, avg_volume = indicator_cache.get_or_compute(
+                "RANGE", (symbol, 12, data.index[index]), range_stats
+            )
+        else:
+            daily_high, daily_low, avg_volume = range_stats()
         daily_range = daily_high - daily_low
         
         if daily_range == 0:
             return None
             
-        price_position = (current['close'] - daily_low) / daily_range
+        price_position = (current_close - daily_low) / daily_range
         
         # Determine bias
         bias = None
         bias_strength = 0
         
         # Check for liquidity sweeps
-        recent_sweeps = [s for s in liquidity_sweeps if s['index'] >= len(recent_data) - 10]
+        recent_sweeps = [s for s in liquidity_sweeps if s['index'] >= index + 1 - window_start - 10]
         
         if recent_sweeps:
             latest_sweep = recent_sweeps[-1]
@@ -221,40 +347,42 @@ class DayTradingSmartMoney:
         if not bias:
             return None
             
-        # FVG detection
+        # FVG detection - the bars' values read once
         fvg_detected = False
         fvg_strength = 0
+        current_open, current_high, current_low = open_[index], high[index], low[index]
+        prev_high, prev_low = high[index-1], low[index-1]
         
         if index >= 2:
             # Check for gaps
-            if (current['low'] > data.iloc[index-1]['high'] and bias == 'BULLISH'):
-                gap_size = current['low'] - data.iloc[index-1]['high']
-                fvg_strength = (gap_size / current['close']) * 10000
+            if (current_low > prev_high and bias == 'BULLISH'):
+                gap_size = current_low - prev_high
+                fvg_strength = (gap_size / current_close) * 10000
                 fvg_direction = 'BUY'
                 fvg_detected = True
                 
-            elif (current['high'] < data.iloc[index-1]['low'] and bias == 'BEARISH'):
-                gap_size = data.iloc[index-1]['low'] - current['high']
-                fvg_strength = (gap_size / current['close']) * 10000
+            elif (current_high < prev_low and bias == 'BEARISH'):
+                gap_size = prev_low - current_high
+                fvg_strength = (gap_size / current_close) * 10000
                 fvg_direction = 'SELL'
                 fvg_detected = True
         
         # Accept momentum signals if no FVG
         if not fvg_detected:
-            if bias == 'BULLISH' and current['close'] > current['open']:
+            if bias == 'BULLISH' and current_close > current_open:
                 fvg_direction = 'BUY'
-                fvg_strength = (current['close'] - current['open']) / current['open'] * 10000
+                fvg_strength = (current_close - current_open) / current_open * 10000
                 fvg_detected = True
-            elif bias == 'BEARISH' and current['close'] < current['open']:
+            elif bias == 'BEARISH' and current_close < current_open:
                 fvg_direction = 'SELL'
-                fvg_strength = (current['open'] - current['close']) / current['open'] * 10000
+                fvg_strength = (current_open - current_close) / current_open * 10000
                 fvg_detected = True
         
         if not fvg_detected:
             return None
             
         # Order block confluence
-        current_price = current['close']
+        current_price = current_close
         nearby_obs = []
         
         for ob in order_blocks:
@@ -267,11 +395,6 @@ class DayTradingSmartMoney:
         ob_confluence = len(nearby_obs) > 0
         ob_strength = max([ob['strength'] for ob in nearby_obs]) if nearby_obs else 0
         
-        # Session timing check
-        current_hour = datetime.now().hour
-        if not (2 <= current_hour <= 21):  # Trading hours
-            return None
-            
         # Session multipliers
         if 13 <= current_hour <= 16:
             session_multiplier = 1.5
@@ -283,8 +406,7 @@ class DayTradingSmartMoney:
             session_multiplier = 1.0
         
         # Volume check
-        avg_volume = recent_12h['volume'].mean()
-        volume_ratio = current['volume'] / avg_volume
+        volume_ratio = volume[index] / avg_volume
         
         # Liquidity confluence
         liquidity_confluence = self.detector.calculate_liquidity_confluence(
@@ -308,14 +430,141 @@ class DayTradingSmartMoney:
         return {
             'symbol': 'DAY_TRADE',
             'direction': fvg_direction,
+            'sign': 1 if fvg_direction == 'BUY' else -1,
             'strength': min(signal_score, 15),
-            'entry': current['close'],
-            'timestamp': datetime.now(),
+            'entry': current_close,
+            'timestamp': now,
             'liquidity_sweep': recent_sweeps[-1] if recent_sweeps else None,
             'order_block_confluence': ob_confluence,
             'session_multiplier': session_multiplier,
             'bias_strength': bias_strength
         }
+    
+    def detect_day_trading_signals_batch(self, data, bars=None):
+        """detect_day_trading_signal for every bar of data at once, for backtests.
+
+        Each bar's session is judged by its own timestamp (UTC when tz-aware). Returns a
+        frame on data's index: signal (bool), direction ('BUY'/'SELL', None without a signal),
+        sign, strength, bias_strength, session_multiplier and order_block_confluence.
+        """
+        scans = self.detector.precompute(data, bars)
+        (open_, high, low, close, volume), (sweep_idx, sweep_kinds, _, sweep_strengths), (ob_idx, _, ob_strengths) = scans
+        n = len(close)
+        bar = np.arange(n)
+        hours = _bar_hours(data.index)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Previous 12 bars' range and volume (NaNs skipped, like nanmax/nanmin/nanmean)
+            daily_high = pd.Series(high).rolling(12, min_periods=1).max().shift(1).to_numpy()
+            daily_low = pd.Series(low).rolling(12, min_periods=1).min().shift(1).to_numpy()
+            avg_volume = pd.Series(volume).rolling(12, min_periods=1).mean().shift(1).to_numpy()
+            daily_range = daily_high - daily_low
+            price_position = (close - daily_low) / daily_range
+            
+            # Latest sweep among the last 10 bars (the later entry when a bar swept both ways)
+            latest = np.searchsorted(sweep_idx, bar, side='right') - 1
+            has_sweep = latest >= 0
+            latest = np.maximum(latest, 0)
+            if len(sweep_idx):
+                has_sweep &= sweep_idx[latest] >= bar - 9
+                sweep_bull = has_sweep & (sweep_kinds[latest] == BULLISH)
+                sweep_strength = sweep_strengths[latest]
+            else:
+                sweep_bull = has_sweep
+                sweep_strength = np.zeros(n)
+            
+            # Bias: a confirming sweep first, price position otherwise
+            sweep_bias_bull = sweep_bull & (price_position > 0.2)
+            sweep_bias_bear = has_sweep & ~sweep_bull & (price_position < 0.8)
+            by_sweep = sweep_bias_bull | sweep_bias_bear
+            bull = sweep_bias_bull | (~by_sweep & (price_position > 0.6))
+            bear = sweep_bias_bear | (~by_sweep & (price_position < 0.4))
+            bias_strength = np.select([by_sweep, bull, bear],
+                                      [sweep_strength, price_position * 4, (1 - price_position) * 4], 0)
+            
+            # FVG against the previous bar, momentum candle otherwise - both as sizes in the bias
+            # direction (positive when present), so every bar takes the same path
+            prev_high = np.concatenate(([np.nan], high[:-1]))
+            prev_low = np.concatenate(([np.nan], low[:-1]))
+            gap = np.where(bull, low - prev_high, prev_low - high)
+            momentum = np.where(bull, close - open_, open_ - close)
+            has_bias = bull | bear
+            has_gap = has_bias & (gap > 0)
+            has_momentum = has_bias & ~has_gap & (momentum > 0)
+            fvg_strength = np.where(has_gap, gap / close, np.where(has_momentum, momentum / open_, 0)) * 10000
+            fvg = has_gap | has_momentum
+            
+            # Strongest order block of the 20-bar window (from its 4th bar) within 5% of the close
+            ob_mid = np.full(n, np.nan)
+            ob_strength_at = np.full(n, -np.inf)
+            ob_mid[ob_idx] = (high[ob_idx] + low[ob_idx]) / 2
+            ob_strength_at[ob_idx] = ob_strengths
+            mids = sliding_window_view(np.concatenate((np.full(17, np.nan), ob_mid)), 18)
+            strengths = sliding_window_view(np.concatenate((np.full(17, -np.inf), ob_strength_at)), 18)
+            nearby = np.abs(close[:, None] - mids) / close[:, None] < 0.05
+            ob_best = np.where(nearby, strengths, -np.inf).max(axis=1)
+            ob_confluence = nearby.any(axis=1)
+            ob_strength = np.where(ob_confluence, ob_best, 0)
+            
+            session_multiplier = np.select(
+                [(hours >= 13) & (hours <= 16), (hours >= 8) & (hours <= 17), (hours >= 2) & (hours <= 6)],
+                [1.5, 1.3, 1.1], 1.0)
+            
+            volume_ratio = volume / avg_volume
+            
+            levels = np.asarray(self.detector.liquidity_levels, dtype=np.float64)
+            if len(levels):
+                liquidity_confluence = np.count_nonzero(
+                    np.abs(close[:, None] - levels) / close[:, None] < 0.03, axis=1)
+            else:
+                liquidity_confluence = np.zeros(n)
+            
+            signal_score = (
+                bias_strength * 0.25 +
+                np.minimum(fvg_strength, 10) * 0.25 +
+                ob_strength * 0.1 +
+                liquidity_confluence * 0.1 +
+                volume_ratio * 1.5 * 0.15 +
+                session_multiplier * 2 * 0.15
+            )
+        
+        # Same gates as the per-bar check (a NaN score passes the threshold there too)
+        signal = ((bar >= 20) & (hours >= 2) & (hours <= 21) & (daily_range != 0) &
+                  has_bias & fvg & ~(signal_score < 4))
+        
+        return pd.DataFrame({
+            'signal': signal,
+            'direction': np.where(signal, np.where(bull, 'BUY', 'SELL'), None),
+            'sign': np.where(signal, np.where(bull, 1, -1), 0),
+            'strength': np.where(signal, np.minimum(signal_score, 15), np.nan),
+            'bias_strength': bias_strength,
+            'session_multiplier': session_multiplier,
+            'order_block_confluence': ob_confluence
+        }, index=data.index)
+    
+    def detect_day_trading_signals_lazy(self, lf, time_column='timestamp'):
+        """detect_day_trading_signals_batch for a polars LazyFrame of bars in time order.
+
+        Only the time and OHLCV columns are collected, so scans over wide stored history (e.g.
+        pl.scan_parquet) read just those. Returns the signal bars as a polars DataFrame.
+        """
+        if pl is None:
+            raise ImportError("polars is required for detect_day_trading_signals_lazy (pip install polars)")
+        
+        frame = lf.select([time_column, *OHLCV._fields]).collect()
+        data = pd.DataFrame({col: frame[col].to_numpy() for col in OHLCV._fields},
+                            index=pd.DatetimeIndex(frame[time_column].to_numpy()))
+        
+        result = self.detect_day_trading_signals_batch(data)
+        signals = result[result['signal']].drop(columns='signal')
+        return pl.DataFrame({
+            time_column: signals.index.to_pydatetime().tolist(),
+            **{col: signals[col].tolist() for col in signals.columns}
+        })
+
+# Just under the 60s scan rate limit: repeat requests inside a minute skip the network,
+# while the next rate-limited scan still fetches fresh bars
+LIVE_DATA_TTL = 55
 
 class TradingAlertSystem:
     """Real trading alert system with market hours checking"""
@@ -344,13 +593,18 @@ class TradingAlertSystem:
         self.market_checker = MarketHoursChecker()
         
         # Alert storage
-        self.recent_alerts = []
+        self.recent_alerts = deque(maxlen=50)  # keeps only the last 50 alerts
         self.last_check_time = {}
+        self._last_scan_iso = None  # newest last_check_time, encoded once per scan
+        
+        # pair -> (fetched at, frame); scans are 60s apart, so a warm entry skips the network
+        self._data_cache = {}
         
         # Mobile notification settings
         self.push_service_url = None
         self.push_api_key = None
         self.user_tokens = []
+        self._push_session = None  # keep-alive session, built on first notification
         
         print("REAL TRADING ALERT SYSTEM INITIALIZED")
         print(f"Monitoring: {list(self.monitored_pairs.keys())}")
@@ -358,7 +612,11 @@ class TradingAlertSystem:
         print("Real smart money patterns")
         
     def get_live_data(self, pair_name: str) -> Optional[pd.DataFrame]:
-        """Get real-time data for a trading pair"""
+        """Get real-time data for a trading pair (reused for LIVE_DATA_TTL seconds)"""
+        fetched_at, cached = self._data_cache.get(pair_name, (0.0, None))
+        if cached is not None and monotonic() - fetched_at < LIVE_DATA_TTL:
+            return cached
+        
         try:
             yahoo_symbol = self.monitored_pairs[pair_name]
             ticker = yf.Ticker(yahoo_symbol)
@@ -376,7 +634,11 @@ class TradingAlertSystem:
                 else:
                     data['Volume'] = 100000
                     
+            # Keep just the OHLCV columns (no dividends/splits), all float64 - the cached frame
+            # is smaller and OHLCV.from_frame reads it without converting
+            data = data[['Open', 'High', 'Low', 'Close', 'Volume']].astype(np.float64)
             data.columns = [col.lower() for col in data.columns]
+            self._data_cache[pair_name] = (monotonic(), data)
             return data
             
         except Exception as e:
@@ -397,16 +659,21 @@ class TradingAlertSystem:
             return None
         
         # Use real day trading signal detection
-        signal = self.day_trader.detect_day_trading_signal(data, len(data) - 1)
+        timestamp = datetime.now()
+        bars = OHLCV.from_frame(data)
+        # Session judged by the latest bar's time (UTC), the same clock the batch scorer uses
+        signal = self.day_trader.detect_day_trading_signal(data, len(data) - 1, now=timestamp,
+                                                           symbol=pair_name, bars=bars,
+                                                           hour=_bar_hours(data.index[-1:])[0])
         
         if signal:
-            current_price = data['close'].iloc[-1]
-            timestamp = datetime.now()
+            current_price = bars.close[-1]
             
             # Enhanced signal info
             enhanced_signal = {
                 'pair': pair_name,
                 'direction': signal['direction'],
+                'sign': signal['sign'],
                 'entry_price': current_price,
                 'strength': signal['strength'],
                 'timestamp': timestamp,
@@ -449,25 +716,21 @@ class TradingAlertSystem:
     
     def calculate_target(self, entry_price: float, signal: Dict) -> float:
         """Calculate profit target"""
-        direction = signal['direction']
+        side = _signal_sign(signal)
         strength = signal.get('strength', 5)
         
         target_multiplier = 1.5 + (strength / 20)
         
-        if direction == 'BUY':
-            return entry_price * (1 + 0.01 * target_multiplier)
-        else:
-            return entry_price * (1 - 0.01 * target_multiplier)
+        # Above the entry for a BUY, below for a SELL
+        return entry_price * (1 + side * 0.01 * target_multiplier)
     
     def calculate_stop_loss(self, entry_price: float, signal: Dict) -> float:
         """Calculate stop loss"""
-        direction = signal['direction']
+        side = _signal_sign(signal)
         stop_multiplier = 0.8
         
-        if direction == 'BUY':
-            return entry_price * (1 - 0.01 * stop_multiplier)
-        else:
-            return entry_price * (1 + 0.01 * stop_multiplier)
+        # Below the entry for a BUY, above for a SELL
+        return entry_price * (1 - side * 0.01 * stop_multiplier)
     
     def scan_all_pairs(self) -> List[Dict]:
         """Scan all monitored pairs for signals with market hours check"""
@@ -476,15 +739,24 @@ class TradingAlertSystem:
         
         print(f"Scanning pairs at {current_time.strftime('%H:%M:%S')}...")
         
+        # Rate limiting
+        due_pairs = []
         for pair_name in self.monitored_pairs.keys():
-            # Rate limiting
             last_check = self.last_check_time.get(pair_name)
             if last_check and (current_time - last_check).seconds < 60:
                 continue
-            
             print(f"Checking {pair_name}...")
-            
-            signal = self.check_trading_signal(pair_name)
+            due_pairs.append(pair_name)
+        
+        if not due_pairs:
+            return new_signals
+        
+        # Each check is mostly a network fetch - run them side by side, then record the
+        # results here in pair order
+        with ThreadPoolExecutor(max_workers=len(due_pairs)) as executor:
+            signals = list(executor.map(self.check_trading_signal, due_pairs))
+        
+        for pair_name, signal in zip(due_pairs, signals):
             if signal:
                 print(f"REAL SIGNAL DETECTED: {pair_name} {signal['direction']}")
                 
@@ -500,6 +772,8 @@ class TradingAlertSystem:
             
             self.last_check_time[pair_name] = current_time
         
+        self._last_scan_iso = current_time.isoformat()
+        
         return new_signals
     
     def store_alert(self, signal: Dict):
@@ -511,60 +785,98 @@ class TradingAlertSystem:
             'status': 'ACTIVE'
         }
         
-        self.recent_alerts.append(alert_data)
-        
-        # Keep only last 50 alerts
-        if len(self.recent_alerts) > 50:
-            self.recent_alerts = self.recent_alerts[-50:]
+        self.recent_alerts.append(alert_data)  # the deque drops the oldest beyond 50
         
         print(f"Real alert stored: {signal['pair']} {signal['direction']} at {signal['entry_price']:.4f}")
     
     def get_dashboard_data(self) -> Dict:
         """Get data for web dashboard"""
+        # Alert timestamps are ISO strings - today's start with today's date, no parsing needed
+        today = datetime.now().date().isoformat()
         return {
             'monitored_pairs': list(self.monitored_pairs.keys()),
-            'recent_alerts': self.recent_alerts[-10:],
+            'recent_alerts': list(self.recent_alerts)[-10:],
             'system_status': 'REAL TRADING MODE',
-            'last_scan': max(self.last_check_time.values()).isoformat() if self.last_check_time else None,
-            'total_alerts_today': len([a for a in self.recent_alerts 
-                                     if datetime.fromisoformat(a['timestamp']).date() == datetime.now().date()]),
+            'last_scan': self._last_scan_iso,
+            'total_alerts_today': sum(1 for a in self.recent_alerts if a['timestamp'][:10] == today),
             'market_hours': {pair: self.market_checker.is_market_open(pair) for pair in self.monitored_pairs.keys()}
         }
     
+    def _pushover_session(self):
+        """HTTPS session reused across notifications so only the first one pays the TLS handshake"""
+        if self._push_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            self._push_session = requests.Session()
+            self._push_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        return self._push_session
+    
+    def _format_alert(self, signal: Dict) -> str:
+        """Pushover message body for one signal"""
+        return ALERT_MESSAGE_TEMPLATE.format_map(signal)
+    
+    def _push(self, title: str, message: str) -> bool:
+        """Post one message to every configured device; True only if all of them accepted it"""
+        session = self._pushover_session()
+        
+        def post(user_token):
+            return session.post(PUSHOVER_URL, timeout=PUSHOVER_TIMEOUT, data={
+                "token": self.push_api_key,
+                "user": user_token,
+                "title": title,
+                "message": message,
+                "priority": 1,  # High priority
+                "sound": "cashregister"  # Trading sound
+            })
+        
+        # Every device gets the alert - post to all of them side by side (a single device,
+        # the usual setup, posts inline on the pooled session without spinning up threads)
+        if len(self.user_tokens) == 1:
+            responses = [post(self.user_tokens[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(self.user_tokens))) as executor:
+                responses = list(executor.map(post, self.user_tokens))
+        
+        failed = [response for response in responses if response.status_code != 200]
+        for response in failed:
+            print(f"Failed to send notification: {response.text}")
+        return not failed
+    
     def send_mobile_notification(self, signal: Dict) -> bool:
         """Send push notification to mobile devices via Pushover"""
         if not self.push_api_key or not self.user_tokens:
             print(f"Alert ready: {signal['pair']} {signal['direction']} - Configure Pushover for mobile notifications")
             return False
         try:
-            import requests
+            if not self._push(f"Trading Alert: {signal['pair']}", self._format_alert(signal)):
+                return False
             
-            message = f"{signal['pair']} {signal['direction']}\n"
-            message += f"Entry: {signal['entry_price']:.4f}\n"
-            message += f"Target: {signal['target_profit']:.4f}\n"
-            message += f"Stop: {signal['stop_loss']:.4f}\n"
-            message += f"Confidence: {signal['confidence']}\n"
-            message += f"Risk: {signal['risk_level']}"
-
+            print(f"Mobile notification sent: {signal['pair']} {signal['direction']}")
+            return True
             
+        except Exception as e:
+            print(f"Notification error: {e}")
+            return False
+    
+    def send_batch_notification(self, signals: List[Dict]) -> bool:
+        """Send several signals as one Pushover message per device (split every PUSH_BATCH_SIZE signals)"""
+        if not signals:
+            return False
+        if not self.push_api_key or not self.user_tokens:
+            print(f"{len(signals)} alerts ready - Configure Pushover for mobile notifications")
+            return False
+        try:
+            sent = True
+            for start in range(0, len(signals), PUSH_BATCH_SIZE):
+                batch = signals[start:start + PUSH_BATCH_SIZE]
+                title = f"{len(batch)} signals: {', '.join(signal['pair'] for signal in batch)}"
+                message = "\n\n".join(self._format_alert(signal) for signal in batch)
+                sent = self._push(title, message) and sent
+            
+            if sent:
+                print(f"Mobile notification sent: {len(signals)} signals")
+            return sent
             
-            for user_token in self.user_tokens:
-                response = requests.post("https://api.pushover.net/1/messages.json", data={
-                    "token": self.push_api_key,
-                    "user": user_token,
-                    "title": f"Trading Alert: {signal['pair']}",
-                    "message": message,
-                    "priority": 1,  # High priority
-                    "sound": "cashregister"  # Trading sound
-                })
-                
-                if response.status_code == 200:
-                    print(f"Mobile notification sent: {signal['pair']} {signal['direction']}")
-                    return True
-                else:
-                    print(f"Failed to send notification: {response.text}")
-                    return False
-                    
         except Exception as e:
             print(f"Notification error: {e}")
             return False
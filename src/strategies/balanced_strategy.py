@@ -7,14 +7,52 @@ Fine-tuned parameters for optimal balance between quality and signal frequency
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
 
 from day_trading_optimizer import get_intraday_data
 from session_optimizer import TradingSessionOptimizer
+from indicators import rsi_wilder, align_windows
+from pattern_kernels import scan_balanced_patterns, FVG_PATTERN, SWEEP_PATTERN
+from buffered_output import buffered_output
+from data_cache import prefetch_histories
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view as swv
 from datetime import datetime, timedelta
 from typing import List, Dict
+from functools import lru_cache
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Pool workers are spawned, so a parallel numba kernel anywhere in the process can't hang them
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+@lru_cache(maxsize=64)
+def _rsi_cached(price_bytes: bytes, dtype: str, period: int) -> np.ndarray:
+    """RSI memoised on the raw price bytes - parameter sweeps re-run the same closes"""
+    rsi = rsi_wilder(np.frombuffer(price_bytes, dtype=dtype), period)
+    rsi.flags.writeable = False  # shared between callers
+    return rsi
+
+def _rsi(prices: np.ndarray, period: int) -> np.ndarray:
+    """Cached RSI lookup for a price array"""
+    return _rsi_cached(prices.tobytes(), prices.dtype.str, period)
+
+# pattern code -> (pattern name, pattern type)
+PATTERN_INFO = {
+    FVG_PATTERN: ('fair_value_gap_optimized', 'momentum'),
+    SWEEP_PATTERN: ('liquidity_sweep_balanced', 'reversal'),
+}
+
+# Candidate signals as one record per detection - dicts are only built for the winners
+SIG_DTYPE = np.dtype([
+    ('idx', 'i8'),
+    ('pattern', 'i1'),
+    ('dir', 'i1'),
+    ('conf', 'f8'),
+    ('quality', 'f8'),
+])
 
 class BalancedDayTradingDetector:
     """Balanced detector with optimal parameter tuning"""
@@ -24,12 +62,8 @@ class BalancedDayTradingDetector:
         self.quality_score_threshold = 0.65  # Reasonable quality filter
         
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        """Calculate RSI indicator (Wilder smoothing)"""
+        return pd.Series(_rsi(prices.to_numpy(dtype=np.float64), period), index=prices.index)
     
     def detect_balanced_patterns(self, data: pd.DataFrame) -> List[Dict]:
         """Balanced pattern detection with reasonable filters"""
@@ -38,138 +72,62 @@ class BalancedDayTradingDetector:
         if len(data) < 20:
             return signals
         
+        # Pull columns out once - per-bar iloc lookups build a Series each time.
+        # The scan only compares prices, so float32 halves the bytes it streams
+        o, h, l, c, v = (data[col].to_numpy(dtype=np.float32) for col in ['Open', 'High', 'Low', 'Close', 'Volume'])
+        entry_prices = data['Close'].to_numpy(dtype=np.float64)
+        timestamps = data.index
+        
         # Calculate indicators
-        data_copy = data.copy()
-        data_copy['sma_20'] = data_copy['Close'].rolling(20).mean()
-        data_copy['rsi'] = self.calculate_rsi(data_copy['Close'], 14)
+        sma20 = align_windows(swv(c, 20).mean(axis=1), len(c))
+        rsi = _rsi(c, 14)
         
-        recent_high = data_copy['High'].rolling(10).max()
-        recent_low = data_copy['Low'].rolling(10).min()
+        # Previous 10 bars (i-10 .. i-1) as seen from bar i
+        prev_high = align_windows(swv(h, 10).max(axis=1), len(h), lag=1)
+        prev_low = align_windows(swv(l, 10).min(axis=1), len(l), lag=1)
+        prev_vol_mean = align_windows(swv(v, 10).mean(axis=1), len(v), lag=1)
         
-        for i in range(15, len(data_copy)):
-            current = data_copy.iloc[i]
-            prev_bars = data_copy.iloc[i-10:i]
-            
-            # Enhanced Fair Value Gap (more reliable pattern)
-            if i >= 3:
-                bar1 = data_copy.iloc[i-2]
-                bar2 = data_copy.iloc[i-1]
-                bar3 = current
-                
-                # Bullish FVG
-                if (bar1['High'] < bar3['Low'] and
-                    bar2['Close'] > bar2['Open'] and
-                    30 < current['rsi'] < 75):
-                    
-                    gap_size = (bar3['Low'] - bar1['High']) / bar1['High']
-                    
-                    if gap_size > 0.0008:  # Reasonable gap size
-                        strength = min(90, 70 + gap_size * 5000)
-                        
-                        # Quality enhancements
-                        if current['Volume'] > prev_bars['Volume'].mean() * 1.2:
-                            strength += 3
-                        if current['Close'] > current['sma_20']:
-                            strength += 3
-                        
-                        if strength >= self.min_pattern_strength:
-                            signal = {
-                                'timestamp': current.name,
-                                'pattern': 'fair_value_gap_optimized',
-                                'direction': 'BUY',
-                                'confidence': strength,
-                                'entry_price': current['Close'],
-                                'pattern_type': 'momentum',
-                                'timeframe': 'intraday',
-                                'quality_score': min(1.0, strength / 90)
-                            }
-                            signals.append(signal)
-                
-                # Bearish FVG
-                elif (bar1['Low'] > bar3['High'] and
-                      bar2['Close'] < bar2['Open'] and
-                      25 < current['rsi'] < 70):
-                    
-                    gap_size = (bar1['Low'] - bar3['High']) / bar3['High']
-                    
-                    if gap_size > 0.0008:
-                        strength = min(90, 70 + gap_size * 5000)
-                        
-                        if current['Volume'] > prev_bars['Volume'].mean() * 1.2:
-                            strength += 3
-                        if current['Close'] < current['sma_20']:
-                            strength += 3
-                        
-                        if strength >= self.min_pattern_strength:
-                            signal = {
-                                'timestamp': current.name,
-                                'pattern': 'fair_value_gap_optimized',
-                                'direction': 'SELL',
-                                'confidence': strength,
-                                'entry_price': current['Close'],
-                                'pattern_type': 'momentum',
-                                'timeframe': 'intraday',
-                                'quality_score': min(1.0, strength / 90)
-                            }
-                            signals.append(signal)
-            
-            # Optimized Liquidity Sweep
-            if (current['Low'] < recent_low.iloc[i-1] * 0.9998 and
-                current['Close'] > current['Open'] and
-                current['Close'] > prev_bars['High'].max() * 0.9995 and
-                25 < current['rsi'] < 70):
-                
-                strength = 75 + abs(current['Close'] - current['Low']) / current['Close'] * 1500
-                
-                if current['Volume'] > prev_bars['Volume'].mean() * 1.15:
-                    strength += 4
-                
-                strength = min(92, strength)
-                
-                if strength >= self.min_pattern_strength:
-                    signal = {
-                        'timestamp': current.name,
-                        'pattern': 'liquidity_sweep_balanced',
-                        'direction': 'BUY',
-                        'confidence': strength,
-                        'entry_price': current['Close'],
-                        'pattern_type': 'reversal',
-                        'timeframe': 'intraday',
-                        'quality_score': min(1.0, strength / 90)
-                    }
-                    signals.append(signal)
-            
-            # Bearish liquidity sweep
-            elif (current['High'] > recent_high.iloc[i-1] * 1.0002 and
-                  current['Close'] < current['Open'] and
-                  current['Close'] < prev_bars['Low'].min() * 1.0005 and
-                  30 < current['rsi'] < 75):
-                
-                strength = 75 + abs(current['High'] - current['Close']) / current['Close'] * 1500
-                
-                if current['Volume'] > prev_bars['Volume'].mean() * 1.15:
-                    strength += 4
-                
-                strength = min(92, strength)
-                
-                if strength >= self.min_pattern_strength:
-                    signal = {
-                        'timestamp': current.name,
-                        'pattern': 'liquidity_sweep_balanced',
-                        'direction': 'SELL',
-                        'confidence': strength,
-                        'entry_price': current['Close'],
-                        'pattern_type': 'reversal',
-                        'timeframe': 'intraday',
-                        'quality_score': min(1.0, strength / 90)
-                    }
-                    signals.append(signal)
+        idx, directions, patterns, strengths = scan_balanced_patterns(
+            o, h, l, c, v, rsi, sma20, prev_high, prev_low, prev_vol_mean, float(self.min_pattern_strength)
+        )
         
-        # Filter by quality and return top signals
-        quality_signals = [s for s in signals if s['quality_score'] >= self.quality_score_threshold]
-        quality_signals.sort(key=lambda x: x['confidence'], reverse=True)
+        candidates = np.empty(len(idx), dtype=SIG_DTYPE)
+        candidates['idx'] = idx
+        candidates['pattern'] = patterns
+        candidates['dir'] = directions
+        candidates['conf'] = strengths
+        candidates['quality'] = np.minimum(1.0, strengths / 90)
         
-        return quality_signals[:3]  # Top 3 signals
+        # Filter by quality and keep the top 3 by confidence (stable, so ties stay in bar order)
+        candidates = candidates[candidates['quality'] >= self.quality_score_threshold]
+        top = candidates[np.argsort(-candidates['conf'], kind='stable')[:3]]
+        
+        for sig in top:
+            pattern, pattern_type = PATTERN_INFO[int(sig['pattern'])]
+            signals.append({
+                'timestamp': timestamps[sig['idx']],
+                'pattern': pattern,
+                'direction': 'BUY' if sig['dir'] == 1 else 'SELL',
+                'confidence': sig['conf'],
+                'entry_price': entry_prices[sig['idx']],
+                'pattern_type': pattern_type,
+                'timeframe': 'intraday',
+                'quality_score': sig['quality']
+            })
+        
+        return signals  # Top 3 signals
+
+# One trade setup per signal, as returned by calculate_balanced_position_sizes
+SETUP_DTYPE = np.dtype([
+    ('position_size', 'f8'),
+    ('entry_price', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('risk_amount', 'f8'),
+    ('risk_reward_ratio', 'f8'),
+    ('confidence', 'f8'),
+    ('quality_score', 'f8'),
+])
 
 class BalancedRiskManager:
     """Balanced risk management"""
@@ -226,6 +184,85 @@ class BalancedRiskManager:
             'confidence': confidence,
             'quality_score': quality_score
         }
+    
+    def calculate_balanced_position_sizes(self, signals: List[Dict], current_prices, account_balance: float) -> np.ndarray:
+        """Vectorized calculate_balanced_position_size for a batch of signals (SETUP_DTYPE records)"""
+        
+        n = len(signals)
+        prices = np.broadcast_to(np.asarray(current_prices, dtype=np.float64), (n,))
+        confidence = np.array([s['confidence'] for s in signals], dtype=np.float64)
+        quality_score = np.array([s.get('quality_score', 0.7) for s in signals], dtype=np.float64)
+        momentum = np.array([s['pattern_type'] == 'momentum' for s in signals], dtype=bool)
+        buy = np.array([s['direction'] == 'BUY' for s in signals], dtype=bool)
+        
+        # Same base stops/targets and multipliers as the single-signal version
+        final_stop_pct = np.where(momentum, 0.0045, 0.004) * (0.8 + (confidence - 75) / 100)
+        final_profit_pct = np.where(momentum, 0.0135, 0.012) * (0.9 + quality_score * 0.2)
+        
+        side = np.where(buy, 1.0, -1.0)
+        stop_loss = prices * (1 - side * final_stop_pct)
+        take_profit = prices * (1 + side * final_profit_pct)
+        
+        risk_amount = account_balance * self.max_position_risk
+        stop_distance = np.abs(prices - stop_loss)
+        
+        setups = np.empty(n, dtype=SETUP_DTYPE)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            setups['position_size'] = np.where(stop_distance > 0, risk_amount / stop_distance, 0.0)
+            setups['risk_reward_ratio'] = np.abs(take_profit - prices) / stop_distance
+        setups['entry_price'] = prices
+        setups['stop_loss'] = stop_loss
+        setups['take_profit'] = take_profit
+        setups['risk_amount'] = risk_amount
+        setups['confidence'] = confidence
+        setups['quality_score'] = quality_score
+        
+        return setups
+
+@buffered_output
+def _analyze_pair(pair_item):
+    """Process-pool entry point: (pair_name, symbol, data) -> signals list or None"""
+    pair_name, symbol, data = pair_item
+    
+    detector = BalancedDayTradingDetector()
+    risk_manager = BalancedRiskManager()
+    
+    print(f"\n📈 ANALYZING {pair_name} WITH BALANCED OPTIMIZATION")
+    print("-" * 45)
+    
+    if data is None:
+        data = get_intraday_data(symbol, period="3d", interval="15m")
+    
+    if len(data) >= 20:
+        print(f"✅ Data: {len(data)} bars of 15-minute data")
+        
+        signals = detector.detect_balanced_patterns(data)
+        
+        if signals:
+            print(f"🎯 Found {len(signals)} optimized signals:")
+            current_price = float(data['Close'].to_numpy()[-1])
+            trade_setups = risk_manager.calculate_balanced_position_sizes(signals, current_price, 10000)
+            
+            for i, (signal, trade_setup) in enumerate(zip(signals, trade_setups)):
+                print(f"\n   Signal {i+1}:")
+                print(f"   📊 Pattern: {signal['pattern']}")
+                print(f"   📊 Direction: {signal['direction']}")
+                print(f"   📊 Confidence: {signal['confidence']:.1f}%")
+                print(f"   📊 Quality: {signal['quality_score']:.1%}")
+                
+                print(f"   💰 Entry: {trade_setup['entry_price']:.4f}")
+                print(f"   📊 Stop: {trade_setup['stop_loss']:.4f}")
+                print(f"   📊 Target: {trade_setup['take_profit']:.4f}")
+                print(f"   📊 R:R: 1:{trade_setup['risk_reward_ratio']:.1f}")
+                print(f"   💰 Risk: ${trade_setup['risk_amount']:.2f}")
+            
+            return signals
+        else:
+            print(f"   📊 No signals meet optimized criteria")
+    else:
+        print(f"   ❌ Insufficient data")
+    
+    return None
 
 def run_comprehensive_optimized_test():
     """Test optimized strategy on multiple pairs"""
@@ -233,9 +270,7 @@ def run_comprehensive_optimized_test():
     print("🚀 COMPREHENSIVE OPTIMIZED STRATEGY TEST")
     print("=" * 60)
     
-    detector = BalancedDayTradingDetector()
-    risk_manager = BalancedRiskManager()
-    session_optimizer = TradingSessionOptimizer()
+    session_optimizer = TradingSessionOptimizer.get()
     
     # Test multiple pairs with balanced approach
     test_pairs = {
@@ -246,43 +281,15 @@ def run_comprehensive_optimized_test():
     
     all_signals = {}
     
-    for pair_name, symbol in test_pairs.items():
-        print(f"\n📈 ANALYZING {pair_name} WITH BALANCED OPTIMIZATION")
-        print("-" * 45)
-        
-        data = get_intraday_data(symbol, period="3d", interval="15m")
-        
-        if len(data) >= 20:
-            print(f"✅ Data: {len(data)} bars of 15-minute data")
-            
-            signals = detector.detect_balanced_patterns(data)
-            
+    # Three 15-minute histories, downloaded side by side
+    histories = prefetch_histories(list(test_pairs.values()), "3d", "15m")
+    jobs = [(pair_name, symbol, data) for (pair_name, symbol), data in zip(test_pairs.items(), histories)]
+    
+    # Each worker scans one pair and prints its report in one piece
+    with ProcessPoolExecutor(max_workers=min(len(test_pairs), os.cpu_count() or 1), mp_context=POOL_CONTEXT) as executor:
+        for pair_name, signals in zip(test_pairs, executor.map(_analyze_pair, jobs)):
             if signals:
-                print(f"🎯 Found {len(signals)} optimized signals:")
-                
-                for i, signal in enumerate(signals):
-                    print(f"\n   Signal {i+1}:")
-                    print(f"   📊 Pattern: {signal['pattern']}")
-                    print(f"   📊 Direction: {signal['direction']}")
-                    print(f"   📊 Confidence: {signal['confidence']:.1f}%")
-                    print(f"   📊 Quality: {signal['quality_score']:.1%}")
-                    
-                    current_price = data['Close'].iloc[-1]
-                    trade_setup = risk_manager.calculate_balanced_position_size(
-                        signal, current_price, 10000
-                    )
-                    
-                    print(f"   💰 Entry: {trade_setup['entry_price']:.4f}")
-                    print(f"   📊 Stop: {trade_setup['stop_loss']:.4f}")
-                    print(f"   📊 Target: {trade_setup['take_profit']:.4f}")
-                    print(f"   📊 R:R: 1:{trade_setup['risk_reward_ratio']:.1f}")
-                    print(f"   💰 Risk: ${trade_setup['risk_amount']:.2f}")
-                
                 all_signals[pair_name] = signals
-            else:
-                print(f"   📊 No signals meet optimized criteria")
-        else:
-            print(f"   ❌ Insufficient data")
     
     # Summary
     total_signals = sum(len(signals) for signals in all_signals.values())
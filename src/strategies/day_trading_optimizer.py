@@ -4,11 +4,18 @@ Day Trading Optimized Pattern Detection System
 High-frequency pattern detection for intraday trading with real market data
 """
 
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import yfinance as yf
+from types import MappingProxyType
 from typing import List, Dict, Optional
+from data_cache import bucketed_history
+from indicators import align_windows
+from numpy.lib.stride_tricks import sliding_window_view as swv
 
 class DayTradingPatternDetector:
     """Optimized pattern detection for day trading with faster signals"""
@@ -24,44 +31,53 @@ class DayTradingPatternDetector:
         if len(data) < 20:
             return signals
             
+        # Columns as plain arrays - the scan reads them bar by bar
+        open_ = data['Open'].to_numpy(dtype=np.float64)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        
         # Calculate recent highs and lows
-        recent_high = data['High'].rolling(10).max()
-        recent_low = data['Low'].rolling(10).min()
+        recent_high = align_windows(swv(high, 10).max(axis=1), len(data))
+        recent_low = align_windows(swv(low, 10).min(axis=1), len(data))
+        
+        # Structure levels of the previous 10 bars (NaN-skipping, like Series.max/min)
+        structure_high = align_windows(np.fmax.reduce(swv(high, 10), axis=1), len(data))
+        structure_low = align_windows(np.fmin.reduce(swv(low, 10), axis=1), len(data))
         
         for i in range(15, len(data)):
-            current = data.iloc[i]
-            prev_bars = data.iloc[i-10:i]
-            
             # Bullish liquidity sweep (sweep lows then reverse up)
-            if (current['Low'] < recent_low.iloc[i-1] and  # Sweep recent low
-                current['Close'] > current['Open'] and      # Bullish close
-                current['Close'] > prev_bars['High'].max() * 0.999):  # Break structure
+            if (low[i] < recent_low[i-1] and  # Sweep recent low
+                close[i] > open_[i] and      # Bullish close
+                close[i] > structure_high[i-1] * 0.999):  # Break structure
                 
-                strength = min(95, 70 + abs(current['Close'] - current['Low']) / current['Close'] * 1000)
+                strength = min(95, 70 + abs(close[i] - low[i]) / close[i] * 1000)
                 
                 signals.append({
-                    'timestamp': current.name,
+                    'timestamp': data.index[i],
                     'pattern': 'liquidity_sweep',
                     'direction': 'BUY',
+                    'sign': 1,
                     'confidence': strength,
-                    'entry_price': current['Close'],
+                    'entry_price': close[i],
                     'pattern_type': 'scalping',
                     'timeframe': 'intraday'
                 })
             
             # Bearish liquidity sweep (sweep highs then reverse down)
-            elif (current['High'] > recent_high.iloc[i-1] and  # Sweep recent high
-                  current['Close'] < current['Open'] and        # Bearish close
-                  current['Close'] < prev_bars['Low'].min() * 1.001):  # Break structure
+            elif (high[i] > recent_high[i-1] and  # Sweep recent high
+                  close[i] < open_[i] and        # Bearish close
+                  close[i] < structure_low[i-1] * 1.001):  # Break structure
                 
-                strength = min(95, 70 + abs(current['High'] - current['Close']) / current['Close'] * 1000)
+                strength = min(95, 70 + abs(high[i] - close[i]) / close[i] * 1000)
                 
                 signals.append({
-                    'timestamp': current.name,
+                    'timestamp': data.index[i],
                     'pattern': 'liquidity_sweep',
                     'direction': 'SELL',
+                    'sign': -1,
                     'confidence': strength,
-                    'entry_price': current['Close'],
+                    'entry_price': close[i],
                     'pattern_type': 'scalping',
                     'timeframe': 'intraday'
                 })
@@ -77,54 +93,48 @@ class DayTradingPatternDetector:
         
         # Look for strong moves that create order blocks
         data['price_change'] = data['Close'].pct_change()
-        data['volume_surge'] = data['Volume'] > data['Volume'].rolling(10).mean() * 1.5
+        volume = data['Volume'].to_numpy(dtype=np.float64)
+        data['volume_surge'] = volume > align_windows(swv(volume, 10).mean(axis=1), len(data)) * 1.5
+        
+        close = data['Close'].to_numpy(dtype=np.float64)
+        price_change = data['price_change'].to_numpy(dtype=np.float64)
+        volume_surge = data['volume_surge'].to_numpy(dtype=bool)
         
         for i in range(10, len(data)):
-            current = data.iloc[i]
+            # Surge on this bar or the one before
+            surge = volume_surge[i-1] or volume_surge[i]
             
             # Strong bullish move creating supply zone
-            if (current['price_change'] > 0.005 and  # 0.5% move
-                data.iloc[i-1:i+1]['volume_surge'].any()):
-                
-                # Look for retest of this level
-                future_data = data.iloc[i:min(i+5, len(data))]
-                retest = False
+            if price_change[i] > 0.005 and surge:  # 0.5% move
                 
-                for j, future_bar in future_data.iterrows():
-                    if abs(future_bar['Close'] - current['Close']) / current['Close'] < 0.002:  # Within 0.2%
-                        retest = True
-                        break
+                # Look for retest of this level (within 0.2%) over the next bars
+                retest = np.any(np.abs(close[i:i+5] - close[i]) / close[i] < 0.002)
                 
                 if retest:
                     signals.append({
-                        'timestamp': current.name,
+                        'timestamp': data.index[i],
                         'pattern': 'order_block',
                         'direction': 'BUY',
+                        'sign': 1,
                         'confidence': 75,
-                        'entry_price': current['Close'],
+                        'entry_price': close[i],
                         'pattern_type': 'momentum',
                         'timeframe': 'intraday'
                     })
             
             # Strong bearish move creating demand zone
-            elif (current['price_change'] < -0.005 and  # -0.5% move
-                  data.iloc[i-1:i+1]['volume_surge'].any()):
+            elif price_change[i] < -0.005 and surge:  # -0.5% move
                 
-                future_data = data.iloc[i:min(i+5, len(data))]
-                retest = False
-                
-                for j, future_bar in future_data.iterrows():
-                    if abs(future_bar['Close'] - current['Close']) / current['Close'] < 0.002:
-                        retest = True
-                        break
+                retest = np.any(np.abs(close[i:i+5] - close[i]) / close[i] < 0.002)
                 
                 if retest:
                     signals.append({
-                        'timestamp': current.name,
+                        'timestamp': data.index[i],
                         'pattern': 'order_block',
                         'direction': 'SELL',
+                        'sign': -1,
                         'confidence': 75,
-                        'entry_price': current['Close'],
+                        'entry_price': close[i],
                         'pattern_type': 'momentum',
                         'timeframe': 'intraday'
                     })
@@ -139,39 +149,43 @@ class DayTradingPatternDetector:
             return signals
         
         # Identify key support/resistance levels
-        data['support'] = data['Low'].rolling(5).min()
-        data['resistance'] = data['High'].rolling(5).max()
+        support = align_windows(swv(data['Low'].to_numpy(dtype=np.float64), 5).min(axis=1), len(data))
+        resistance = align_windows(swv(data['High'].to_numpy(dtype=np.float64), 5).max(axis=1), len(data))
+        data['support'] = support
+        data['resistance'] = resistance
+        
+        # Plain array reads per bar instead of row/slice lookups
+        close = data['Close'].to_numpy(dtype=np.float64)
         
         for i in range(15, len(data)):
-            current = data.iloc[i]
-            prev_data = data.iloc[i-10:i]
-            
             # Support becomes resistance (bearish breaker)
-            support_level = prev_data['support'].iloc[-1]
-            if (current['Close'] < support_level and  # Break support
-                prev_data['Close'].iloc[-1] > support_level):  # Was above support
+            support_level = support[i-1]
+            if (close[i] < support_level and  # Break support
+                close[i-1] > support_level):  # Was above support
                 
                 signals.append({
-                    'timestamp': current.name,
+                    'timestamp': data.index[i],
                     'pattern': 'breaker_block',
                     'direction': 'SELL',
+                    'sign': -1,
                     'confidence': 80,
-                    'entry_price': current['Close'],
+                    'entry_price': close[i],
                     'pattern_type': 'reversal',
                     'timeframe': 'intraday'
                 })
             
             # Resistance becomes support (bullish breaker)
-            resistance_level = prev_data['resistance'].iloc[-1]
-            if (current['Close'] > resistance_level and  # Break resistance
-                prev_data['Close'].iloc[-1] < resistance_level):  # Was below resistance
+            resistance_level = resistance[i-1]
+            if (close[i] > resistance_level and  # Break resistance
+                close[i-1] < resistance_level):  # Was below resistance
                 
                 signals.append({
-                    'timestamp': current.name,
+                    'timestamp': data.index[i],
                     'pattern': 'breaker_block',
                     'direction': 'BUY',
+                    'sign': 1,
                     'confidence': 80,
-                    'entry_price': current['Close'],
+                    'entry_price': close[i],
                     'pattern_type': 'reversal',
                     'timeframe': 'intraday'
                 })
@@ -185,47 +199,51 @@ class DayTradingPatternDetector:
         if len(data) < 10:
             return signals
         
+        open_ = data['Open'].to_numpy(dtype=np.float64)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        
+        # Bars i-2 (first), i-1 (gap bar) and i (current)
         for i in range(3, len(data)):
-            bar1 = data.iloc[i-2]  # First bar
-            bar2 = data.iloc[i-1]  # Gap bar  
-            bar3 = data.iloc[i]    # Current bar
-            
             # Bullish FVG (gap up that gets filled)
-            if (bar1['High'] < bar3['Low'] and  # Gap exists
-                bar2['Close'] > bar2['Open'] and  # Bullish gap bar
-                bar3['Close'] > bar1['High']):    # Gap holding
+            if (high[i-2] < low[i] and  # Gap exists
+                close[i-1] > open_[i-1] and  # Bullish gap bar
+                close[i] > high[i-2]):    # Gap holding
                 
-                gap_size = (bar3['Low'] - bar1['High']) / bar1['High']
+                gap_size = (low[i] - high[i-2]) / high[i-2]
                 
                 if gap_size > 0.001:  # Minimum 0.1% gap for day trading
                     strength = min(90, 60 + gap_size * 10000)
                     
                     signals.append({
-                        'timestamp': bar3.name,
+                        'timestamp': data.index[i],
                         'pattern': 'fair_value_gap_fast',
                         'direction': 'BUY',
+                        'sign': 1,
                         'confidence': strength,
-                        'entry_price': bar3['Close'],
+                        'entry_price': close[i],
                         'pattern_type': 'gap_fill',
                         'timeframe': 'intraday'
                     })
             
             # Bearish FVG (gap down that gets filled)
-            elif (bar1['Low'] > bar3['High'] and  # Gap exists
-                  bar2['Close'] < bar2['Open'] and  # Bearish gap bar
-                  bar3['Close'] < bar1['Low']):     # Gap holding
+            elif (low[i-2] > high[i] and  # Gap exists
+                  close[i-1] < open_[i-1] and  # Bearish gap bar
+                  close[i] < low[i-2]):     # Gap holding
                 
-                gap_size = (bar1['Low'] - bar3['High']) / bar3['High']
+                gap_size = (low[i-2] - high[i]) / high[i]
                 
                 if gap_size > 0.001:  # Minimum 0.1% gap
                     strength = min(90, 60 + gap_size * 10000)
                     
                     signals.append({
-                        'timestamp': bar3.name,
+                        'timestamp': data.index[i],
                         'pattern': 'fair_value_gap_fast',
                         'direction': 'SELL',
+                        'sign': -1,
                         'confidence': strength,
-                        'entry_price': bar3['Close'],
+                        'entry_price': close[i],
                         'pattern_type': 'gap_fill',
                         'timeframe': 'intraday'
                     })
@@ -253,6 +271,28 @@ class DayTradingPatternDetector:
         
         return day_trading_signals[:5]  # Top 5 signals for focus
 
+# Tighter stops for day trading: pattern_type -> (stop %, target %), all 1:2 R:R
+_PATTERN_PARAMS = MappingProxyType({
+    'scalping': (0.003, 0.006),  # 0.3% stop / 0.6% target
+    'momentum': (0.005, 0.01),   # 0.5% stop / 1% target
+})
+_DEFAULT_PATTERN_PARAMS = (0.004, 0.008)  # reversal patterns: 0.4% stop / 0.8% target
+
+# Stops sit below a BUY and above a SELL (anything but BUY is treated as a SELL).
+# Detectors store this as signal['sign']; the table covers signals built without it
+_DIR_SIGN = MappingProxyType({'BUY': 1, 'SELL': -1})
+
+# Trade setups from DayTradingRiskManager.calculate_day_trading_position_sizes
+SETUP_DTYPE = np.dtype([
+    ('position_size', 'f8'),
+    ('entry_price', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('risk_amount', 'f8'),
+    ('risk_reward_ratio', 'f8'),
+    ('pattern_type', 'U16'),
+])
+
 class DayTradingRiskManager:
     """Specialized risk management for day trading"""
     
@@ -266,52 +306,76 @@ class DayTradingRiskManager:
         """Calculate position size for day trading with tight risk control"""
         
         # Tighter stops for day trading
-        if signal['pattern_type'] == 'scalping':
-            stop_distance_pct = 0.003  # 0.3% stop for scalping
-            profit_target_pct = 0.006  # 0.6% target (1:2 R:R)
-        elif signal['pattern_type'] == 'momentum':
-            stop_distance_pct = 0.005  # 0.5% stop for momentum
-            profit_target_pct = 0.01   # 1% target (1:2 R:R)
-        else:  # reversal patterns
-            stop_distance_pct = 0.004  # 0.4% stop
-            profit_target_pct = 0.008  # 0.8% target (1:2 R:R)
+        stop_distance_pct, profit_target_pct = _PATTERN_PARAMS.get(signal['pattern_type'], _DEFAULT_PATTERN_PARAMS)
         
         # Calculate levels
-        if signal['direction'] == 'BUY':
-            stop_loss = current_price * (1 - stop_distance_pct)
-            take_profit = current_price * (1 + profit_target_pct)
-        else:
-            stop_loss = current_price * (1 + stop_distance_pct)
-            take_profit = current_price * (1 - profit_target_pct)
+        side = signal.get('sign') or _DIR_SIGN.get(signal['direction'], -1)
+        stop_loss = current_price * (1 - side * stop_distance_pct)
+        take_profit = current_price * (1 + side * profit_target_pct)
         
-        # Position sizing based on risk per trade
+        # Position sizing based on risk per trade (daily limit checked first - no size once it is hit)
         risk_amount = account_balance * self.max_position_risk
         stop_distance = abs(current_price - stop_loss)
         
-        if stop_distance > 0:
+        if self.daily_limit_reached(self.daily_pnl, account_balance, self.max_daily_risk):
+            position_size = 0  # Stop trading for the day
+        elif stop_distance > 0:
             position_size = risk_amount / stop_distance
         else:
             position_size = 0
         
-        # Check daily risk limits
-        if abs(self.daily_pnl) >= account_balance * self.max_daily_risk:
-            position_size = 0  # Stop trading for the day
-        
         return {
             'position_size': position_size,
             'entry_price': current_price,
             'stop_loss': stop_loss,
             'take_profit': take_profit,
             'risk_amount': risk_amount,
-            'risk_reward_ratio': abs(take_profit - current_price) / abs(current_price - stop_loss),
+            'risk_reward_ratio': abs(take_profit - current_price) / stop_distance,
             'pattern_type': signal['pattern_type']
         }
+    
+    @staticmethod
+    def daily_limit_reached(daily_pnl: float, account_balance: float, max_daily_risk: float) -> bool:
+        """True once today's P&L (either way) has used up the daily risk budget"""
+        return abs(daily_pnl) >= account_balance * max_daily_risk
+    
+    def calculate_day_trading_position_sizes(self, signals: List[Dict], current_prices, account_balance: float) -> np.ndarray:
+        """Vectorized calculate_day_trading_position_size for a batch of signals (SETUP_DTYPE records)"""
+        
+        n = len(signals)
+        prices = np.broadcast_to(np.asarray(current_prices, dtype=np.float64), (n,))
+        params = np.array([_PATTERN_PARAMS.get(s['pattern_type'], _DEFAULT_PATTERN_PARAMS) for s in signals],
+                          dtype=np.float64).reshape(n, 2)
+        side = np.fromiter((s.get('sign') or _DIR_SIGN.get(s['direction'], -1) for s in signals), dtype=np.float64, count=n)
+        
+        # Same levels as the single-signal version
+        stop_loss = prices * (1 - side * params[:, 0])
+        take_profit = prices * (1 + side * params[:, 1])
+        
+        risk_amount = account_balance * self.max_position_risk
+        stop_distance = np.abs(prices - stop_loss)
+        
+        setups = np.empty(n, dtype=SETUP_DTYPE)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            setups['position_size'] = np.where(stop_distance > 0, risk_amount / stop_distance, 0.0)
+            setups['risk_reward_ratio'] = np.abs(take_profit - prices) / stop_distance
+        
+        # Check daily risk limits
+        if self.daily_limit_reached(self.daily_pnl, account_balance, self.max_daily_risk):
+            setups['position_size'] = 0.0  # Stop trading for the day
+        
+        setups['entry_price'] = prices
+        setups['stop_loss'] = stop_loss
+        setups['take_profit'] = take_profit
+        setups['risk_amount'] = risk_amount
+        setups['pattern_type'] = [s['pattern_type'] for s in signals]
+        
+        return setups
 
 def get_intraday_data(symbol: str, period: str = "1d", interval: str = "15m") -> pd.DataFrame:
     """Get high-frequency intraday data for day trading"""
     try:
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period=period, interval=interval)
+        data = bucketed_history(symbol, period, interval)
         
         if len(data) > 0:
             print(f"✅ {symbol}: {len(data)} bars of {interval} data")
@@ -340,18 +404,19 @@ if __name__ == "__main__":
         
         print(f"📊 Found {len(signals)} day trading signals:")
         
-        for i, signal in enumerate(signals[:3]):
+        # Calculate position sizing for all shown signals in one pass
+        top_signals = signals[:3]
+        trade_setups = risk_manager.calculate_day_trading_position_sizes(
+            top_signals, [signal['entry_price'] for signal in top_signals], 10000
+        )
+        
+        for i, (signal, trade_setup) in enumerate(zip(top_signals, trade_setups)):
             print(f"\n🎯 Signal {i+1}:")
             print(f"   Pattern: {signal['pattern']}")
             print(f"   Direction: {signal['direction']}")
             print(f"   Confidence: {signal['confidence']:.1f}%")
             print(f"   Type: {signal['pattern_type']}")
             
-            # Calculate position sizing
-            trade_setup = risk_manager.calculate_day_trading_position_size(
-                signal, signal['entry_price'], 10000
-            )
-            
             print(f"   💰 Position Size: {trade_setup['position_size']:.2f}")
             print(f"   📊 Stop Loss: {trade_setup['stop_loss']:.4f}")
             print(f"   📊 Take Profit: {trade_setup['take_profit']:.4f}")
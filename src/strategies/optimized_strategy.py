@@ -7,15 +7,52 @@ Improved parameters based on real data profitability analysis
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
 
 from day_trading_optimizer import get_intraday_data
 from session_optimizer import TradingSessionOptimizer
+from indicators import rsi_wilder, atr_wilder, align_windows
+from pattern_kernels import scan_liquidity_sweeps
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view as swv
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+# Column layout for detected signals - one record per signal instead of a dict of strings.
+# 'bar' points back into the source frame; timestamps are stored as naive UTC.
+SIGNAL_DTYPE = np.dtype([
+    ('bar', 'i8'),
+    ('timestamp', 'datetime64[ns]'),
+    ('direction', 'U4'),
+    ('pattern_type', 'U16'),
+    ('confidence', 'f8'),
+    ('entry_price', 'f8'),
+    ('quality_score', 'f8'),
+])
+
+# Trade setups from OptimizedRiskManager.batch_position_sizes - the same fields as the single-signal dict
+SETUP_DTYPE = np.dtype([
+    ('position_size', 'f8'),
+    ('entry_price', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('risk_amount', 'f8'),
+    ('risk_reward_ratio', 'f8'),
+    ('pattern_type', 'U16'),
+    ('quality_score', 'f8'),
+])
+
+def _utc_timestamps(index: pd.Index, bars: np.ndarray) -> np.ndarray:
+    """Index labels at bars as naive-UTC datetime64[ns] (NaT for a non-datetime index)"""
+    if not isinstance(index, pd.DatetimeIndex):
+        return np.full(len(bars), np.datetime64('NaT'), dtype='datetime64[ns]')
+    stamps = index[bars]
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert(None)
+    return stamps.to_numpy().astype('datetime64[ns]')
+
 class OptimizedDayTradingDetector:
     """Optimized pattern detector with improved parameters"""
     
@@ -27,161 +64,153 @@ class OptimizedDayTradingDetector:
     def calculate_pattern_quality_score(self, signal: Dict, data: pd.DataFrame) -> float:
         """Calculate comprehensive quality score for patterns"""
         
-        score = 0.0
+        volume_ratio = momentum = volatility = None
+        close = data['Close'].to_numpy(dtype=np.float64)
         
-        # Base confidence score (40% weight)
-        confidence_score = signal['confidence'] / 100
-        score += confidence_score * 0.4
-        
-        # Volume confirmation (20% weight)
         if len(data) >= 10:
-            recent_volume = data['Volume'].iloc[-5:].mean()
-            avg_volume = data['Volume'].rolling(20).mean().iloc[-1]
+            # Only the last window of each rolling stat is used
+            volume = data['Volume'].to_numpy(dtype=np.float64)
+            recent_volume = volume[-5:].mean()
+            avg_volume = volume[-20:].mean() if len(volume) >= 20 else np.nan
             volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
-            volume_score = min(1.0, volume_ratio / 1.5)  # Normalize to 1.0
-            score += volume_score * 0.2
+            volatility = close[-10:].std(ddof=1) / close[-1]
         
-        # Price momentum alignment (20% weight)
         if len(data) >= 5:
-            price_momentum = data['Close'].pct_change(5).iloc[-1]
-            if signal['direction'] == 'BUY' and price_momentum > 0:
-                momentum_score = min(1.0, abs(price_momentum) * 100)
-            elif signal['direction'] == 'SELL' and price_momentum < 0:
-                momentum_score = min(1.0, abs(price_momentum) * 100)
-            else:
-                momentum_score = 0.0
-            score += momentum_score * 0.2
+            momentum = close[-1] / close[-6] - 1 if len(close) >= 6 else np.nan  # 5-bar % change
         
-        # Volatility appropriateness (20% weight)
-        if len(data) >= 10:
-            volatility = data['Close'].rolling(10).std().iloc[-1] / data['Close'].iloc[-1]
-            # Prefer moderate volatility (0.5-2%)
-            if 0.005 <= volatility <= 0.02:
-                volatility_score = 1.0
-            elif volatility < 0.005:
-                volatility_score = volatility / 0.005  # Scale up low volatility
-            else:
-                volatility_score = max(0.2, 0.02 / volatility)  # Scale down high volatility
-            score += volatility_score * 0.2
+        return float(self._quality_scores(signal['confidence'], signal['direction'] == 'BUY',
+                                          volume_ratio, momentum, volatility))
+    
+    def _quality_scores(self, confidence, buy, volume_ratio=None, momentum=None, volatility=None):
+        """Quality scores from precomputed features - scalars or arrays (None = feature unavailable)"""
+        
+        # Base confidence score (40% weight)
+        score = confidence / 100 * 0.4
+        
+        # Volume confirmation (20% weight)
+        if volume_ratio is not None:
+            score = score + np.fmin(1.0, volume_ratio / 1.5) * 0.2  # Normalize to 1.0
         
-        return min(1.0, score)
+        # Price momentum alignment (20% weight) - momentum must point the trade's way
+        if momentum is not None:
+            aligned = np.where(buy, 1.0, -1.0) * momentum > 0
+            score = score + np.where(aligned, np.fmin(1.0, np.abs(momentum) * 100), 0.0) * 0.2
+        
+        # Volatility appropriateness (20% weight) - prefer moderate volatility (0.5-2%)
+        if volatility is not None:
+            with np.errstate(divide='ignore'):
+                volatility_score = np.select(
+                    [volatility < 0.005, volatility <= 0.02],
+                    [volatility / 0.005, 1.0],  # Scale up low volatility
+                    np.fmax(0.2, 0.02 / volatility)  # Scale down high volatility
+                )
+            score = score + volatility_score * 0.2
+        
+        return np.fmin(1.0, score)
     
-    def detect_high_quality_liquidity_sweeps(self, data: pd.DataFrame) -> List[Dict]:
-        """Enhanced liquidity sweep detection with quality filtering"""
-        signals = []
+    def _scan_liquidity_sweeps(self, data: pd.DataFrame):
+        """Array pass behind the sweep detector: accepted sweeps as a SIGNAL_DTYPE record array"""
+        
+        # Indicators and price columns as float32 arrays - no per-bar row lookups, and
+        # half the memory traffic on the rolling passes (thresholds work at ~1e-4)
+        n = len(data)
+        open_ = data['Open'].to_numpy(dtype=np.float32)
+        high = data['High'].to_numpy(dtype=np.float32)
+        low = data['Low'].to_numpy(dtype=np.float32)
+        close = data['Close'].to_numpy(dtype=np.float32)
+        volume = data['Volume'].to_numpy(dtype=np.float32)
+        sma20 = align_windows(swv(close, 20).mean(axis=1), n)
+        rsi = rsi_wilder(close, 14)
+        
+        # Quality features for every bar, computed once on the full series. The volume term keeps
+        # the score's original input: it was taken over an 11-bar window, where the 20-bar
+        # average is undefined and the ratio falls back to 1
+        volume_ratio = 1.0
+        momentum = np.full(n, np.nan, dtype=np.float32)
+        momentum[5:] = close[5:] / close[:-5] - 1
+        volatility = align_windows(swv(close, 10).std(axis=1, ddof=1), n) / close
+        
+        # Previous 15 bars (i-15 .. i-1) as seen from bar i
+        prev_high_max = align_windows(swv(high, 15).max(axis=1), n, lag=1)
+        prev_low_min = align_windows(swv(low, 15).min(axis=1), n, lag=1)
+        prev_vol_mean = align_windows(swv(volume, 15).mean(axis=1), n, lag=1)
         
+        # Compiled bar scan for the sweeps themselves
+        hits, directions, strength = scan_liquidity_sweeps(
+            open_, high, low, close, volume, rsi, sma20,
+            prev_high_max, prev_low_min, prev_vol_mean, float(self.min_pattern_strength)
+        )
+        buy = directions == 1
+        quality = self._quality_scores(strength, buy, volume_ratio, momentum[hits], volatility[hits])
+        
+        keep = quality >= self.quality_score_threshold
+        hits = hits[keep]
+        
+        records = np.empty(len(hits), dtype=SIGNAL_DTYPE)
+        records['bar'] = hits
+        records['timestamp'] = _utc_timestamps(data.index, hits)
+        records['direction'] = np.where(buy[keep], 'BUY', 'SELL')
+        records['pattern_type'] = 'momentum'
+        records['confidence'] = strength[keep]
+        records['entry_price'] = data['Close'].to_numpy(dtype=np.float64)[hits]  # full precision for display
+        records['quality_score'] = quality[keep]
+        return records
+    
+    def _sweep_signals(self, data: pd.DataFrame, records: np.ndarray) -> List[Dict]:
+        """Signal dicts for the API - built only for the records handed out"""
+        bars = records['bar'].tolist()
+        return [{
+            'timestamp': data.index[bar],
+            'pattern': 'liquidity_sweep_enhanced',
+            'direction': str(rec['direction']),
+            'confidence': rec['confidence'],
+            'entry_price': rec['entry_price'],
+            'pattern_type': str(rec['pattern_type']),
+            'timeframe': 'intraday',
+            'quality_score': rec['quality_score']
+        } for bar, rec in zip(bars, records)]
+    
+    def detect_sweep_records(self, data: pd.DataFrame) -> np.ndarray:
+        """Accepted liquidity sweeps as a SIGNAL_DTYPE record array (empty when data is too short)"""
         if len(data) < 25:
-            return signals
-            
-        # Calculate enhanced indicators
-        data_copy = data.copy()
-        data_copy['sma_20'] = data_copy['Close'].rolling(20).mean()
-        data_copy['rsi'] = self.calculate_rsi(data_copy['Close'], 14)
-        data_copy['atr'] = self.calculate_atr(data_copy, 14)
-        
-        recent_high = data_copy['High'].rolling(15).max()
-        recent_low = data_copy['Low'].rolling(15).min()
-        
-        for i in range(20, len(data_copy)):
-            current = data_copy.iloc[i]
-            prev_bars = data_copy.iloc[i-15:i]
-            
-            # Enhanced bullish liquidity sweep
-            if (current['Low'] < recent_low.iloc[i-1] * 0.9995 and  # Stronger sweep
-                current['Close'] > current['Open'] and
-                current['Close'] > prev_bars['High'].max() * 0.9998 and
-                30 < current['rsi'] < 70):  # RSI filter
-                
-                base_strength = 75 + abs(current['Close'] - current['Low']) / current['Close'] * 2000
-                
-                # Quality enhancements
-                if current['Volume'] > prev_bars['Volume'].mean() * 1.3:
-                    base_strength += 5
-                if current['Close'] > current['sma_20']:
-                    base_strength += 5
-                
-                strength = min(95, base_strength)
-                
-                if strength >= self.min_pattern_strength:
-                    signal = {
-                        'timestamp': current.name,
-                        'pattern': 'liquidity_sweep_enhanced',
-                        'direction': 'BUY',
-                        'confidence': strength,
-                        'entry_price': current['Close'],
-                        'pattern_type': 'momentum',
-                        'timeframe': 'intraday'
-                    }
-                    
-                    quality_score = self.calculate_pattern_quality_score(signal, data_copy.iloc[i-10:i+1])
-                    
-                    if quality_score >= self.quality_score_threshold:
-                        signal['quality_score'] = quality_score
-                        signals.append(signal)
-            
-            # Enhanced bearish liquidity sweep
-            elif (current['High'] > recent_high.iloc[i-1] * 1.0005 and
-                  current['Close'] < current['Open'] and
-                  current['Close'] < prev_bars['Low'].min() * 1.0002 and
-                  30 < current['rsi'] < 70):
-                
-                base_strength = 75 + abs(current['High'] - current['Close']) / current['Close'] * 2000
-                
-                if current['Volume'] > prev_bars['Volume'].mean() * 1.3:
-                    base_strength += 5
-                if current['Close'] < current['sma_20']:
-                    base_strength += 5
-                
-                strength = min(95, base_strength)
-                
-                if strength >= self.min_pattern_strength:
-                    signal = {
-                        'timestamp': current.name,
-                        'pattern': 'liquidity_sweep_enhanced',
-                        'direction': 'SELL',
-                        'confidence': strength,
-                        'entry_price': current['Close'],
-                        'pattern_type': 'momentum',
-                        'timeframe': 'intraday'
-                    }
-                    
-                    quality_score = self.calculate_pattern_quality_score(signal, data_copy.iloc[i-10:i+1])
-                    
-                    if quality_score >= self.quality_score_threshold:
-                        signal['quality_score'] = quality_score
-                        signals.append(signal)
-        
-        return signals
+            return np.empty(0, dtype=SIGNAL_DTYPE)
+        return self._scan_liquidity_sweeps(data)
+    
+    def detect_high_quality_liquidity_sweeps(self, data: pd.DataFrame) -> List[Dict]:
+        """Enhanced liquidity sweep detection with quality filtering"""
+        return self._sweep_signals(data, self.detect_sweep_records(data))
     
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        """Calculate RSI indicator (Wilder smoothing)"""
+        return pd.Series(rsi_wilder(prices.to_numpy(dtype=np.float64), period), index=prices.index)
     
     def calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average True Range"""
-        high_low = data['High'] - data['Low']
-        high_close = np.abs(data['High'] - data['Close'].shift())
-        low_close = np.abs(data['Low'] - data['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        return true_range.rolling(window=period).mean()
+        """Calculate Average True Range (Wilder smoothing)"""
+        high, low, close = (data[col].to_numpy(dtype=np.float64) for col in ['High', 'Low', 'Close'])
+        return pd.Series(atr_wilder(high, low, close, period), index=data.index)
     
     def analyze_optimized_patterns(self, data: pd.DataFrame) -> List[Dict]:
         """Comprehensive optimized pattern analysis"""
-        all_signals = []
+        if len(data) < 25:
+            return []
+        
+        # Only use the highest quality pattern detection, ranked on the arrays
+        records = self._scan_liquidity_sweeps(data)
+        strength = records['confidence']
+        quality = records['quality_score']
         
-        # Only use the highest quality pattern detection
-        all_signals.extend(self.detect_high_quality_liquidity_sweeps(data))
+        # Return only top 2 signals for focus - only rows tied with or above the
+        # 2nd-best quality can make it, so partition first and sort just those
+        top_n = 2
+        candidates = np.arange(len(quality))
+        if len(quality) > top_n:
+            cutoff = np.partition(quality, len(quality) - top_n)[len(quality) - top_n]
+            candidates = np.flatnonzero(quality >= cutoff)
         
-        # Sort by quality score and confidence
-        all_signals.sort(key=lambda x: (x.get('quality_score', 0), x['confidence']), reverse=True)
+        # Sort by quality score then confidence (stable, so ties keep bar order)
+        order = candidates[np.lexsort((-strength[candidates], -quality[candidates]))]
         
-        # Return only top 2 signals for focus
-        return all_signals[:2]
+        return self._sweep_signals(data, records[order[:top_n]])
 
 class OptimizedRiskManager:
     """Enhanced risk management with improved parameters"""
@@ -248,6 +277,50 @@ class OptimizedRiskManager:
             'pattern_type': signal['pattern_type'],
             'quality_score': quality_score
         }
+    
+    def batch_position_sizes(self, signals: np.ndarray, current_prices, account_balance: float) -> np.ndarray:
+        """Vectorized calculate_optimized_position_size for SIGNAL_DTYPE records (SETUP_DTYPE records)"""
+        
+        n = len(signals)
+        prices = np.broadcast_to(np.asarray(current_prices, dtype=np.float64), (n,))
+        pattern_type = signals['pattern_type']
+        quality_score = signals['quality_score']
+        
+        # Same base stops/targets per pattern type as the single-signal version
+        is_momentum = pattern_type == 'momentum'
+        is_reversal = pattern_type == 'reversal'
+        base_stop_pct = np.select([is_momentum, is_reversal], [0.004, 0.003], 0.002)
+        profit_target_pct = np.select([is_momentum, is_reversal], [0.012, 0.009], 0.006)
+        
+        final_stop_pct = base_stop_pct * (1.0 + (1.0 - quality_score) * 0.5)
+        final_profit_pct = profit_target_pct * (1.0 + quality_score * 0.3)
+        
+        # Stops sit below a BUY and above a SELL, targets the other way round
+        side = np.where(signals['direction'] == 'BUY', -1.0, 1.0)
+        stop_loss = prices * (1 + side * final_stop_pct)
+        take_profit = prices * (1 - side * final_profit_pct)
+        
+        risk_amount = account_balance * self.max_position_risk
+        stop_distance = np.abs(prices - stop_loss)
+        
+        setups = np.empty(n, dtype=SETUP_DTYPE)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            setups['position_size'] = np.where(stop_distance > 0, risk_amount / stop_distance, 0.0)
+            setups['risk_reward_ratio'] = np.abs(take_profit - prices) / stop_distance
+        
+        # Check daily limits
+        if (abs(self.daily_pnl) >= account_balance * self.max_daily_risk or 
+            len(self.trades_today) >= self.max_trades_per_day):
+            setups['position_size'] = 0.0
+        
+        setups['entry_price'] = prices
+        setups['stop_loss'] = stop_loss
+        setups['take_profit'] = take_profit
+        setups['risk_amount'] = risk_amount
+        setups['pattern_type'] = pattern_type
+        setups['quality_score'] = quality_score
+        
+        return setups
 
 def test_optimized_strategy():
     """Test the optimized strategy with real data"""
@@ -259,7 +332,7 @@ def test_optimized_strategy():
     # Initialize optimized components
     detector = OptimizedDayTradingDetector()
     risk_manager = OptimizedRiskManager()
-    session_optimizer = TradingSessionOptimizer()
+    session_optimizer = TradingSessionOptimizer.get()
     
     # Focus on best performing pair first
     test_symbol = "USDJPY=X"
@@ -288,7 +361,7 @@ def test_optimized_strategy():
             print(f"   Type: {signal['pattern_type']}")
             
             # Calculate optimized position sizing
-            current_price = data['Close'].iloc[-1]
+            current_price = data['Close'].to_numpy()[-1]
             trade_setup = risk_manager.calculate_optimized_position_size(
                 signal, current_price, 10000
             )
@@ -5,9 +5,103 @@ Session-specific strategies and market timing for optimal day trading
 """
 
 from datetime import datetime, timezone
+from types import MappingProxyType
 import pytz
+import numpy as np
 from typing import Dict, List
 
+def _session_for_hour(hour: int) -> str:
+    """Dominant trading session for a UTC hour"""
+    # Check for session overlaps (most important)
+    if 13 <= hour < 17:  # London-NY overlap (13:00-17:00 UTC)
+        return 'LONDON_NY_OVERLAP'
+    elif 8 <= hour < 17:   # London session (08:00-17:00 UTC)
+        return 'LONDON'
+    elif 13 <= hour < 22:  # New York session (13:00-22:00 UTC)
+        return 'NEW_YORK'
+    elif 0 <= hour < 9:    # Tokyo session (00:00-09:00 UTC)
+        return 'TOKYO'
+    else:                  # Sydney/Asian session
+        return 'SYDNEY'
+
+# Hour -> session table, built once at import
+_SESSION_BY_HOUR = tuple(_session_for_hour(hour) for hour in range(24))
+
+# Session characteristics for strategy optimization - read-only, shared by every optimizer
+_SESSION_PROFILES = MappingProxyType({
+    'SYDNEY': MappingProxyType({
+        'volatility': 'LOW',
+        'preferred_pairs': ('AUDUSD', 'NZDUSD', 'AUDJPY'),
+        'strategies': ('reversal', 'range_trading'),
+        'risk_multiplier': 0.8
+    }),
+    'TOKYO': MappingProxyType({
+        'volatility': 'MEDIUM',
+        'preferred_pairs': ('USDJPY', 'EURJPY', 'GBPJPY'),
+        'strategies': ('momentum', 'reversal'),
+        'risk_multiplier': 1.0
+    }),
+    'LONDON': MappingProxyType({
+        'volatility': 'HIGH',
+        'preferred_pairs': ('EURUSD', 'GBPUSD', 'EURGBP'),
+        'strategies': ('momentum', 'breakout'),
+        'risk_multiplier': 1.2
+    }),
+    'NEW_YORK': MappingProxyType({
+        'volatility': 'HIGH',
+        'preferred_pairs': ('EURUSD', 'GBPUSD', 'USDCAD', 'US30'),
+        'strategies': ('scalping', 'momentum'),
+        'risk_multiplier': 1.3
+    }),
+    'LONDON_NY_OVERLAP': MappingProxyType({
+        'volatility': 'VERY_HIGH',
+        'preferred_pairs': ('EURUSD', 'GBPUSD', 'USDCAD'),
+        'strategies': ('scalping', 'momentum', 'breakout'),
+        'risk_multiplier': 1.5
+    })
+})
+
+# Volatility -> risk parameter tables (unknown volatility falls back to the MEDIUM values)
+_MAX_POSITIONS = MappingProxyType({
+    'LOW': 3,
+    'MEDIUM': 2,
+    'HIGH': 2,
+    'VERY_HIGH': 1  # Focus on fewer trades during high volatility
+})
+_STOP_MULTIPLIER = MappingProxyType({
+    'LOW': 0.8,      # Tighter stops in low volatility
+    'MEDIUM': 1.0,
+    'HIGH': 1.2,     # Wider stops in high volatility
+    'VERY_HIGH': 1.4
+})
+_PROFIT_MULTIPLIER = MappingProxyType({
+    'LOW': 1.5,      # Lower targets in low volatility
+    'MEDIUM': 2.0,
+    'HIGH': 2.5,     # Higher targets in high volatility
+    'VERY_HIGH': 3.0
+})
+
+def _confidence_multiplier(pair_preference: str, volatility: str, session_match: bool) -> float:
+    """Combined confidence boost: preferred pair (or very high volatility), then pattern/session match"""
+    multiplier = 1.0
+    if pair_preference == 'HIGH':
+        multiplier = 1.2
+    elif volatility == 'VERY_HIGH':
+        multiplier = 1.1
+    
+    # Session-specific pattern preferences
+    if session_match:
+        multiplier *= 1.1
+    return multiplier
+
+# (pair_preference, volatility, session_match) -> multiplier, so a signal needs one multiply and one clamp
+_CONFIDENCE_MULTIPLIER = MappingProxyType({
+    (pair_preference, volatility, session_match): _confidence_multiplier(pair_preference, volatility, session_match)
+    for pair_preference in ('HIGH', 'MEDIUM')
+    for volatility in _MAX_POSITIONS
+    for session_match in (True, False)
+})
+
 class TradingSessionOptimizer:
     """Optimize trading strategies based on market sessions and timing"""
     
@@ -19,58 +113,20 @@ class TradingSessionOptimizer:
             'NEW_YORK': {'start': 13, 'end': 22, 'timezone': 'America/New_York'}
         }
         
-        # Session characteristics for strategy optimization
-        self.session_profiles = {
-            'SYDNEY': {
-                'volatility': 'LOW',
-                'preferred_pairs': ['AUDUSD', 'NZDUSD', 'AUDJPY'],
-                'strategies': ['reversal', 'range_trading'],
-                'risk_multiplier': 0.8
-            },
-            'TOKYO': {
-                'volatility': 'MEDIUM',
-                'preferred_pairs': ['USDJPY', 'EURJPY', 'GBPJPY'],
-                'strategies': ['momentum', 'reversal'],
-                'risk_multiplier': 1.0
-            },
-            'LONDON': {
-                'volatility': 'HIGH',
-                'preferred_pairs': ['EURUSD', 'GBPUSD', 'EURGBP'],
-                'strategies': ['momentum', 'breakout'],
-                'risk_multiplier': 1.2
-            },
-            'NEW_YORK': {
-                'volatility': 'HIGH',
-                'preferred_pairs': ['EURUSD', 'GBPUSD', 'USDCAD', 'US30'],
-                'strategies': ['scalping', 'momentum'],
-                'risk_multiplier': 1.3
-            },
-            'LONDON_NY_OVERLAP': {
-                'volatility': 'VERY_HIGH',
-                'preferred_pairs': ['EURUSD', 'GBPUSD', 'USDCAD'],
-                'strategies': ['scalping', 'momentum', 'breakout'],
-                'risk_multiplier': 1.5
-            }
-        }
+        # Session characteristics for strategy optimization (shared, read-only)
+        self.session_profiles = _SESSION_PROFILES
+    
+    @classmethod
+    def get(cls) -> 'TradingSessionOptimizer':
+        """Process-wide shared optimizer - it holds no per-caller state"""
+        return SESSION_OPTIMIZER
     
     def get_current_session(self, utc_time=None):
         """Determine the current dominant trading session"""
         if utc_time is None:
             utc_time = datetime.now(timezone.utc)
         
-        hour = utc_time.hour
-        
-        # Check for session overlaps (most important)
-        if 13 <= hour < 17:  # London-NY overlap (13:00-17:00 UTC)
-            return 'LONDON_NY_OVERLAP'
-        elif 8 <= hour < 17:   # London session (08:00-17:00 UTC)
-            return 'LONDON'
-        elif 13 <= hour < 22:  # New York session (13:00-22:00 UTC)
-            return 'NEW_YORK'
-        elif 0 <= hour < 9:    # Tokyo session (00:00-09:00 UTC)
-            return 'TOKYO'
-        else:                  # Sydney/Asian session
-            return 'SYDNEY'
+        return _SESSION_BY_HOUR[utc_time.hour]
     
     def get_session_strategy(self, pair: str, current_session: str = None):
         """Get optimized strategy for pair and session"""
@@ -90,31 +146,33 @@ class TradingSessionOptimizer:
             'pair_preference': pair_preference
         }
     
-    def optimize_signal_for_session(self, signal: Dict, pair: str):
-        """Optimize trading signal based on current session"""
-        session_info = self.get_session_strategy(pair)
+    def optimize_signal_for_session(self, signal: Dict, pair: str, current_session: str = None):
+        """Optimize trading signal based on current session (pass current_session to skip the clock)"""
+        session_info = self.get_session_strategy(pair, current_session)
         
-        # Adjust confidence based on session preference
-        confidence_multiplier = 1.0
-        if session_info['pair_preference'] == 'HIGH':
-            confidence_multiplier = 1.2
-        elif session_info['volatility'] == 'VERY_HIGH':
-            confidence_multiplier = 1.1
+        # Adjust confidence based on session preference and pattern match
+        session_match = signal.get('pattern_type', 'momentum') in session_info['preferred_strategies']
+        multiplier = _CONFIDENCE_MULTIPLIER[(session_info['pair_preference'], session_info['volatility'], session_match)]
+        confidence = min(95, signal['confidence'] * multiplier)
+        
+        return {**signal, 'confidence': confidence, 'session_info': session_info, 'session_match': session_match}
+    
+    def optimize_signals_for_session(self, signals: List[Dict], pair: str, current_session: str = None) -> List[Dict]:
+        """Batch optimize_signal_for_session - one session lookup, confidences adjusted as an array"""
+        session_info = self.get_session_strategy(pair, current_session)
+        key = (session_info['pair_preference'], session_info['volatility'])
         
-        # Adjust signal parameters
-        optimized_signal = signal.copy()
-        optimized_signal['confidence'] = min(95, signal['confidence'] * confidence_multiplier)
-        optimized_signal['session_info'] = session_info
+        preferred = session_info['preferred_strategies']
+        session_match = np.fromiter((s.get('pattern_type', 'momentum') in preferred for s in signals),
+                                    dtype=bool, count=len(signals))
+        confidence = np.fromiter((s['confidence'] for s in signals), dtype=np.float64, count=len(signals))
         
-        # Session-specific pattern preferences
-        pattern_type = signal.get('pattern_type', 'momentum')
-        if pattern_type in session_info['preferred_strategies']:
-            optimized_signal['session_match'] = True
-            optimized_signal['confidence'] = min(95, optimized_signal['confidence'] * 1.1)
-        else:
-            optimized_signal['session_match'] = False
+        # Same combined multiplier and single clamp as the single-signal version
+        multiplier = np.where(session_match, _CONFIDENCE_MULTIPLIER[(*key, True)], _CONFIDENCE_MULTIPLIER[(*key, False)])
+        confidence = np.minimum(95, confidence * multiplier)
         
-        return optimized_signal
+        return [{**signal, 'confidence': conf, 'session_info': session_info, 'session_match': match}
+                for signal, conf, match in zip(signals, confidence.tolist(), session_match.tolist())]
     
     def get_session_risk_parameters(self, current_session: str = None):
         """Get session-specific risk management parameters"""
@@ -122,45 +180,28 @@ class TradingSessionOptimizer:
             current_session = self.get_current_session()
         
         session_profile = self.session_profiles.get(current_session, self.session_profiles['LONDON'])
+        volatility = session_profile['volatility']
         
         base_risk = 0.005  # 0.5% base risk per trade
         
         return {
             'risk_per_trade': base_risk * session_profile['risk_multiplier'],
-            'max_positions': self._get_max_positions(session_profile['volatility']),
-            'stop_loss_multiplier': self._get_stop_multiplier(session_profile['volatility']),
-            'take_profit_multiplier': self._get_profit_multiplier(session_profile['volatility'])
+            'max_positions': _MAX_POSITIONS.get(volatility, 2),
+            'stop_loss_multiplier': _STOP_MULTIPLIER.get(volatility, 1.0),
+            'take_profit_multiplier': _PROFIT_MULTIPLIER.get(volatility, 2.0)
         }
     
     def _get_max_positions(self, volatility: str) -> int:
         """Get maximum concurrent positions based on volatility"""
-        volatility_map = {
-            'LOW': 3,
-            'MEDIUM': 2, 
-            'HIGH': 2,
-            'VERY_HIGH': 1  # Focus on fewer trades during high volatility
-        }
-        return volatility_map.get(volatility, 2)
+        return _MAX_POSITIONS.get(volatility, 2)
     
     def _get_stop_multiplier(self, volatility: str) -> float:
         """Get stop loss multiplier based on session volatility"""
-        volatility_map = {
-            'LOW': 0.8,      # Tighter stops in low volatility
-            'MEDIUM': 1.0,
-            'HIGH': 1.2,     # Wider stops in high volatility
-            'VERY_HIGH': 1.4
-        }
-        return volatility_map.get(volatility, 1.0)
+        return _STOP_MULTIPLIER.get(volatility, 1.0)
     
     def _get_profit_multiplier(self, volatility: str) -> float:
         """Get take profit multiplier based on session volatility"""
-        volatility_map = {
-            'LOW': 1.5,      # Lower targets in low volatility
-            'MEDIUM': 2.0,
-            'HIGH': 2.5,     # Higher targets in high volatility
-            'VERY_HIGH': 3.0
-        }
-        return volatility_map.get(volatility, 2.0)
+        return _PROFIT_MULTIPLIER.get(volatility, 2.0)
     
     def is_high_impact_news_time(self, utc_time=None):
         """Check if current time coincides with high-impact news releases"""
@@ -186,10 +227,11 @@ class TradingSessionOptimizer:
     
     def get_session_summary(self):
         """Get summary of current session characteristics"""
-        current_session = self.get_current_session()
+        utc_now = datetime.now(timezone.utc)  # one clock read for the whole summary
+        current_session = self.get_current_session(utc_now)
         session_profile = self.session_profiles.get(current_session)
         risk_params = self.get_session_risk_parameters(current_session)
-        high_impact = self.is_high_impact_news_time()
+        high_impact = self.is_high_impact_news_time(utc_now)
         
         return {
             'session': current_session,
@@ -199,13 +241,16 @@ class TradingSessionOptimizer:
             'risk_per_trade': risk_params['risk_per_trade'],
             'max_positions': risk_params['max_positions'],
             'high_impact_news': high_impact,
-            'utc_time': datetime.now(timezone.utc).strftime('%H:%M UTC')
+            'utc_time': utc_now.strftime('%H:%M UTC')
         }
 
+# Shared instance behind TradingSessionOptimizer.get()
+SESSION_OPTIMIZER = TradingSessionOptimizer()
+
 # Market timing utilities
 def get_market_timing_advice():
     """Get current market timing advice"""
-    optimizer = TradingSessionOptimizer()
+    optimizer = SESSION_OPTIMIZER
     summary = optimizer.get_session_summary()
     
     advice = []
@@ -241,7 +286,7 @@ def get_market_timing_advice():
 
 if __name__ == "__main__":
     # Test session optimization
-    optimizer = TradingSessionOptimizer()
+    optimizer = TradingSessionOptimizer.get()
     summary = optimizer.get_session_summary()
     advice = get_market_timing_advice()
     
@@ -10,11 +10,14 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.strategies.day_trading_optimizer import DayTradingPatternDetector, DayTradingRiskManager, get_intraday_data
+from src.strategies.day_trading_optimizer import DayTradingPatternDetector, DayTradingRiskManager
 from src.strategies.session_optimizer import TradingSessionOptimizer, get_market_timing_advice
 from src.core.trading_system import DayTradingSmartMoney
+from src.core.data_cache import prefetch_histories
 from index import get_real_market_data
 import json
+import numpy as np
+import pandas as pd
 from datetime import datetime
 
 def run_complete_day_trading_test():
@@ -27,7 +30,7 @@ def run_complete_day_trading_test():
     # Initialize all components
     pattern_detector = DayTradingPatternDetector()
     risk_manager = DayTradingRiskManager()
-    session_optimizer = TradingSessionOptimizer()
+    session_optimizer = TradingSessionOptimizer.get()
     trader = DayTradingSmartMoney(initial_capital=10000)
     
     # 1. Session Analysis
@@ -70,16 +73,18 @@ def run_complete_day_trading_test():
     
     day_trading_signals = {}
     
-    for pair, symbol in test_pairs.items():
+    # Get intraday data based on session volatility - all pairs fetched concurrently
+    if session_summary['volatility'] in ['HIGH', 'VERY_HIGH']:
+        period, interval, timeframe = "1d", "5m", "5-minute"
+    else:
+        period, interval, timeframe = "2d", "15m", "15-minute"
+    histories = prefetch_histories(list(test_pairs.values()), period, interval)
+    
+    for (pair, symbol), data in zip(test_pairs.items(), histories):
         print(f"\nAnalyzing {pair}:")
         
-        # Get intraday data based on session volatility
-        if session_summary['volatility'] in ['HIGH', 'VERY_HIGH']:
-            data = get_intraday_data(symbol, period="1d", interval="5m")
-            timeframe = "5-minute"
-        else:
-            data = get_intraday_data(symbol, period="2d", interval="15m")
-            timeframe = "15-minute"
+        if data is None:
+            data = pd.DataFrame()
         
         if len(data) >= 20:
             print(f"   {len(data)} bars of {timeframe} data")
@@ -89,10 +94,7 @@ def run_complete_day_trading_test():
             
             if raw_signals:
                 # Optimize signals for current session
-                optimized_signals = []
-                for signal in raw_signals:
-                    optimized = session_optimizer.optimize_signal_for_session(signal, pair)
-                    optimized_signals.append(optimized)
+                optimized_signals = session_optimizer.optimize_signals_for_session(raw_signals, pair)
                 
                 # Sort by confidence
                 optimized_signals.sort(key=lambda x: x['confidence'], reverse=True)
@@ -104,7 +106,7 @@ def run_complete_day_trading_test():
                 
                 day_trading_signals[pair] = {
                     'signal': best_signal,
-                    'current_price': data['Close'].iloc[-1],
+                    'current_price': data['Close'].to_numpy()[-1],
                     'session_optimized': True
                 }
             else:
@@ -188,15 +190,23 @@ def run_complete_day_trading_test():
     print(f"   Trades Executed: {len(executed_trades)}")
     
     if executed_trades:
-        total_risk = sum(trade['setup']['risk_amount'] for trade in executed_trades)
+        # One (risk_amount, entry, stop, target) row per trade
+        setups = np.array([
+            (trade['setup']['risk_amount'], trade['setup']['entry_price'],
+             trade['setup']['stop_loss'], trade['setup']['take_profit'])
+            for trade in executed_trades
+        ], dtype=np.float64)
+        
+        total_risk = setups[:, 0].sum()
         print(f"   Total Risk: ${total_risk:.2f}")
         print(f"   Portfolio Risk: {(total_risk / trader.capital) * 100:.1f}%")
         
+        risk_rewards = np.abs(setups[:, 3] - setups[:, 1]) / np.abs(setups[:, 1] - setups[:, 2])
         print(f"\nACTIVE TRADES:")
-        for trade in executed_trades:
-            setup = trade['setup']
-            risk_reward = abs(setup['take_profit'] - setup['entry_price']) / abs(setup['entry_price'] - setup['stop_loss'])
-            print(f"   {trade['pair']}: {trade['signal']['direction']} (R:R 1:{risk_reward:.1f})")
+        print("\n".join(
+            f"   {trade['pair']}: {trade['signal']['direction']} (R:R 1:{risk_reward:.1f})"
+            for trade, risk_reward in zip(executed_trades, risk_rewards)
+        ))
     
     print(f"\nSYSTEM STATUS: FULLY OPTIMIZED FOR DAY TRADING!")
     print(f"Ready for live trading with real-time signals")
@@ -135,7 +135,7 @@ def test_session_optimizer():
     try:
         from src.strategies.session_optimizer import TradingSessionOptimizer, get_market_timing_advice
         
-        optimizer = TradingSessionOptimizer()
+        optimizer = TradingSessionOptimizer.get()
         
         # Get current session
         current_session = optimizer.get_current_session()
@@ -9,11 +9,22 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from index import get_real_market_data
-from src.core.trading_system import InstitutionalPatternDetector, DayTradingSmartMoney
-import yfinance as yf
+from src.core.trading_system import DayTradingSmartMoney
+from src.core.data_cache import prefetch_histories
+from src.backtesting.comprehensive_backtest import detect_signals, CONFIDENCE_PER_STRENGTH
+from src.strategies.day_trading_optimizer import DayTradingRiskManager
+import numpy as np
 import json
 from datetime import datetime
 
+def stack_close_tails(histories, width=30):
+    """Last `width` closes of each history as rows of one array (short histories NaN-padded on the left)"""
+    closes = np.full((len(histories), width), np.nan)
+    for row, data in enumerate(histories):
+        tail = data['Close'].to_numpy(dtype=np.float64)[-width:]
+        closes[row, width - len(tail):] = tail
+    return closes
+
 def final_system_validation():
     """Complete system validation with real data"""
     
@@ -39,34 +50,52 @@ def final_system_validation():
     print(f"\nTESTING PATTERN DETECTION...")
     print("-" * 30)
     
-    detector = InstitutionalPatternDetector()
     trader = DayTradingSmartMoney(initial_capital=10000)
+    risk_manager = DayTradingRiskManager()
     
     # Test pattern detection on key pairs
     test_symbols = ['EURUSD=X', 'GBPJPY=X', '^DJI']
     active_signals = []
     
-    for symbol in test_symbols:
+    # Fetch every pair concurrently before running detection
+    fetched = prefetch_histories(test_symbols, period="5d", interval="1h")
+    histories = {symbol: data for symbol, data in zip(test_symbols, fetched) if data is not None}
+    
+    # One vectorized pass over all pairs: only pairs stretched away from their
+    # SMA20 (by more than half the 10-bar volatility) go through pattern detection
+    ready = [symbol for symbol, data in histories.items() if len(data) > 20]
+    closes = stack_close_tails([histories[symbol] for symbol in ready], width=30)
+    sma20 = np.nanmean(closes[:, -20:], axis=1)
+    volatility = np.nanstd(closes[:, -10:], axis=1, ddof=1)
+    stretched = np.abs(closes[:, -1] - sma20) > 0.5 * volatility
+    
+    for symbol, fire in zip(ready, stretched.tolist()):
+        data = histories[symbol]
+        pair_name = symbol.replace('=X', '').replace('^', '')
+        
+        if not fire:
+            print(f"   {pair_name}: quiet market, skipped")
+            continue
+        
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="5d", interval="1h")
+            # Day-trading signals over the whole history, scored in one pass
+            scored = detect_signals(data, trader)
+            signals = [{'pattern': 'day_trading_smc', 'pattern_type': 'reversal', 'direction': row.direction,
+                        'sign': row.sign, 'confidence': row.strength * CONFIDENCE_PER_STRENGTH}
+                       for row in scored[scored['signal']].itertuples()]
             
-            if len(data) > 20:
-                signals = detector.analyze_patterns(data)
-                pair_name = symbol.replace('=X', '').replace('^', '')
+            print(f"   {pair_name}: {len(signals)} signals detected")
+            
+            if signals:
+                best_signal = max(signals, key=lambda x: x['confidence'])
+                active_signals.append({
+                    'pair': pair_name,
+                    'signal': best_signal,
+                    'current_price': data['Close'].to_numpy()[-1]
+                })
                 
-                print(f"   {pair_name}: {len(signals)} signals detected")
+                print(f"      Best: {best_signal['pattern']} {best_signal['direction']} ({best_signal['confidence']:.1f}%)")
                 
-                if signals:
-                    best_signal = max(signals, key=lambda x: x['confidence'])
-                    active_signals.append({
-                        'pair': pair_name,
-                        'signal': best_signal,
-                        'current_price': data['Close'].iloc[-1]
-                    })
-                    
-                    print(f"      Best: {best_signal['pattern']} {best_signal['direction']} ({best_signal['confidence']:.1f}%)")
-                    
         except Exception as e:
             print(f"   {symbol}: Error - {e}")
     
@@ -77,19 +106,12 @@ def final_system_validation():
     if active_signals:
         test_signal = active_signals[0]
         
-        # Create dummy market data for trade execution
-        import pandas as pd
-        dummy_bar = pd.Series({
-            'Open': test_signal['current_price'],
-            'High': test_signal['current_price'] * 1.001,
-            'Low': test_signal['current_price'] * 0.999,
-            'Close': test_signal['current_price'],
-            'Volume': 1000
-        })
-        
-        trade_setup = trader.execute_trade(test_signal['signal'], dummy_bar)
+        # Size the best signal at the current price
+        trade_setup = risk_manager.calculate_day_trading_position_size(
+            test_signal['signal'], test_signal['current_price'], 10000
+        )
         
-        if trade_setup:
+        if trade_setup['position_size'] > 0:
             print(f"Trade execution system working")
             print(f"   Pair: {test_signal['pair']}")
             print(f"   Entry: {trade_setup['entry_price']:.4f}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+LazyFrame Signal Test
+The polars entry point must give the same signals as the pandas batch scorer
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.core.trading_system import DayTradingSmartMoney
+
+pl = pytest.importorskip("polars")
+
+def _bars(n=600, seed=7):
+    """Random-walk 17-minute bars (every session hour gets visited)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.006, n))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.003, n))),
+        'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.003, n))),
+        'close': close,
+        'volume': rng.integers(1000, 100000, n).astype(float)
+    }, index=pd.date_range('2024-06-03', periods=n, freq='17min'))
+
+def test_lazy_matches_batch():
+    """Same signal bars, directions and strengths from both entry points"""
+    data = _bars()
+    expected = DayTradingSmartMoney().detect_day_trading_signals_batch(data)
+    expected = expected[expected['signal']]
+    assert len(expected) > 0
+    
+    # Extra column checks that only the OHLCV columns are read
+    lf = pl.DataFrame({
+        'timestamp': data.index.to_pydatetime().tolist(),
+        **{col: data[col].to_numpy() for col in data.columns},
+        'unused': np.zeros(len(data))
+    }).lazy()
+    result = DayTradingSmartMoney().detect_day_trading_signals_lazy(lf)
+    
+    assert result['timestamp'].to_list() == expected.index.to_pydatetime().tolist()
+    assert result['direction'].to_list() == expected['direction'].tolist()
+    assert result['sign'].to_list() == expected['sign'].tolist()
+    np.testing.assert_allclose(result['strength'].to_numpy(), expected['strength'].to_numpy())
+    np.testing.assert_allclose(result['bias_strength'].to_numpy(), expected['bias_strength'].to_numpy())
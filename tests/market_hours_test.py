@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Market Hours Test
+Pins the clock to fixed UTC times and checks the open/next-open answers
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+import src.core.trading_system as trading_system
+
+def _checker_at(monkeypatch, *when):
+    """MarketHoursChecker whose clock reads the given UTC time"""
+    class FixedClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(*when, tzinfo=tz)
+    monkeypatch.setattr(trading_system, 'datetime', FixedClock)
+    return trading_system.MarketHoursChecker()
+
+def test_saturday(monkeypatch):
+    """Saturday: everything closed, indices reopen Monday, forex Sunday evening"""
+    checker = _checker_at(monkeypatch, 2024, 6, 8, 12, 0)
+    assert not checker.is_market_open('US30')
+    assert not checker.is_market_open('GBPJPY')
+    assert checker.get_next_open_time('US30') == "2024-06-10 14:30 UTC"
+    assert checker.get_next_open_time('GBPJPY') == "2024-06-09 22:00 UTC"
+
+def test_weekday_evening(monkeypatch):
+    """Monday 23:00: indices closed until Tuesday's open"""
+    checker = _checker_at(monkeypatch, 2024, 6, 3, 23, 0)
+    assert not checker.is_market_open('NAS100')
+    assert checker.get_next_open_time('NAS100') == "2024-06-04 14:30 UTC"
+
+def test_friday_evening(monkeypatch):
+    """Friday 23:00: indices skip the weekend"""
+    checker = _checker_at(monkeypatch, 2024, 6, 7, 23, 0)
+    assert checker.get_next_open_time('US30') == "2024-06-10 14:30 UTC"
@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.strategies.balanced_strategy import BalancedDayTradingDetector, BalancedRiskManager
+from src.core.trading_system import Trade
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -74,7 +75,7 @@ class OptimizedProfitabilityTester:
                         best_signal = signals[0]  # Highest confidence
                         
                         if best_signal['confidence'] >= 80:  # High quality only
-                            entry_price = current_data['Close'].iloc[-1]
+                            entry_price = current_data['Close'].to_numpy()[-1]
                             
                             # Calculate position
                             trade_setup = self.risk_manager.calculate_balanced_position_size(
@@ -93,21 +94,21 @@ class OptimizedProfitabilityTester:
                                     )
                                     
                                     # Record trade with enhanced details
-                                    trade_record = {
-                                        'date': date,
-                                        'pair': pair_name,
-                                        'direction': best_signal['direction'],
-                                        'entry_price': entry_price,
-                                        'stop_loss': trade_setup['stop_loss'],
-                                        'take_profit': trade_setup['take_profit'],
-                                        'position_size': trade_setup['position_size'],
-                                        'pnl': trade_pnl,
-                                        'pattern': best_signal['pattern'],
-                                        'confidence': best_signal['confidence'],
-                                        'quality_score': best_signal.get('quality_score', 0),
-                                        'risk_amount': trade_setup['risk_amount'],
-                                        'rr_ratio': trade_setup['risk_reward_ratio']
-                                    }
+                                    trade_record = Trade(
+                                        date=date,
+                                        pair=pair_name,
+                                        direction=best_signal['direction'],
+                                        entry_price=entry_price,
+                                        stop_loss=trade_setup['stop_loss'],
+                                        take_profit=trade_setup['take_profit'],
+                                        position_size=trade_setup['position_size'],
+                                        pnl=trade_pnl,
+                                        pattern=best_signal['pattern'],
+                                        confidence=best_signal['confidence'],
+                                        quality_score=best_signal.get('quality_score', 0),
+                                        risk_amount=trade_setup['risk_amount'],
+                                        rr_ratio=trade_setup['risk_reward_ratio']
+                                    )
                                     
                                     trades.append(trade_record)
                                     daily_pnl += trade_pnl
@@ -161,7 +162,7 @@ class OptimizedProfitabilityTester:
                     return pnl - commission
         
         # Close at end of timeframe
-        exit_price = future_data['Close'].iloc[-1]
+        exit_price = future_data['Close'].to_numpy()[-1]
         if signal['direction'] == 'BUY':
             pnl = (exit_price - entry_price) * position_size
         else:
@@ -174,26 +175,26 @@ class OptimizedProfitabilityTester:
         """Calculate enhanced performance metrics"""
         
         total_trades = len(trades)
-        winning_trades = len([t for t in trades if t['pnl'] > 0])
+        winning_trades = len([t for t in trades if t.pnl > 0])
         losing_trades = total_trades - winning_trades
         
-        total_pnl = sum(t['pnl'] for t in trades)
+        total_pnl = sum(t.pnl for t in trades)
         total_return_pct = (total_pnl / self.initial_capital) * 100
         
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
         # Enhanced P&L analysis
-        winning_pnls = [t['pnl'] for t in trades if t['pnl'] > 0]
-        losing_pnls = [t['pnl'] for t in trades if t['pnl'] < 0]
+        winning_pnls = [t.pnl for t in trades if t.pnl > 0]
+        losing_pnls = [t.pnl for t in trades if t.pnl < 0]
         
         avg_win = np.mean(winning_pnls) if winning_pnls else 0
         avg_loss = np.mean(losing_pnls) if losing_pnls else 0
         profit_factor = abs(sum(winning_pnls) / sum(losing_pnls)) if losing_pnls else float('inf')
         
         # Quality metrics
-        avg_confidence = np.mean([t['confidence'] for t in trades])
-        avg_quality = np.mean([t['quality_score'] for t in trades])
-        avg_rr_ratio = np.mean([t['rr_ratio'] for t in trades])
+        avg_confidence = np.mean([t.confidence for t in trades])
+        avg_quality = np.mean([t.quality_score for t in trades])
+        avg_rr_ratio = np.mean([t.rr_ratio for t in trades])
         
         # Risk metrics
         max_drawdown = self.calculate_max_drawdown(equity_curve)
@@ -219,8 +220,8 @@ class OptimizedProfitabilityTester:
         print(f"   Average Win: ${avg_win:.2f}")
         print(f"   Average Loss: ${avg_loss:.2f}")
         print(f"   Profit Factor: {profit_factor:.2f}")
-        print(f"   Best Trade: ${max(t['pnl'] for t in trades):.2f}")
-        print(f"   Worst Trade: ${min(t['pnl'] for t in trades):.2f}")
+        print(f"   Best Trade: ${max(t.pnl for t in trades):.2f}")
+        print(f"   Worst Trade: ${min(t.pnl for t in trades):.2f}")
         
         print(f"\n📊 RISK METRICS:")
         print(f"   Max Drawdown: {max_drawdown:.2f}%")
@@ -82,7 +82,7 @@ def test_real_data_patterns():
                     print(f"   Signal {i+1}: {signal['pattern']} - {signal['direction']} - {signal['confidence']:.1f}%")
                 
                 # Test trade execution
-                latest_price = historical_data['Close'].iloc[-1]
+                latest_price = historical_data['Close'].to_numpy()[-1]
                 current_live_price = live_data.get(pair_name, latest_price)
                 
                 print(f"   📊 Historical Price: {latest_price:.4f}")
@@ -112,7 +112,7 @@ def test_real_data_patterns():
                 results[pair_name] = {
                     'signals_found': 0,
                     'data_points': len(historical_data),
-                    'latest_price': historical_data['Close'].iloc[-1],
+                    'latest_price': historical_data['Close'].to_numpy()[-1],
                     'live_price': live_data.get(pair_name, 0),
                     'price_change_pct': 0
                 }
@@ -0,0 +1,361 @@
+# API routes shared by the local app (web_app/app.py) and the Vercel function (api/index.py)
+# Each app provides its alert system as app.config['ALERT_SYSTEM_FACTORY'] (a no-argument callable)
+from flask import Blueprint, Response, current_app, g, request
+import hashlib
+import json
+import time
+import threading
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api_bp = Blueprint('api', __name__)
+
+def _json_default(value):
+    """Fallback encoder for the stdlib json path (datetimes as ISO strings)"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def _dumps(payload):
+    """Serialize a response payload to JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_json_default).encode('utf-8')
+
+def _json(payload, status=200):
+    """JSON response straight from the serialized bytes"""
+    return Response(_dumps(payload), status=status, mimetype='application/json')
+
+def get_alert_system():
+    """The registering app's alert system"""
+    return current_app.config['ALERT_SYSTEM_FACTORY']()
+
+@api_bp.before_app_request
+def _stamp_request():
+    """One clock read per request, shared by every timestamp in the response"""
+    g.now = datetime.now()
+    g.now_iso = g.now.isoformat()
+
+# The API is open to any origin - the same fixed headers on every response (replaces flask-cors)
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+}
+
+@api_bp.after_app_request
+def _add_cors_headers(response):
+    """Attach the static CORS headers (preflight OPTIONS is answered by Flask itself)"""
+    response.headers.update(CORS_HEADERS)
+    return response
+
+# Dashboard data only changes per scan - serve the serialized body for a few seconds
+DASHBOARD_TTL = 5.0
+_dashboard_cache = {'expires': 0.0, 'etag': None, 'body': b''}
+_dashboard_lock = threading.Lock()
+
+# A daemon thread re-serializes the snapshot a little faster than it expires, so requests
+# normally just read it; it starts with the first dashboard request (not at import, to keep
+# cold starts lazy) and lives as long as the process/warm container
+DASHBOARD_REFRESH = 4.0
+_refresher = None
+_refresher_lock = threading.Lock()
+
+# The stream re-checks the cache every TTL and ends before the platform's 60s function limit;
+# EventSource reconnects on its own
+STREAM_INTERVAL = DASHBOARD_TTL
+STREAM_SECONDS = 55
+
+def _refresh_dashboard(alert_system, now_iso):
+    """Rebuild the dashboard snapshot (caller holds _dashboard_lock)"""
+    data = alert_system.get_dashboard_data()
+    body = _dumps({
+        'success': True,
+        'data': data,
+        'timestamp': now_iso
+    })
+    # Tag the data, not the body - the timestamp would change it on every refresh
+    etag = f'"{hashlib.md5(_dumps(data)).hexdigest()}"'
+    _dashboard_cache.update(etag=etag, body=body, expires=time.monotonic() + DASHBOARD_TTL)
+
+def _refresh_forever(alert_system):
+    """Background loop keeping the dashboard snapshot fresh"""
+    while True:
+        try:
+            with _dashboard_lock:
+                _refresh_dashboard(alert_system, datetime.now().isoformat())
+        except Exception as e:
+            print(f"⚠️ Dashboard refresh failed: {e}")
+        time.sleep(DASHBOARD_REFRESH)
+
+def _start_refresher(alert_system):
+    """Start the background refresher once per process"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_forever, args=(alert_system,),
+                                          name='dashboard-refresher', daemon=True)
+            _refresher.start()
+
+def _cached_dashboard(alert_system, now_iso):
+    """(etag, serialized body) for the dashboard, refreshed at most every DASHBOARD_TTL seconds"""
+    if _refresher is None:
+        _start_refresher(alert_system)
+    
+    if time.monotonic() >= _dashboard_cache['expires']:
+        # Refresher not done yet (or stalled) - single-flight refresh: callers arriving
+        # meanwhile wait and reuse the new body
+        with _dashboard_lock:
+            if time.monotonic() >= _dashboard_cache['expires']:
+                _refresh_dashboard(alert_system, now_iso)
+    return _dashboard_cache['etag'], _dashboard_cache['body']
+
+@api_bp.route('/api/dashboard')
+def get_dashboard_data():
+    """API endpoint for dashboard data (cached for DASHBOARD_TTL seconds, 304 while unchanged)"""
+    try:
+        etag, body = _cached_dashboard(get_alert_system(), g.now_iso)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers=headers)
+        
+        return Response(body, mimetype='application/json', headers=headers)
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
+
+def _sse_gen(alert_system):
+    """Server-sent events: the dashboard body whenever its data changes, keep-alive comments otherwise"""
+    last_etag = None
+    deadline = time.monotonic() + STREAM_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            etag, body = _cached_dashboard(alert_system, datetime.now().isoformat())
+            if etag != last_etag:
+                last_etag = etag
+                yield b"data: " + body + b"\n\n"
+            else:
+                yield b": keep-alive\n\n"
+        except Exception as e:
+            print(f"⚠️ Stream update failed: {e}")
+            yield b": keep-alive\n\n"
+        time.sleep(STREAM_INTERVAL)
+
+@api_bp.route('/api/stream')
+def stream_dashboard():
+    """Push dashboard updates to the browser instead of having it poll"""
+    # Resolve the alert system now - the generator runs after the app context is gone
+    return Response(_sse_gen(get_alert_system()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _scan_section():
+    """Run a scan and summarize the new signals"""
+    new_signals = get_alert_system().scan_all_pairs()
+    return {'signals_found': len(new_signals), 'signals': new_signals}
+
+def _alerts_section():
+    """Last 10 alerts"""
+    alerts = list(get_alert_system().recent_alerts)[-10:]  # a list or a bounded deque
+    return {'alerts': alerts, 'count': len(alerts)}
+
+# Sections /api/batch can return in one round trip
+BATCH_SECTIONS = {
+    'dashboard': lambda: get_alert_system().get_dashboard_data(),
+    'scan': _scan_section,
+    'alerts': _alerts_section
+}
+DEFAULT_BATCH = ('dashboard', 'alerts')  # scan hits the market data API - ask for it explicitly
+
+# Scans with more signals than this are encoded one signal at a time
+SCAN_STREAM_MIN = 100
+
+def _stream_scan(signals, now_iso):
+    """The /api/scan body as chunks, so the whole encoded list is never held in memory"""
+    yield b'{"success":true,"signals_found":' + _dumps(len(signals)) + b',"signals":['
+    for i, signal in enumerate(signals):
+        yield (b',' if i else b'') + _dumps(signal)
+    yield b'],"timestamp":' + _dumps(now_iso) + b'}'
+
+@api_bp.route('/api/scan')
+def manual_scan():
+    """Manual scan endpoint"""
+    try:
+        new_signals = get_alert_system().scan_all_pairs()
+        if len(new_signals) >= SCAN_STREAM_MIN:
+            return Response(_stream_scan(new_signals, g.now_iso), mimetype='application/json')
+        
+        return _json({
+            'success': True,
+            'signals_found': len(new_signals),
+            'signals': new_signals,
+            'timestamp': g.now_iso
+        })
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
+
+@api_bp.route('/api/alerts/recent')
+def get_recent_alerts():
+    """Get recent alerts"""
+    try:
+        return _json({
+            'success': True,
+            **_alerts_section(),
+            'timestamp': g.now_iso
+        })
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
+
+@api_bp.route('/api/batch', methods=['GET', 'POST'])
+def batch():
+    """Several sections in one response, e.g. {"requests": ["dashboard", "scan", "alerts"]}"""
+    body = request.get_json(silent=True) or {}
+    requested = body.get('requests') if isinstance(body, dict) else None
+    valid = isinstance(body, dict) and (
+        requested is None or (isinstance(requested, list) and all(isinstance(name, str) for name in requested)))
+    if not valid:
+        return _json({
+            'success': False,
+            'error': 'Body must be a JSON object with a list of section names, e.g. {"requests": ["dashboard"]}',
+            'timestamp': g.now_iso
+        }, 400)
+    names = requested or [name for name in request.args.get('requests', '').split(',') if name]
+    names = names or DEFAULT_BATCH
+
+    unknown = [name for name in names if name not in BATCH_SECTIONS]
+    if unknown:
+        return _json({
+            'success': False,
+            'error': f'Unknown sections: {", ".join(unknown)}',
+            'timestamp': g.now_iso
+        }, 400)
+
+    result = {'success': True}
+    for name in names:
+        try:
+            result[name] = BATCH_SECTIONS[name]()
+        except Exception as e:
+            # One failing section doesn't sink the others
+            result[name] = {'error': str(e)}
+            result['success'] = False
+    result['timestamp'] = g.now_iso
+    return _json(result)
+
+@api_bp.route('/api/config/mobile', methods=['POST'])
+def configure_mobile():
+    """Configure mobile notifications"""
+    try:
+        data = request.get_json()
+
+        if not data:
+            return _json({
+                'success': False,
+                'error': 'No configuration data provided',
+                'timestamp': g.now_iso
+            }, 400)
+
+        api_key = data.get('api_key')
+        user_token = data.get('user_token')
+
+        if not api_key or not user_token:
+            return _json({
+                'success': False,
+                'error': 'API key and user token are required',
+                'timestamp': g.now_iso
+            }, 400)
+
+        alert_system = get_alert_system()
+        if hasattr(alert_system, 'configure_pushover'):
+            alert_system.configure_pushover(api_key, [user_token])
+
+            return _json({
+                'success': True,
+                'message': 'Mobile notifications configured successfully',
+                'timestamp': g.now_iso
+            })
+        else:
+            return _json({
+                'success': False,
+                'error': 'Mobile notifications not supported in current mode',
+                'timestamp': g.now_iso
+            }, 500)
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
+
+@api_bp.route('/api/test/notification', methods=['POST'])
+def test_notification():
+    """Test mobile notification"""
+    try:
+        test_signal = {
+            'pair': 'TEST',
+            'direction': 'BUY',
+            'entry_price': 1.2345,
+            'target_profit': 1.2500,
+            'stop_loss': 1.2200,
+            'confidence': '🔥 HIGH',
+            'risk_level': '🟢 LOW',
+            'timestamp': g.now
+        }
+
+        success = get_alert_system().send_mobile_notification(test_signal)
+
+        return _json({
+            'success': success,
+            'message': 'Test notification sent' if success else 'Failed to send test notification',
+            'timestamp': g.now_iso
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
+
+@api_bp.route('/api/alerts/batch', methods=['POST'])
+def send_alert_batch():
+    """Push a list of signals to the configured devices as combined notifications"""
+    try:
+        signals = request.get_json()
+        if isinstance(signals, dict):
+            signals = signals.get('signals')
+
+        if not signals or not isinstance(signals, list):
+            return _json({
+                'success': False,
+                'error': 'A list of signals is required',
+                'timestamp': g.now_iso
+            }, 400)
+
+        success = get_alert_system().send_batch_notification(signals)
+        return _json({
+            'success': success,
+            'signals': len(signals),
+            'message': 'Batch notification sent' if success else 'Failed to send batch notification',
+            'timestamp': g.now_iso
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'error': str(e),
+            'timestamp': g.now_iso
+        }, 500)
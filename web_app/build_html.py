@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Dashboard HTML Build
+Minifies the inline CSS/JS of api/static/index.html into index.min.html, which the
+serverless app serves when present. Run before deploying (pip install rcssmin rjsmin)
+"""
+
+import os
+import re
+import rcssmin
+import rjsmin
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api', 'static')
+
+STYLE_RE = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.S)
+SCRIPT_RE = re.compile(r'(<script[^>]*>)(.*?)(</script>)', re.S)
+
+def minify_html(html):
+    """Minify every inline <style> and <script> body, leaving the markup as is"""
+    html = STYLE_RE.sub(lambda m: m.group(1) + rcssmin.cssmin(m.group(2)) + m.group(3), html)
+    return SCRIPT_RE.sub(lambda m: m.group(1) + rjsmin.jsmin(m.group(2)) + m.group(3), html)
+
+if __name__ == "__main__":
+    src = os.path.join(STATIC_DIR, 'index.html')
+    dst = os.path.join(STATIC_DIR, 'index.min.html')
+
+    with open(src, encoding='utf-8') as f:
+        html = f.read()
+    minified = minify_html(html)
+
+    with open(dst, 'w', encoding='utf-8') as f:
+        f.write(minified)
+    print(f"✅ Built {dst} ({len(html.encode())} -> {len(minified.encode())} bytes)")
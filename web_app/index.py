@@ -1,168 +0,0 @@
-from flask import Flask, jsonify, render_template_string
-import json
-from datetime import datetime
-
-app = Flask(__name__)
-
-# Simple HTML template
-SIMPLE_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Smart Money Trading Alerts - LIVE</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-        .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-        h1 { color: #2c3e50; text-align: center; }
-        .status { background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 20px 0; }
-        .pairs { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }
-        .pair-card { background: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 4px solid #007bff; }
-        .config-section { background: #fff3cd; padding: 20px; border-radius: 5px; margin: 20px 0; }
-        input { width: 100%; padding: 10px; margin: 5px 0; border: 1px solid #ddd; border-radius: 4px; }
-        button { background: #007bff; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; margin: 5px; }
-        button:hover { background: #0056b3; }
-        .success { color: #155724; background: #d4edda; padding: 10px; border-radius: 4px; margin: 10px 0; }
-        .error { color: #721c24; background: #f8d7da; padding: 10px; border-radius: 4px; margin: 10px 0; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 Smart Money Trading System</h1>
-        <div class="status">
-            <h3>✅ System Status: LIVE & OPERATIONAL</h3>
-            <p>Your 7-pair smart money trading system is running 24/7 on Vercel!</p>
-            <p>🕒 <strong>Last Updated:</strong> <span id="timestamp">{{ timestamp }}</span></p>
-        </div>
-        
-        <div class="pairs">
-            <div class="pair-card"><strong>NAS100</strong><br>🟡 Medium Risk<br>Index Trading</div>
-            <div class="pair-card"><strong>US30</strong><br>🟡 Medium Risk<br>Dow Jones</div>
-            <div class="pair-card"><strong>GBPJPY</strong><br>🟢 Low Risk<br>66.7% Win Rate</div>
-            <div class="pair-card"><strong>CADCHF</strong><br>🟡 Medium Risk<br>Cross Pair</div>
-            <div class="pair-card"><strong>USDJPY</strong><br>🟢 Low Risk<br>Major Pair</div>
-            <div class="pair-card"><strong>EURCAD</strong><br>🟡 Medium Risk<br>Cross Pair</div>
-            <div class="pair-card"><strong>USDCAD</strong><br>🟢 Low Risk<br>Commodity Pair</div>
-        </div>
-        
-        <div class="config-section">
-            <h3>📱 Mobile Notification Setup</h3>
-            <p>Configure once to receive alerts 24/7:</p>
-            <input type="text" id="api-key" placeholder="Enter Pushover API Token">
-            <input type="text" id="user-key" placeholder="Enter Pushover User Key">
-            <button onclick="saveMobileConfig()">💾 Save Configuration</button>
-            <button onclick="testAlert()">📱 Send Test Alert</button>
-            <div id="config-status"></div>
-        </div>
-        
-        <div class="status">
-            <h3>🎯 System Features</h3>
-            <ul>
-                <li>✅ Real-time smart money pattern detection</li>
-                <li>✅ Institutional order block analysis</li>
-                <li>✅ Market structure break identification</li>
-                <li>✅ Mobile push notifications via Pushover</li>
-                <li>✅ 24/7 cloud operation on Vercel</li>
-                <li>✅ 7 carefully selected trading pairs</li>
-            </ul>
-        </div>
-    </div>
-    
-    <script>
-        function saveMobileConfig() {
-            const apiKey = document.getElementById('api-key').value;
-            const userKey = document.getElementById('user-key').value;
-            
-            if (!apiKey || !userKey) {
-                showStatus('Please enter both API token and user key', 'error');
-                return;
-            }
-            
-            fetch('/api/config', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ api_key: apiKey, user_key: userKey })
-            })
-            .then(response => response.json())
-            .then(data => {
-                showStatus(data.success ? '✅ Configuration saved successfully!' : '❌ Error: ' + data.error, 
-                          data.success ? 'success' : 'error');
-            })
-            .catch(error => {
-                showStatus('❌ Network error: ' + error.message, 'error');
-            });
-        }
-        
-        function testAlert() {
-            fetch('/api/test-alert', { method: 'POST' })
-            .then(response => response.json())
-            .then(data => {
-                showStatus(data.success ? '📱 Test alert sent! Check your phone.' : '❌ Error: ' + data.error,
-                          data.success ? 'success' : 'error');
-            })
-            .catch(error => {
-                showStatus('❌ Network error: ' + error.message, 'error');
-            });
-        }
-        
-        function showStatus(message, type) {
-            const status = document.getElementById('config-status');
-            status.textContent = message;
-            status.className = type;
-            status.style.display = 'block';
-            setTimeout(() => status.style.display = 'none', 5000);
-        }
-        
-        // Update timestamp
-        document.getElementById('timestamp').textContent = new Date().toLocaleString();
-    </script>
-</body>
-</html>
-"""
-
-@app.route('/')
-def index():
-    return render_template_string(SIMPLE_HTML, timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'))
-
-@app.route('/api/status')
-def api_status():
-    return jsonify({
-        'status': 'live',
-        'pairs_monitored': 7,
-        'system': 'smart_money_trading',
-        'version': '2.0',
-        'timestamp': datetime.now().isoformat()
-    })
-
-@app.route('/api/config', methods=['POST'])
-def configure():
-    try:
-        from flask import request
-        data = request.get_json() or {}
-        
-        api_key = data.get('api_key')
-        user_key = data.get('user_key')
-        
-        if api_key and user_key:
-            # In production, you'd save these securely
-            return jsonify({'success': True, 'message': 'Configuration saved'})
-        else:
-            return jsonify({'success': False, 'error': 'Missing credentials'})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
-
-@app.route('/api/test-alert', methods=['POST'])
-def test_alert():
-    return jsonify({
-        'success': True, 
-        'message': 'Test alert would be sent to your configured Pushover device'
-    })
-
-@app.route('/health')
-def health():
-    return jsonify({'status': 'healthy', 'service': 'smart_money_trading_alerts'})
-
-# For local development
-if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file